@@ -0,0 +1,56 @@
+"""Tables that predate the migrations
+
+Revision ID: 2b8e0f4c6a11
+Revises:
+Create Date: 2026-10-17 12:00:00.000000
+
+Deployments set up before the migrations already have these tables, so only the missing ones are created.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "2b8e0f4c6a11"
+down_revision: str | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if "experience" not in existing:
+        op.create_table(
+            "experience",
+            sa.Column("user_id", sa.BigInteger(), nullable=False),
+            sa.Column("guild_id", sa.BigInteger(), nullable=False),
+            sa.Column("experience", sa.BigInteger(), nullable=True),
+            sa.Column("level", sa.Integer(), nullable=True),
+            sa.PrimaryKeyConstraint("user_id", "guild_id"),
+        )
+    if "telegram_mapping" not in existing:
+        op.create_table(
+            "telegram_mapping",
+            sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column("telegram_chat", sa.BigInteger(), nullable=False),
+            sa.Column("telegram_message", sa.BigInteger(), nullable=False),
+            sa.Column("discord_channel", sa.BigInteger(), nullable=False),
+            sa.Column("discord_message", sa.BigInteger(), nullable=False),
+            sa.Column("discord_attachment", sa.BigInteger(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+    if "user" not in existing:
+        op.create_table(
+            "user",
+            sa.Column("user_id", sa.BigInteger(), nullable=False),
+            sa.Column("name", sa.String(), nullable=True),
+            sa.PrimaryKeyConstraint("user_id"),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("user")
+    op.drop_table("telegram_mapping")
+    op.drop_table("experience")
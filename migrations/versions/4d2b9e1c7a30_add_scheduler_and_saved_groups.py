@@ -0,0 +1,51 @@
+"""Add the scheduler state, scheduler lease and saved groups tables
+
+Revision ID: 4d2b9e1c7a30
+Revises: 2b8e0f4c6a11
+Create Date: 2026-10-17 12:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "4d2b9e1c7a30"
+down_revision: str | None = "2b8e0f4c6a11"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scheduled_task_state",
+        sa.Column("task_name", sa.String(), nullable=False),
+        sa.Column("last_fire_at", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("task_name"),
+    )
+    op.create_table(
+        "scheduler_lease",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("holder", sa.String(), nullable=False),
+        sa.Column("expires_at", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.create_table(
+        "saved_group_members",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("member_id", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("name", "member_id"),
+    )
+    op.create_table(
+        "saved_groups_version",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("saved_groups_version")
+    op.drop_table("saved_group_members")
+    op.drop_table("scheduler_lease")
+    op.drop_table("scheduled_task_state")
@@ -24,6 +24,11 @@ def bot_main():
         help="Config file(s) to use for the bot.",
     )
     parser.add_argument("--alembic", nargs=argparse.REMAINDER, help="Invoke alembic command.")
+    parser.add_argument(
+        "--warm-template-cache",
+        action="store_true",
+        help="Compile all templates into the bytecode cache and exit, e.g. as a deploy step.",
+    )
 
     # Run argument parser
     args = parser.parse_args()
@@ -32,6 +37,9 @@ def bot_main():
     if args.alembic is not None:
         return run_alembic(args.config_file, args.alembic)
 
+    if args.warm_template_cache:
+        return asyncio.run(warm_template_cache(args.config_file))
+
     try:
         asyncio.run(bot_start(args.config_file))
     except KeyboardInterrupt:
@@ -65,6 +73,17 @@ def run_alembic(config_files: list[Path], alembic_argv):
         return cmd.run_cmd(cfg, options)
 
 
+async def warm_template_cache(config_files):
+    # Loading the cogs compiles their pinned inline templates, then compile every file template
+    for config_file in config_files:
+        bot = Bot(config_file)
+        if bot.template_engine.env.bytecode_cache is None:
+            log.warning("No templates.bytecode_cache_dir configured in %s, nothing to warm up", config_file)
+            continue
+        count = bot.template_engine.warm_up()
+        log.info("Warmed up template cache for %s: %d file templates", config_file, count)
+
+
 async def bot_start(config_files):
     # Initialize and start all the bots
     futures = (Bot(config).start() for config in config_files)
@@ -4,7 +4,7 @@ from datetime import datetime
 from importlib import import_module
 from os import environ
 from pathlib import Path
-from types import SimpleNamespace
+from types import MappingProxyType, SimpleNamespace
 
 import yaml
 from discord import ApplicationContext, Intents, Interaction, Message
@@ -14,9 +14,10 @@ from discord.ext.commands import Context
 from pydantic import BaseModel, TypeAdapter
 
 from .groups import Groups
+from .groups_store import DatabaseGroupsStore
 from .schedule import TaskScheduler
 from .templates import TemplateEngine
-from .utils import LazyContext
+from .utils import LazyContext, LazyNamespace, VariableCache
 
 log = logging.getLogger(__name__)
 
@@ -50,7 +51,15 @@ class Bot(Base):
             "channel": config.pop("channels", {}),
             "user": config.pop("users", {}),
         }
-        self.groups = Groups(config.pop("groups", {}), config.pop("groups_save", None))
+        self.rebuild_config_index()
+        groups_store = config.pop("groups_store", {})
+        groups_backend = groups_store.pop("backend", "json")
+        if groups_backend == "database":
+            # Saved groups are shared through the database, set up below
+            self.groups = Groups(config.pop("groups", {}))
+            config.pop("groups_save", None)
+        else:
+            self.groups = Groups(config.pop("groups", {}), config.pop("groups_save", None), **groups_store)
 
         # Map some config from root to user/channel groups
         for name, map_to in self.CONFIG_GROUP_MAPPINGS.items():
@@ -61,14 +70,26 @@ class Bot(Base):
         # The remaining configs are used to load cogs
         self.cog_list = set()
 
-        self.template_engine = TemplateEngine(template_dirs=["templates"])
+        self.template_engine = TemplateEngine(template_dirs=["templates"], **config.pop("templates", {}))
+
+        # Template variable providers of loaded cogs, keyed by namespace (lowercased cog name)
+        self.template_providers = {}
+        # Values of template variables wrapped in Cached, shared across renders
+        self.variable_cache = VariableCache(**config.pop("variable_cache", {}))
         self.features = set()
-        self.scheduler = TaskScheduler(self, scheduled_tasks_timeout=300)
+        self.scheduler = TaskScheduler(self, **config.pop("scheduler", {}))
 
-        # Load database
+        # Load database. Tables come from the migrations, database_create_tables is meant for development setups
+        self.database_create_tables = config.pop("database_create_tables", False)
         with suppress(KeyError):
             self.set_database(config.pop("database_url"))
 
+        if groups_backend == "database":
+            if self.feature_enabled("database"):
+                self.groups.set_store(DatabaseGroupsStore(self.Session, **groups_store))
+            else:
+                log.error("groups_store.backend is database, but no database_url is configured")
+
         # Settings up the bot itself
         config_token = config.pop("token", None)
         self.token = environ.get("TOKEN") or config_token
@@ -97,16 +118,21 @@ class Bot(Base):
         return self.get_config("user", user.id if user else None)
 
     def get_config(self, category, key=None):
-        raw_config = self.configs[category]
-
-        # Filter all non-int keys as global config
-        config = {k: v for k, v in raw_config.items() if not isinstance(k, int)}
-
-        # apply guild specific configs
-        if key in raw_config:
-            config.update(raw_config[key])
-
-        return config
+        defaults, overrides = self._config_index[category]
+        return overrides.get(key, defaults)
+
+    def rebuild_config_index(self):
+        """Precomputes the merged read-only config of every id, call again after changing self.configs."""
+        self._config_index = {}
+        for category, raw_config in self.configs.items():
+            # Filter all non-int keys as global config, shared by every id without overrides
+            defaults = {k: v for k, v in raw_config.items() if not isinstance(k, int)}
+
+            # Apply guild/channel/user specific configs on top of the global config
+            overrides = {
+                k: MappingProxyType({**defaults, **(v or {})}) for k, v in raw_config.items() if isinstance(k, int)
+            }
+            self._config_index[category] = (MappingProxyType(defaults), overrides)
 
     def get_motd(self):
         if not self.motd:
@@ -208,25 +234,25 @@ class Bot(Base):
         from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
         from sqlalchemy.orm import sessionmaker
 
-        engine = create_async_engine(database_url)
-        self.Session = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+        self.database_engine = create_async_engine(database_url)
+        self.Session = sessionmaker(self.database_engine, expire_on_commit=False, class_=AsyncSession)
         self.features.add("database")
 
-    def template_variables(self, ctx):
-        """Search through all registered cogs and load variables"""
+    def template_variables(self, ctx, names=None):
+        """Build the template namespace, only calling the providers of namespaces a template actually reads.
+
+        If names is given, for example from TemplateEngine.referenced_names, other providers are left out entirely.
+        """
 
         # Generate a fake context if a channel/messageable is passed directly instead of a full context
         if not hasattr(ctx, "author"):
             guild = getattr(ctx, "guild", None)
             ctx = SimpleNamespace(bot=self, guild=guild, channel=ctx, author=self.user)
 
-        result = self.template_variables_base(ctx)
-        for name, cog in self.cogs.items():
-            if hasattr(cog, "template_variables"):
-                namespace_key = name.lower()
-                loaders = cog.template_variables(ctx)
-                result[namespace_key] = LazyContext(loaders)
-        return result
+        providers = self.template_providers
+        if names is not None:
+            providers = {name: providers[name] for name in names if name in providers}
+        return LazyContext(LazyNamespace(self.template_variables_base(ctx), providers, ctx, self.variable_cache))
 
     def feature_enabled(self, feature):
         return feature in self.features
@@ -235,10 +261,12 @@ class Bot(Base):
         motd = self.get_motd()
         if motd:
             print(motd)
+        await self.groups.start()
         await self.scheduler.start()
+        self.template_engine.start_watcher()
 
     def context_attach_attributes(self, ctx):
-        ctx.template_variables = lambda: self.template_variables(ctx)
+        ctx.template_variables = lambda names=None: self.template_variables(ctx, names)
         ctx.guild_config = lambda: self.guild_config(ctx.guild)
         ctx.channel_config = lambda: self.channel_config(ctx.channel)
         ctx.author_config = lambda: self.user_config(ctx.author)
@@ -255,17 +283,35 @@ class Bot(Base):
         ctx = await super().get_application_context(interaction, cls=cls)
         return self.context_attach_attributes(ctx)
 
+    async def create_database_tables(self):
+        """Creates every missing table without migrating, for development databases only."""
+        from .cogs.models import Base
+
+        async with self.database_engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
     async def start(self):
+        if self.database_create_tables and self.feature_enabled("database"):
+            await self.create_database_tables()
         await super().start(self.token)
 
+    async def close(self):
+        await self.scheduler.close()
+        self.template_engine.stop_watcher()
+        await self.groups.close()
+        await super().close()
+
     def add_cog(self, cog: commands.Cog) -> None:
         super().add_cog(cog)
         self.scheduler.register_cog_tasks(cog)
+        if hasattr(cog, "template_variables"):
+            self.template_providers[cog.qualified_name.lower()] = cog.template_variables
 
     def remove_cog(self, name: str) -> commands.Cog | None:
         cog = super().remove_cog(name)
         if cog:
             self.scheduler.unregister_cog_tasks(name)
+            self.template_providers.pop(name.lower(), None)
         return cog
 
     def _load_cog_module(self, module_name):
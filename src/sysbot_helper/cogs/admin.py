@@ -1,9 +1,10 @@
 import asyncio
 from collections.abc import Iterable
+from datetime import timedelta
 from enum import Enum
 from time import time
 
-from discord import TextChannel, slash_command
+from discord import SlashCommandGroup, TextChannel, slash_command
 from discord.errors import HTTPException
 from discord.ext import commands
 from pydantic import BaseModel
@@ -23,6 +24,9 @@ class Admin(CogSendError):
         vote_valid_seconds: int = 300
         vote_count_required: int = 3
 
+    schedule = SlashCommandGroup("schedule", "Inspect scheduled tasks.")
+    templates = SlashCommandGroup("templates", "Manage template files.")
+
     def __init__(self, bot, config):
         self.bot = bot
         self.config = config
@@ -199,3 +203,63 @@ class Admin(CogSendError):
             summary.append(f"{channel.mention} ({channel.guild.name})")
 
         await ctx.send("\n".join(summary))
+
+    @schedule.command()
+    @is_sudo()
+    async def preview(self, ctx, days: int = 30, count: int = 5):
+        """List the next fire times of every scheduled task."""
+        table = self.bot.scheduler.fire_table(window=timedelta(days=days), limit=count)
+
+        summary = [f"Next {count} runs of each scheduled task within {days} days:"]
+        for name, fire_times in sorted(table.items()):
+            runs = ", ".join(fire.strftime("%a %Y-%m-%d %H:%M:%S") for fire in fire_times) or "none"
+            summary.append(f"**{name}**: {runs}")
+
+        await self.respond_chunked(ctx, summary)
+
+    @schedule.command()
+    @is_sudo()
+    async def stats(self, ctx):
+        """Show start lag and duration statistics of scheduled tasks."""
+        summary = ["Scheduled task timings (p50 / p95 / max):"]
+        for name, telemetry in sorted(self.bot.scheduler.telemetry.items()):
+            lag, duration = telemetry.lag, telemetry.duration
+            summary.append(
+                f"**{name}**: {telemetry.runs} runs, "
+                f"lag {lag.quantile(0.5):.2f}s / {lag.quantile(0.95):.2f}s / {lag.maximum:.2f}s, "
+                f"duration {duration.quantile(0.5):.2f}s / {duration.quantile(0.95):.2f}s / {duration.maximum:.2f}s, "
+                f"{telemetry.timeouts} timeouts, {telemetry.exceptions} errors, {telemetry.missed_runs} missed"
+            )
+        summary.append(f"Skipped overlapping runs: {self.bot.scheduler.skipped_runs}")
+
+        await self.respond_chunked(ctx, summary)
+
+    @templates.command()
+    @is_sudo()
+    async def reload(self, ctx):
+        """Reload all file templates from disk."""
+        count = self.bot.template_engine.reload_templates()
+        await ctx.respond(f"Dropped {count} cached templates, they will be read from disk on next use.")
+
+    @templates.command()
+    @is_sudo()
+    async def cache(self, ctx):
+        """Show template and template variable cache statistics."""
+        templates, variables = self.bot.template_engine.cache_info(), self.bot.variable_cache.cache_info()
+        await ctx.respond(
+            f"Templates: {templates.hits} hits, {templates.misses} misses, {templates.evictions} evicted, "
+            f"{templates.currsize}/{templates.maxsize} cached, {templates.pinned} pinned\n"
+            f"Variables: {variables.hits} hits, {variables.misses} misses, {variables.evictions} evicted, "
+            f"{variables.expirations} expired, {variables.currsize}/{variables.maxsize} cached"
+        )
+
+    async def respond_chunked(self, ctx, lines):
+        chunks = [""]
+        for line in lines:
+            if len(chunks[-1]) + len(line) + 1 > 2000:
+                chunks.append("")
+            chunks[-1] += line + "\n"
+
+        await ctx.respond(chunks[0])
+        for chunk in chunks[1:]:
+            await ctx.send(chunk)
@@ -36,17 +36,19 @@ class Commands(commands.Cog):
             parser = DiscordTextParser.from_file(self.config.root_path / path)
             command_options.update(parser.command_options)
 
-        def get_response(ctx):
-            variables = ctx.template_variables()
+        async def get_response(ctx):
+            engine = ctx.template_engine
             # Reload the file each time the command updates
             if path is not None:
-                rendered = ctx.template_engine.render_file(str(path), variables)
+                variables = ctx.template_variables(engine.referenced_file_names(str(path)))
+                rendered = await engine.render_file_async(str(path), variables)
             else:
                 # If text is a list, then randomly send one of them
                 selected_text = text
                 if isinstance(selected_text, list):
                     selected_text = choice(text)
-                rendered = ctx.template_engine.render_string(selected_text, variables)
+                variables = ctx.template_variables(engine.referenced_names(selected_text))
+                rendered = await engine.render_string_async(selected_text, variables)
 
             # Send either normal message or embed
             return DiscordTextParser.convert_to_response(rendered)
@@ -66,13 +68,13 @@ class Commands(commands.Cog):
             elif name[0] in "/_":
 
                 async def callback(self, ctx):
-                    await ctx.respond(**get_response(ctx))
+                    await ctx.respond(**(await get_response(ctx)))
 
                 cmd = SlashCommand(callback, name=name[1:], **command_options)
             else:
 
                 async def callback(self, ctx):
-                    await ctx.send(**get_response(ctx))
+                    await ctx.send(**(await get_response(ctx)))
 
                 cmd = Command(callback, name=name, **command_options)
             command_list.append(cmd)
@@ -88,3 +90,4 @@ class Commands(commands.Cog):
 
         for name, text in self.config.text.items():
             self.make_text_command(name, text=text)
+            self.bot.template_engine.pin([text] if isinstance(text, str) else text)
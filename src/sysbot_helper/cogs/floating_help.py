@@ -43,6 +43,7 @@ class FloatingHelp(commands.Cog):
     def __init__(self, bot: Bot, config: Config):
         self.bot = bot
         self.config = config
+        self.bot.template_engine.pin(self.config.channels.values())
 
         self.channels: dict[int, ChannelInfo] = defaultdict(ChannelInfo)
         self.inactive_channels: set[int] = set()
@@ -64,8 +65,10 @@ class FloatingHelp(commands.Cog):
         info = self.channels[channel_id]
 
         # Render template
-        variables = self.bot.template_variables(channel)
-        content = self.bot.template_engine.render_string(info.message_text, variables).strip() + self.config.magic_space
+        engine = self.bot.template_engine
+        variables = self.bot.template_variables(channel, engine.referenced_names(info.message_text))
+        content = (await engine.render_string_async(info.message_text, variables, cache_key=channel_id)).strip()
+        content += self.config.magic_space
 
         # Use API to retrieve history, so that it handles deleted messages as well
         last_message_id = 0
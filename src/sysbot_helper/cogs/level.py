@@ -2,6 +2,7 @@ import asyncio
 
 from discord.ext import commands
 from pydantic import BaseModel
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -36,6 +37,48 @@ class Level(commands.Cog):
             self._locks[key] = asyncio.Lock()
         return self._locks[key]
 
+    async def user_experience(self, ctx) -> Experience | None:
+        async with self.bot.Session() as session:
+            return await session.get(Experience, (ctx.author.id, ctx.guild.id))
+
+    async def user_rank(self, ctx, experience: int) -> int:
+        """1-based position on the server leaderboard of a member with the given experience."""
+        async with self.bot.Session() as session:
+            ahead = await session.scalar(
+                select(func.count())
+                .select_from(Experience)
+                .where(Experience.guild_id == ctx.guild.id, Experience.experience > experience)
+            )
+        return ahead + 1
+
+    def template_variables(self, ctx):
+        if ctx.guild is None:
+            # Experience is tracked per server, there is none in direct messages
+            return dict.fromkeys(("xp", "level", "rank"))
+
+        # Every variable reads the author's row, fetched once by whichever of them runs first
+        lookup = None
+
+        async def experience() -> Experience | None:
+            nonlocal lookup
+            if lookup is None:
+                lookup = asyncio.ensure_future(self.user_experience(ctx))
+            return await lookup
+
+        async def xp() -> int:
+            user = await experience()
+            return user.experience if user else 0
+
+        async def level() -> int:
+            user = await experience()
+            return user.level if user else 0
+
+        async def rank() -> int:
+            return await self.user_rank(ctx, await xp())
+
+        # Coroutines, resolved concurrently by async template renders
+        return {"xp": xp, "level": level, "rank": rank}
+
     @commands.command()
     async def top(self, ctx):
         async with self.bot.Session.begin() as session:
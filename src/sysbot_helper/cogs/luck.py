@@ -1,10 +1,16 @@
 from datetime import UTC, datetime
+from functools import partial
 from random import Random
 from struct import Struct
 
 from discord.ext import commands
 from pydantic import BaseModel
 
+from ..utils import Cached
+
+# Luck only changes when the day changes, which is part of the cache key; the TTL just bounds memory use.
+LUCK_CACHE_TTL_SECONDS: float = 3600
+
 
 class Luck(commands.Cog):
     @classmethod
@@ -47,13 +53,18 @@ class Luck(commands.Cog):
         self.bot = bot
         self.config = config
 
-    def get_luck_by_id(self, ctx, id):
+    def server_now(self, ctx):
         time_cog = self.bot.get_cog("Time")
         if time_cog:
-            now = time_cog.server_now(ctx)
-        else:
-            now = datetime.now()
-        return self.get_luck(id, now, self.config.mu, self.config.sigma, self.config.max_luck)
+            return time_cog.server_now(ctx)
+        return datetime.now()
+
+    def get_luck_by_id(self, ctx, id):
+        return self.get_luck(id, self.server_now(ctx), self.config.mu, self.config.sigma, self.config.max_luck)
+
+    def luck_key(self, ctx, id):
+        """Cache key of a luck value: it only changes with the day in the server's timezone."""
+        return id, self.server_now(ctx).date()
 
     def get_rating_by_id(self, ctx, id):
         luck = self.get_luck_by_id(ctx, id)
@@ -78,10 +89,12 @@ class Luck(commands.Cog):
         return self.config.max_luck
 
     def template_variables(self, ctx):
+        user_key = partial(self.luck_key, ctx, ctx.author.id)
+        server_key = partial(self.luck_key, ctx, ctx.guild.id if ctx.guild else None)
         return {
-            "luck": lambda: self.user_luck(ctx),
-            "luck_rating": lambda: self.user_rating(ctx),
-            "server_luck": lambda: self.server_luck(ctx),
-            "server_luck_rating": lambda: self.server_rating(ctx),
+            "luck": Cached(lambda: self.user_luck(ctx), user_key, LUCK_CACHE_TTL_SECONDS),
+            "luck_rating": Cached(lambda: self.user_rating(ctx), user_key, LUCK_CACHE_TTL_SECONDS),
+            "server_luck": Cached(lambda: self.server_luck(ctx), server_key, LUCK_CACHE_TTL_SECONDS),
+            "server_luck_rating": Cached(lambda: self.server_rating(ctx), server_key, LUCK_CACHE_TTL_SECONDS),
             "max_luck": self.config.max_luck,
         }
@@ -6,3 +6,5 @@ Base = declarative_base()
 from .experience import Experience
 from .user import User
 from .telegram import TelegramMapping
+from .scheduler import ScheduledTaskState, SchedulerLease
+from .groups import SavedGroupMember, SavedGroupsVersion
@@ -0,0 +1,15 @@
+from sqlalchemy import BigInteger, Column, String
+
+from . import Base
+
+
+class SavedGroupMember(Base):
+    __tablename__ = "saved_group_members"
+    name = Column(String, primary_key=True)
+    member_id = Column(BigInteger, primary_key=True)
+
+
+class SavedGroupsVersion(Base):
+    __tablename__ = "saved_groups_version"
+    name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False)
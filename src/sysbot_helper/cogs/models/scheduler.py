@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Float, String
+
+from . import Base
+
+
+class ScheduledTaskState(Base):
+    __tablename__ = "scheduled_task_state"
+    task_name = Column(String, primary_key=True)
+    last_fire_at = Column(Float, nullable=False)
+
+
+class SchedulerLease(Base):
+    __tablename__ = "scheduler_lease"
+    name = Column(String, primary_key=True)
+    holder = Column(String, nullable=False)
+    expires_at = Column(Float, nullable=False)
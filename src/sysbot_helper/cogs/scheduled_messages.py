@@ -21,6 +21,7 @@ class ScheduledMessages(commands.Cog):
     def __init__(self, bot: Bot, config: ScheduledMessagesConfig):
         self.bot = bot
         self.config = config
+        self.bot.template_engine.pin(msg_config.template for msg_config in self.config.messages)
 
         for index, msg_config in enumerate(self.config.messages):
             cb_name = f"message_{index}"
@@ -29,8 +30,9 @@ class ScheduledMessages(commands.Cog):
                 channel = self_inst.bot.get_channel(current_cfg.channel) or self_inst.bot.get_partial_messageable(
                     current_cfg.channel
                 )
-                variables = self_inst.bot.template_variables(channel)
-                resolved_content = self_inst.bot.template_engine.render_string(current_cfg.template, variables).strip()
+                engine = self_inst.bot.template_engine
+                variables = self_inst.bot.template_variables(channel, engine.referenced_names(current_cfg.template))
+                resolved_content = (await engine.render_string_async(current_cfg.template, variables)).strip()
                 if resolved_content:
                     await channel.send(resolved_content)
 
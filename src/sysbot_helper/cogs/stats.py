@@ -16,6 +16,7 @@ class Stats(commands.Cog):
     def __init__(self, bot: Bot, config: Config):
         self.bot = bot
         self.config = config
+        self.bot.template_engine.pin(self.config.channels.values())
 
     @scheduled("*/15 * * * *")
     async def run_update(self):
@@ -23,10 +24,11 @@ class Stats(commands.Cog):
             channel = self.bot.get_channel(channel_id)
             guild = channel.guild
 
-            variables = self.bot.template_variables(channel)
+            engine = self.bot.template_engine
+            variables = self.bot.template_variables(channel, engine.referenced_names(channel_template))
 
-            # Render template
-            text = self.bot.template_engine.render_string(channel_template, variables)
+            # Render template, reusing the previous name if nothing it depends on changed
+            text = await engine.render_string_async(channel_template, variables, cache_key=channel_id)
 
             if channel.name == text:
                 continue
@@ -40,6 +40,9 @@ class Telegram(commands.Cog):
     def __init__(self, bot: Bot, config: Config):
         self.bot = bot
         self.config = config
+        self.bot.template_engine.pin(
+            template for link in config.chat_link for template in (link.discord_message, link.telegram_message)
+        )
 
         # Setting up telegram objects
         self.session = AiohttpSession()
@@ -242,7 +245,7 @@ class Telegram(commands.Cog):
         if discord_ref:
             discord_msg.update({"reference": channel.get_partial_message(discord_ref)})
 
-        msg = discord_msg.get_send(self.bot, {"message": message, "text": unparse_entities(message)})
+        msg = await discord_msg.get_send(self.bot, {"message": message, "text": unparse_entities(message)})
 
         # Forward the message
         resp = await channel.send(**msg)
@@ -265,7 +268,7 @@ class Telegram(commands.Cog):
         discord_msg = await DiscordMessage.from_telegram(bot, message)
         discord_msg.update(chat_link.discord_message)
 
-        msg = discord_msg.get_send(self.bot, {"message": message})
+        msg = await discord_msg.get_send(self.bot, {"message": message})
 
         existing_id = await self.get_by_telegram(message)
         if existing_id:
@@ -1,12 +1,15 @@
 from collections.abc import Iterator, Mapping
 from datetime import datetime
-from functools import cache
+from functools import cache, lru_cache
 from typing import Any
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
 
 from discord.ext import commands
 from pydantic import BaseModel, field_validator
 
+# Resolved timezone lookups kept across renders; the keys come from templates, so the cache is bounded.
+TIMEZONE_CACHE_SIZE: int = 1024
+
 
 @cache
 def build_timezone_lookup_map() -> dict[str, ZoneInfo]:
@@ -43,6 +46,7 @@ def build_timezone_lookup_map() -> dict[str, ZoneInfo]:
     return lookup_map
 
 
+@lru_cache(maxsize=TIMEZONE_CACHE_SIZE)
 def resolve_timezone(key: str, server_timezone: str = "UTC") -> ZoneInfo:
     """Resolves a timezone string, alias, or city shortcut in O(1) time."""
     if key == "now":
@@ -69,6 +73,9 @@ def resolve_timezone(key: str, server_timezone: str = "UTC") -> ZoneInfo:
 class TimeContext(Mapping[str, datetime]):
     """Dynamic context mapping for template variable time and timezone evaluation."""
 
+    # Rendered times have at most second precision, so a render that read them stays valid for a second
+    valid_for: float = 1.0
+
     def __init__(self, server_timezone: str) -> None:
         self.server_timezone: str = server_timezone
 
@@ -25,7 +25,7 @@ class DiscordMessage:
         self.message["files"].append(file)
 
     async def send(self, ctx, variables):
-        message = self.get_send(ctx.bot, variables)
+        message = await self.get_send(ctx.bot, variables)
 
         # Specify the channel to send to
         _channel = message.pop("channel", None)
@@ -36,13 +36,13 @@ class DiscordMessage:
 
         return await channel.send(**message)
 
-    def get_send(self, bot, variables):
+    async def get_send(self, bot, variables):
         message = dict(self.message)
 
         # Render templates
         content = message.get("content", None)
         if content:
-            message["content"] = bot.template_engine.render_string(content, variables)
+            message["content"] = await bot.template_engine.render_string_async(content, variables)
 
         return message
 
@@ -2,7 +2,7 @@ import calendar
 import functools
 import re
 import zlib
-from collections.abc import Hashable
+from collections.abc import Hashable, Iterator
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from enum import Enum, auto
@@ -27,6 +27,9 @@ SUNDAY_ALTERNATIVE_INDEX: int = 7
 # The highest valid zero-indexed day number (Saturday is 6).
 MAXIMUM_DAY_OF_WEEK_INDEX: int = 6
 
+# Upper bound for next-occurrence searches; covers leap-day schedules across skipped leap years (e.g. 2096 -> 2104).
+MAXIMUM_SEARCH_YEARS: int = 8
+
 
 class CronFieldType(Enum):
     """Enumeration of cron expression fields in order of granularity."""
@@ -85,6 +88,16 @@ _PREDEFINED_CRON_SHORTCUTS: dict[str, str] = {
 }
 
 
+@dataclass(frozen=True)
+class ResolverCacheInfo:
+    """Snapshot of the HashedCronResolver period-scoped cache statistics."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
 @dataclass(frozen=True)
 class CronFieldSpecification:
     """Encapsulates allowed boundary limits and textual alias mappings for a specific cron field type."""
@@ -103,6 +116,15 @@ class HashedCronResolver:
         re.IGNORECASE,
     )
 
+    # Matches a standalone 'H' inside a field, but not the letter inside aliases such as 'thu' or 'march'
+    HASH_TOKEN_SEARCH_PATTERN: re.Pattern[str] = re.compile(r"(?<![a-z])h(?![a-z])", re.IGNORECASE)
+
+    # Resolved expressions keyed by (expression, job name), each valid until a hashed field's period rolls over
+    RESOLUTION_CACHE_MAXSIZE: int = 1024
+    _resolution_cache: dict[tuple[str, Hashable], tuple[float, float, str]] = {}
+    _resolution_cache_hits: int = 0
+    _resolution_cache_misses: int = 0
+
     # Specification defining allowed boundaries and alias mapping per cron field type
     FIELD_SPECIFICATIONS: list[CronFieldSpecification] = [
         CronFieldSpecification(CronFieldType.SECOND, 0, 59, {}),
@@ -167,6 +189,74 @@ class HashedCronResolver:
 
         return " ".join(resolved_tokens)
 
+    @classmethod
+    def resolve_expression_for_period(
+        cls,
+        expression_string: str,
+        job_name: Hashable,
+        target_datetime: datetime,
+    ) -> str:
+        """Resolves an expression like resolve_expression, memoizing the result per period of its hashed fields.
+
+        The cached string is reused until target_datetime leaves the current period of any field containing 'H',
+        so an 'H H * * *' expression is re-resolved once per hour instead of on every evaluation.
+        """
+        cache_key: tuple[str, Hashable] = (expression_string, job_name)
+        target_timestamp: float = _as_utc_if_naive(target_datetime).timestamp()
+
+        cached_entry = cls._resolution_cache.get(cache_key)
+        if cached_entry is not None and cached_entry[0] <= target_timestamp < cached_entry[1]:
+            cls._resolution_cache_hits += 1
+            return cached_entry[2]
+
+        cls._resolution_cache_misses += 1
+        resolved_expression: str = cls.resolve_expression(expression_string, job_name, target_datetime)
+        valid_from, valid_until = cls._get_resolution_window(expression_string, target_datetime)
+
+        if cache_key not in cls._resolution_cache and len(cls._resolution_cache) >= cls.RESOLUTION_CACHE_MAXSIZE:
+            cls._resolution_cache.pop(next(iter(cls._resolution_cache)))
+        cls._resolution_cache[cache_key] = (valid_from, valid_until, resolved_expression)
+
+        return resolved_expression
+
+    @classmethod
+    def cache_info(cls) -> "ResolverCacheInfo":
+        """Reports hit/miss counters and occupancy of the period-scoped resolution cache."""
+        return ResolverCacheInfo(
+            hits=cls._resolution_cache_hits,
+            misses=cls._resolution_cache_misses,
+            maxsize=cls.RESOLUTION_CACHE_MAXSIZE,
+            currsize=len(cls._resolution_cache),
+        )
+
+    @classmethod
+    def cache_clear(cls) -> None:
+        """Drops all memoized resolutions and resets the hit/miss counters."""
+        cls._resolution_cache.clear()
+        cls._resolution_cache_hits = 0
+        cls._resolution_cache_misses = 0
+
+    @classmethod
+    def _get_resolution_window(cls, expression_string: str, target_datetime: datetime) -> tuple[float, float]:
+        """Intersects the current periods of all hashed fields; the resolution is constant within the result."""
+        normalized_expression: str = _PREDEFINED_CRON_SHORTCUTS.get(
+            expression_string.strip().lower(),
+            expression_string.strip(),
+        )
+        tokens: list[str] = normalized_expression.split()
+        if len(tokens) == DEFAULT_CRON_FIELD_COUNT:
+            tokens = ["0"] + tokens
+
+        valid_from: float = float("-inf")
+        valid_until: float = float("inf")
+        for token_expression, specification in zip(tokens, cls.FIELD_SPECIFICATIONS, strict=False):
+            if not cls.HASH_TOKEN_SEARCH_PATTERN.search(token_expression):
+                continue
+            valid_from = max(valid_from, cls._get_period_start_timestamp(specification.field_type, target_datetime))
+            valid_until = min(valid_until, cls._get_period_end_timestamp(specification.field_type, target_datetime))
+
+        return valid_from, valid_until
+
     @classmethod
     def resolve_token(
         cls,
@@ -385,8 +475,35 @@ class HashedCronResolver:
         target_datetime: datetime,
     ) -> int:
         """Calculates Unix timestamp (seconds) at the start of the field's evaluation period."""
-        if target_datetime.tzinfo is None:
-            target_datetime = target_datetime.replace(tzinfo=UTC)
+        return int(cls._get_period_start_datetime(field_type, target_datetime).timestamp())
+
+    @classmethod
+    def _get_period_end_timestamp(
+        cls,
+        field_type: CronFieldType,
+        target_datetime: datetime,
+    ) -> int:
+        """Calculates Unix timestamp (seconds) at the start of the period following the field's current period."""
+        period_datetime: datetime = cls._get_period_start_datetime(field_type, target_datetime)
+
+        if field_type == CronFieldType.SECOND:
+            next_period_datetime: datetime = period_datetime + timedelta(minutes=1)
+        elif field_type == CronFieldType.MINUTE:
+            next_period_datetime = period_datetime + timedelta(hours=1)
+        elif field_type == CronFieldType.HOUR:
+            next_period_datetime = period_datetime + timedelta(days=1)
+        elif field_type == CronFieldType.DAY_OF_MONTH:
+            next_period_datetime = _start_of_next_month(period_datetime)
+        elif field_type == CronFieldType.MONTH:
+            next_period_datetime = period_datetime.replace(year=period_datetime.year + 1)
+        elif field_type == CronFieldType.DAY_OF_WEEK:
+            next_period_datetime = period_datetime + timedelta(days=DAYS_IN_WEEK)
+
+        return int(next_period_datetime.timestamp())
+
+    @staticmethod
+    def _get_period_start_datetime(field_type: CronFieldType, target_datetime: datetime) -> datetime:
+        target_datetime = _as_utc_if_naive(target_datetime)
 
         if field_type == CronFieldType.SECOND:
             period_datetime: datetime = target_datetime.replace(second=0, microsecond=0)
@@ -404,7 +521,7 @@ class HashedCronResolver:
                 hour=0, minute=0, second=0, microsecond=0
             )
 
-        return int(period_datetime.timestamp())
+        return period_datetime
 
     @staticmethod
     def _compute_stable_hash(job_name: Hashable, field_type: CronFieldType, period_start_timestamp: int) -> int:
@@ -583,6 +700,39 @@ class CronItem:
         return pattern_string
 
 
+def _compile_field_mask(field_items: list[CronItem], minimum_value: int, maximum_value: int) -> int:
+    """Sets bit N of the mask for every value N in [minimum_value, maximum_value] matched by any item."""
+    mask: int = 0
+    for value in range(minimum_value, maximum_value + 1):
+        if any(item.match(value) for item in field_items):
+            mask |= 1 << value
+    return mask
+
+
+def _next_set_bit(mask: int, current_value: int) -> int | None:
+    """Finds the smallest value >= current_value whose bit is set in mask, or None if there is none."""
+    remaining_mask: int = mask >> current_value
+    if not remaining_mask:
+        return None
+    return current_value + (remaining_mask & -remaining_mask).bit_length() - 1
+
+
+def _as_utc_if_naive(target_datetime: datetime) -> datetime:
+    if target_datetime.tzinfo is None:
+        return target_datetime.replace(tzinfo=UTC)
+    return target_datetime
+
+
+def _start_of_day(target_datetime: datetime) -> datetime:
+    return target_datetime.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _start_of_next_month(target_datetime: datetime) -> datetime:
+    if target_datetime.month == 12:
+        return _start_of_day(target_datetime.replace(year=target_datetime.year + 1, month=1, day=1))
+    return _start_of_day(target_datetime.replace(month=target_datetime.month + 1, day=1))
+
+
 @functools.lru_cache(maxsize=1024)
 def _compile_resolved_cron_expression(expression_string: str) -> "CronExpression":
     return CronExpression(expression_string, seed=None)
@@ -601,6 +751,14 @@ class CronExpression:
         "raw_expression",
         "seed",
         "has_explicit_seconds_field",
+        "second_mask",
+        "minute_mask",
+        "hour_mask",
+        "day_mask",
+        "month_mask",
+        "day_of_week_mask",
+        "day_restricted",
+        "day_of_week_restricted",
     )
 
     def __init__(
@@ -630,22 +788,79 @@ class CronExpression:
         if target_datetime is None:
             target_datetime = datetime.now(UTC)
 
+        expression: CronExpression = self._resolve_for(target_datetime)
+        return bool(
+            (expression.second_mask >> target_datetime.second) & 1
+            and (expression.minute_mask >> target_datetime.minute) & 1
+            and (expression.hour_mask >> target_datetime.hour) & 1
+            and (expression.month_mask >> target_datetime.month) & 1
+            and expression._matches_date(target_datetime)
+        )
+
+    def next_fire_after(self, target_datetime: datetime) -> datetime | None:
+        """Computes the first instant strictly after target_datetime that matches the expression.
+
+        Fields are advanced from the coarsest (month) to the finest (second), jumping straight to the next
+        candidate value instead of scanning every second. Hashed expressions are re-resolved whenever the
+        candidate moves, so 'H' tokens follow the seed of the period the candidate falls into.
+        Returns None if the expression never fires within MAXIMUM_SEARCH_YEARS.
+        """
+        candidate: datetime = target_datetime.replace(microsecond=0) + timedelta(seconds=1)
+        last_searched_year: int = candidate.year + MAXIMUM_SEARCH_YEARS
+
+        while candidate.year <= last_searched_year:
+            expression: CronExpression = self._resolve_for(candidate)
+
+            if not (expression.month_mask >> candidate.month) & 1:
+                candidate = _start_of_next_month(candidate)
+                continue
+
+            if not expression._matches_date(candidate):
+                candidate = _start_of_day(candidate + timedelta(days=1))
+                continue
+
+            next_hour: int | None = _next_set_bit(expression.hour_mask, candidate.hour)
+            if next_hour is None:
+                candidate = _start_of_day(candidate + timedelta(days=1))
+                continue
+            if next_hour != candidate.hour:
+                candidate = candidate.replace(hour=next_hour, minute=0, second=0)
+                continue
+
+            next_minute: int | None = _next_set_bit(expression.minute_mask, candidate.minute)
+            if next_minute is None:
+                candidate = candidate.replace(minute=0, second=0) + timedelta(hours=1)
+                continue
+            if next_minute != candidate.minute:
+                candidate = candidate.replace(minute=next_minute, second=0)
+                continue
+
+            next_second: int | None = _next_set_bit(expression.second_mask, candidate.second)
+            if next_second is None:
+                candidate = candidate.replace(second=0) + timedelta(minutes=1)
+                continue
+
+            return candidate.replace(second=next_second)
+
+        return None
+
+    def fires_between(self, start_datetime: datetime, end_datetime: datetime) -> Iterator[datetime]:
+        """Yields every instant in the half-open interval (start_datetime, end_datetime] matching the expression."""
+        fire_datetime: datetime | None = self.next_fire_after(start_datetime)
+        while fire_datetime is not None and fire_datetime <= end_datetime:
+            yield fire_datetime
+            fire_datetime = self.next_fire_after(fire_datetime)
+
+    def _resolve_for(self, target_datetime: datetime) -> "CronExpression":
+        """Returns the expression with 'H' tokens resolved for the periods containing target_datetime."""
         if self.seed is not None and "h" in self.raw_expression.lower():
-            resolved_expression_string: str = HashedCronResolver.resolve_expression(
+            resolved_expression_string: str = HashedCronResolver.resolve_expression_for_period(
                 self.raw_expression,
                 job_name=self.seed,
                 target_datetime=target_datetime,
             )
-            resolved_cron_expression = _compile_resolved_cron_expression(resolved_expression_string)
-            return resolved_cron_expression.is_now(target_datetime)
-
-        return (
-            any(item.match(target_datetime.second) for item in self.second)
-            and any(item.match(target_datetime.minute) for item in self.minute)
-            and any(item.match(target_datetime.hour) for item in self.hour)
-            and any(item.match(target_datetime.month) for item in self.month)
-            and self._matches_date(target_datetime)
-        )
+            return _compile_resolved_cron_expression(resolved_expression_string)
+        return self
 
     def _matches_date(self, target_datetime: datetime) -> bool:
         """Evaluates Day-of-Month and Day-of-Week matching using POSIX standards.
@@ -654,16 +869,13 @@ class CronExpression:
         """
         current_day_of_week: int = (target_datetime.weekday() + 1) % DAYS_IN_WEEK
 
-        dom_match: bool = any(item.match(target_datetime.day) for item in self.day)
-        dow_match: bool = any(item.match(current_day_of_week) for item in self.day_of_week)
-
-        dom_restricted: bool = not any(item.is_wildcard for item in self.day)
-        dow_restricted: bool = not any(item.is_wildcard for item in self.day_of_week)
+        dom_match: int = (self.day_mask >> target_datetime.day) & 1
+        dow_match: int = (self.day_of_week_mask >> current_day_of_week) & 1
 
-        if dom_restricted and dow_restricted:
-            return dom_match or dow_match
+        if self.day_restricted and self.day_of_week_restricted:
+            return bool(dom_match or dow_match)
 
-        return dom_match and dow_match
+        return bool(dom_match and dow_match)
 
     def _build_field_items(self, expression_string: str) -> None:
         """Parses expression tokens into CronItem instances (standardized to 6 fields internally)."""
@@ -695,6 +907,17 @@ class CronExpression:
         self.month = [CronItem.Month(token) for token in month_token.split(",")]
         self.day_of_week = [CronItem.DayOfWeek(token) for token in day_of_week_token.split(",")]
 
+        # Compile every field into a bitmask indexed by field value, so matching is a bit test per field
+        self.second_mask: int = _compile_field_mask(self.second, 0, 59)
+        self.minute_mask: int = _compile_field_mask(self.minute, 0, 59)
+        self.hour_mask: int = _compile_field_mask(self.hour, 0, 23)
+        self.day_mask: int = _compile_field_mask(self.day, 1, 31)
+        self.month_mask: int = _compile_field_mask(self.month, 1, 12)
+        self.day_of_week_mask: int = _compile_field_mask(self.day_of_week, 0, MAXIMUM_DAY_OF_WEEK_INDEX)
+
+        self.day_restricted: bool = not any(item.is_wildcard for item in self.day)
+        self.day_of_week_restricted: bool = not any(item.is_wildcard for item in self.day_of_week)
+
     def __str__(self) -> str:
         all_fields = [
             self.second,
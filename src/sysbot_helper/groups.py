@@ -1,10 +1,10 @@
-import json
 from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from itertools import chain
-from os.path import exists
 from typing import Any
 
+from .groups_store import JsonGroupsStore
+
 
 @dataclass
 class Group:
@@ -12,84 +12,142 @@ class Group:
     children: set[int] = field(default_factory=set)
 
 
-def serialize_sets(obj):
-    if isinstance(obj, set):
-        return list(obj)
-    return obj
+class Groups:
+    """Named groups of member ids, nested through child groups.
 
+    Every group's transitive member set is precomputed as a frozenset, together with a reverse index from each
+    member to the groups containing it, so membership tests are O(1). Changes only recompute the closures of the
+    changed groups and their ancestors.
+    """
 
-class Groups:
     ALL_GROUP = "all"
 
-    def __init__(self, config=None, save_file=None):
+    def __init__(self, config=None, save_file=None, **store_options):
         if config is None:
             config = {}
         self.group_names: dict[str, int] = {}
         self.groups: list[Group] = []
 
+        # Closure index: group index -> every member of the group and its descendants
+        self._closures: list[frozenset[Any]] = []
+        # Reverse edges of Group.children, to find the closures a change affects
+        self._parents: list[set[int]] = []
+        # Reverse index: member -> indices of the groups whose closure contains it
+        self._member_groups: dict[Any, set[int]] = defaultdict(set)
+        self._index_names: dict[int, str] = {}
+        # Groups changed since the closures were last refreshed
+        self._dirty: set[int] = set()
+        # Saved group name -> index of the child group holding its saved members
+        self._saved_group_indices: dict[str, int] = {}
+
         self.update(config)
-        self.init_save_file(save_file)
+        self.init_save_file(save_file, **store_options)
 
-    def init_save_file(self, fn):
+    def init_save_file(self, fn, **store_options):
         self.saved_groups = defaultdict(set)
+        self.store = JsonGroupsStore(fn, **store_options) if fn else None
 
-        if fn and exists(fn):
-            with open(fn) as f:
-                saved_groups = json.load(f)
-                for name, members in saved_groups.items():
-                    self.add_member_save(name, *members)
+        if self.store is not None:
+            for name, members in self.store.load().items():
+                self._add_saved_members(name, members)
+            self._refresh_closures()
         self.save_file = fn
 
+    def set_store(self, store):
+        """Replaces the saved groups store, such as with a DatabaseGroupsStore once the database is set up."""
+        self.store = store
+
     def write_save_file(self):
-        if getattr(self, "save_file", None):
-            with open(self.save_file, "w") as f:
-                json.dump(self.saved_groups, f, indent=2, default=serialize_sets)
+        if isinstance(self.store, JsonGroupsStore):
+            self.store.write_now(self.saved_groups)
+
+    async def start(self):
+        """Loads the saved groups of stores shared with other processes, and follows their changes."""
+        if self.store is not None:
+            await self.store.start(self.replace_saved_groups)
+
+    async def flush(self):
+        """Writes pending saved group changes."""
+        if self.store is not None:
+            await self.store.flush()
+
+    async def close(self):
+        if self.store is not None:
+            await self.store.close()
+
+    def replace_saved_groups(self, saved_groups):
+        """Replaces the members of every saved group, such as with the members another process saved."""
+        for name in set(self.saved_groups) | set(saved_groups):
+            self._add_saved_members(name, ())
+            members = self.saved_groups[name]
+            members.clear()
+            members.update(saved_groups.get(name, ()))
+        self._refresh_closures()
 
     def add_member_save(self, name, *member_ids):
-        if name not in self.saved_groups:
-            group = self._ensure_group(name)
-            group.children.add(len(self.groups))
-            self.groups.append(Group(self.saved_groups[name]))
-        self.saved_groups[name].update(member_ids)
-        self.write_save_file()
+        self._add_saved_members(name, member_ids)
+        self._refresh_closures()
+        if self.store is not None:
+            self.store.changed(self.saved_groups, "add", name, member_ids)
 
     def remove_member_save(self, name, *member_ids):
+        if name not in self._saved_group_indices:
+            return
         self.saved_groups[name].difference_update(member_ids)
-        self.write_save_file()
+        self._dirty.add(self._saved_group_indices[name])
+        self._refresh_closures()
+        if self.store is not None:
+            self.store.changed(self.saved_groups, "remove", name, member_ids)
+
+    def _add_saved_members(self, name, member_ids):
+        if name not in self._saved_group_indices:
+            # Saved members live in an anonymous child group sharing the saved_groups set
+            group = self._ensure_group(name)
+            index = self._new_group(Group(self.saved_groups[name]))
+            self._saved_group_indices[name] = index
+            self._add_child(group, self.group_names[name], index)
+        self.saved_groups[name].update(member_ids)
+        self._dirty.add(self._saved_group_indices[name])
 
     def update(self, config):
         self._update_groups(self.ALL_GROUP, config)
+        self._refresh_closures()
 
     def in_group(self, member_id, name):
         return self.in_group_any(member_id, name)
 
     def in_group_any(self, member_id, *groups):
-        return member_id in self.get_members(*groups)
+        for name in groups:
+            index = self.group_names.get(name)
+            if index is not None:
+                if member_id in self._closures[index]:
+                    return True
+            elif isinstance(name, int) and name == member_id:
+                # Plain ids stand for themselves, as in get_members
+                return True
+        return False
 
     def in_group_all(self, member_id, *groups):
         return all(self.in_group(member_id, group) for group in groups)
 
     def get_members(self, *groups, member_types=(int,)):
-        # BFS
-        q = deque()
+        closures = []
         members = set()
         for name in groups:
             if name in self.group_names:
-                q.append(self.group_names[name])
+                closures.append(self._closures[self.group_names[name]])
             elif isinstance(name, member_types):
                 members.add(name)
-        visited = set(q)
 
-        while q:
-            group = q.popleft()
-            members.update(self.groups[group].members)
-            for child in self.groups[group].children:
-                if child in visited:
-                    continue
-                q.append(child)
-                visited.add(child)
+        # A single group is served straight from the index, without copying
+        if len(closures) == 1 and not members:
+            return closures[0]
+        return frozenset(members.union(*closures))
 
-        return members
+    def get_groups(self, member_id):
+        """Names of every group containing the member, directly or through nested groups."""
+        indices = self._member_groups.get(member_id, ())
+        return frozenset(self._index_names[index] for index in indices if index in self._index_names)
 
     def get_all_members(self):
         return set(chain(*(g.members for g in self.groups)))
@@ -99,10 +157,25 @@ class Groups:
 
     def _ensure_group(self, name):
         if name not in self.group_names:
-            self.group_names[name] = len(self.groups)
-            self.groups.append(Group())
+            index = self._new_group(Group())
+            self.group_names[name] = index
+            self._index_names[index] = name
         return self.get_group(name)
 
+    def _new_group(self, group):
+        self.groups.append(group)
+        self._closures.append(frozenset())
+        self._parents.append(set())
+        index = len(self.groups) - 1
+        self._dirty.add(index)
+        return index
+
+    def _add_child(self, group, index, child):
+        if child not in group.children:
+            group.children.add(child)
+            self._parents[child].add(index)
+            self._dirty.add(index)
+
     def _update_groups(self, name, value):
         group = self._ensure_group(name)
 
@@ -112,9 +185,78 @@ class Groups:
         elif isinstance(value, dict):
             for k, v in value.items():
                 self._update_groups(k, v)
-                group.children.add(self.group_names[k])
-        else:  # actual value
+                self._add_child(group, self.group_names[name], self.group_names[k])
+        elif value not in group.members:  # actual value
             group.members.add(value)
+            self._dirty.add(self.group_names[name])
+
+    def _refresh_closures(self):
+        """Recomputes the closures of the changed groups and their ancestors, and the reverse index with them."""
+        if not self._dirty:
+            return
+        affected = self._ancestors(self._dirty)
+        self._dirty = set()
+
+        refreshed = set()
+        for index in self._children_first(affected):
+            members = set(self.groups[index].members)
+            queue = deque(self.groups[index].children)
+            visited = {index, *queue}
+            while queue:
+                child = queue.popleft()
+                if child not in affected or child in refreshed:
+                    # Closures outside the affected set, or refreshed already, are up to date
+                    members.update(self._closures[child])
+                    continue
+                # Only reached on cycles, where a child cannot be refreshed before its parent
+                members.update(self.groups[child].members)
+                for grandchild in self.groups[child].children:
+                    if grandchild not in visited:
+                        visited.add(grandchild)
+                        queue.append(grandchild)
+
+            closure = frozenset(members)
+            previous = self._closures[index]
+            if closure != previous:
+                for member in closure - previous:
+                    self._member_groups[member].add(index)
+                for member in previous - closure:
+                    self._member_groups[member].discard(index)
+                    if not self._member_groups[member]:
+                        del self._member_groups[member]
+                self._closures[index] = closure
+            refreshed.add(index)
+
+    def _ancestors(self, indices):
+        result = set(indices)
+        queue = deque(indices)
+        while queue:
+            for parent in self._parents[queue.popleft()]:
+                if parent not in result:
+                    result.add(parent)
+                    queue.append(parent)
+        return result
+
+    def _children_first(self, indices):
+        """Orders the given groups so that, outside of cycles, every group comes after its children."""
+        order = []
+        seen = set()
+        for root in indices:
+            if root in seen:
+                continue
+            seen.add(root)
+            stack = [(root, iter(self.groups[root].children))]
+            while stack:
+                index, children = stack[-1]
+                for child in children:
+                    if child in indices and child not in seen:
+                        seen.add(child)
+                        stack.append((child, iter(self.groups[child].children)))
+                        break
+                else:
+                    stack.pop()
+                    order.append(index)
+        return order
 
     def __repr__(self) -> str:
         return repr(self.groups)
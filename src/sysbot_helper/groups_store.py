@@ -0,0 +1,337 @@
+import asyncio
+import json
+import logging
+import os
+from collections.abc import Callable, Iterable, Mapping
+from contextlib import suppress
+from pathlib import Path
+from typing import Any
+
+from .schedule_store import write_json_atomic
+
+log = logging.getLogger(__name__)
+
+# Seconds to wait after a change before writing, so a burst of changes results in a single write.
+GROUPS_SAVE_DEBOUNCE_SECONDS: float = 1.0
+
+# Seconds to wait before writing again after a failed write of the save file.
+GROUPS_SAVE_RETRY_SECONDS: float = 5
+
+# Number of change log entries after which the log is folded back into the save file.
+GROUPS_LOG_COMPACT_ENTRIES: int = 1000
+
+# Seconds between checks of the shared version counter for changes made by other processes.
+GROUPS_REFRESH_INTERVAL_SECONDS: float = 5
+
+
+class JsonGroupsStore:
+    """Persists saved group members (group name -> member ids) to a JSON file.
+
+    Changes are coalesced for debounce seconds and written in a worker thread, replacing the file atomically.
+    With change_log enabled, changes are appended to a "<file>.log" of JSON lines instead of rewriting the whole
+    file, and the log is compacted into the file once it holds compact_entries entries. Outside of an event loop,
+    such as at startup, changes are written right away.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        debounce: float = GROUPS_SAVE_DEBOUNCE_SECONDS,
+        change_log: bool = False,
+        compact_entries: int = GROUPS_LOG_COMPACT_ENTRIES,
+    ) -> None:
+        self.path = Path(path)
+        self.log_path = self.path.with_name(self.path.name + ".log")
+        self.debounce = debounce
+        self.change_log = change_log
+        self.compact_entries = compact_entries
+
+        self.writes = 0
+        self._state: Mapping[str, set[Any]] = {}
+        self._pending: list[list[Any]] = []
+        self._dirty = False
+        self._log_entries = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task | None = None
+        self._write_lock = asyncio.Lock()
+
+    async def start(self, on_reload: Callable[[dict[str, set[Any]]], None]) -> None:
+        """Nothing to follow, only this process writes the save file and it was loaded at startup."""
+
+    async def close(self) -> None:
+        await self.flush()
+
+    def load(self) -> dict[str, set[Any]]:
+        """Reads the save file, then replays the change log on top of it line by line."""
+        state: dict[str, set[Any]] = {}
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as f:
+                state = {name: set(members) for name, members in json.load(f).items()}
+
+        self._log_entries = 0
+        if self.log_path.exists():
+            with self.log_path.open(encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        op, name, members = json.loads(line)
+                    except ValueError:
+                        # Only the last line can be partial, left behind by a crash during an append
+                        log.warning("Ignoring a truncated entry at the end of %s", self.log_path)
+                        break
+                    apply_change(state, op, name, members)
+                    self._log_entries += 1
+        return state
+
+    def changed(self, state: Mapping[str, set[Any]], op: str, name: str, member_ids: Iterable[Any]) -> None:
+        """Records a change to the given state and schedules a write."""
+        self._state = state
+        self._pending.append([op, name, list(member_ids)])
+        self._dirty = True
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            entries, snapshot = self._take_pending()
+            try:
+                self._write(entries, snapshot)
+            except BaseException:
+                self._restore_pending(entries)
+                raise
+            return
+
+        if self._timer is None:
+            self._timer = loop.call_later(self.debounce, self._start_flush)
+
+    def _start_flush(self) -> None:
+        self._timer = None
+        self._flush_task = asyncio.create_task(self._flush_or_retry())
+
+    async def _flush_or_retry(self) -> None:
+        try:
+            await self.flush()
+        except Exception:
+            log.exception("Unable to write %s, retrying in %s seconds", self.path, GROUPS_SAVE_RETRY_SECONDS)
+            if self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(GROUPS_SAVE_RETRY_SECONDS, self._start_flush)
+
+    async def flush(self) -> None:
+        """Writes every pending change now, in a worker thread.
+
+        If the write fails, the changes stay pending for the next flush and the error is raised.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        async with self._write_lock:
+            if self._dirty:
+                entries, snapshot = self._take_pending()
+                try:
+                    await asyncio.to_thread(self._write, entries, snapshot)
+                except BaseException:
+                    self._restore_pending(entries)
+                    raise
+
+    def _take_pending(self) -> tuple[list[list[Any]], dict[str, list[Any]] | None]:
+        # Runs on the loop thread, so the worker thread only sees copies of the state
+        entries, self._pending = self._pending, []
+        self._dirty = False
+
+        snapshot = None
+        if not self.change_log or self._log_entries + len(entries) >= self.compact_entries:
+            snapshot = {name: list(members) for name, members in self._state.items()}
+        return entries, snapshot
+
+    def _restore_pending(self, entries: list[list[Any]]) -> None:
+        # Keep them ahead of the changes recorded during the write, which are newer
+        self._pending[:0] = entries
+        self._dirty = True
+
+    def _write(self, entries: list[list[Any]], snapshot: dict[str, list[Any]] | None) -> None:
+        self.writes += 1
+        if snapshot is not None:
+            # The snapshot already includes the pending entries, the log starts over empty
+            write_json_atomic(self.path, snapshot)
+            if self.change_log:
+                self.log_path.write_text("", encoding="utf-8")
+            self._log_entries = 0
+            return
+
+        with self.log_path.open("a", encoding="utf-8") as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in entries)
+            f.flush()
+            os.fsync(f.fileno())
+        self._log_entries += len(entries)
+
+    def write_now(self, state: Mapping[str, set[Any]]) -> None:
+        """Writes the whole state synchronously, compacting the change log."""
+        self._state = state
+        self._pending = []
+        self._dirty = False
+        self._write([], {name: list(members) for name, members in state.items()})
+
+
+def apply_change(state: dict[str, set[Any]], op: str, name: str, member_ids: Iterable[Any]) -> None:
+    if op == "add":
+        state.setdefault(name, set()).update(member_ids)
+    elif name in state:
+        state[name].difference_update(member_ids)
+
+
+class DatabaseGroupsStore:
+    """Persists saved group members through the bot's SQLAlchemy session factory, shared by every process.
+
+    Every write also bumps a version counter row in the same transaction. Processes only poll that counter and
+    reload the members once it moved, so membership checks keep reading the in-memory index.
+    """
+
+    VERSION_NAME = "saved_groups"
+
+    def __init__(self, session_factory: Any, refresh_interval: float = GROUPS_REFRESH_INTERVAL_SECONDS) -> None:
+        self.Session = session_factory
+        self.refresh_interval = refresh_interval
+        self.version: int | None = None
+        self._on_reload: Callable[[dict[str, set[Any]]], None] | None = None
+        self._pending: list[list[Any]] = []
+        self._flush_task: asyncio.Task | None = None
+        self._refresh_task: asyncio.Task | None = None
+        self._write_lock = asyncio.Lock()
+
+    async def start(self, on_reload: Callable[[dict[str, set[Any]]], None]) -> None:
+        """Loads the saved members and keeps following changes made by other processes.
+
+        If the database cannot be read yet, the error is logged and the refresh loop keeps retrying.
+        """
+        self._on_reload = on_reload
+        try:
+            await self.refresh()
+        except Exception:
+            log.exception("Unable to load saved groups from the database")
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self.refresh_loop())
+
+    async def close(self) -> None:
+        for task in (self._refresh_task, self._flush_task):
+            if task is not None:
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+        self._refresh_task = None
+        self._flush_task = None
+        await self.flush()
+
+    def changed(self, state: Mapping[str, set[Any]], op: str, name: str, member_ids: Iterable[Any]) -> None:
+        """Records a change, which is written right away in the background."""
+        self._pending.append([op, name, list(member_ids)])
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_until_written())
+
+    async def _flush_until_written(self) -> None:
+        # Failed writes keep their changes pending, retry them until the database accepts them
+        while self._pending:
+            try:
+                await self.flush()
+            except Exception:
+                log.exception(
+                    "Unable to write saved groups to the database, retrying in %s seconds", self.refresh_interval
+                )
+                await asyncio.sleep(self.refresh_interval)
+
+    async def flush(self) -> None:
+        """Writes every pending change in a single transaction.
+
+        If the write fails, the changes stay pending for the next flush and the error is raised.
+        """
+        from sqlalchemy.exc import IntegrityError
+
+        async with self._write_lock:
+            entries, self._pending = self._pending, []
+            if not entries:
+                return
+
+            try:
+                try:
+                    version = await self._write(entries)
+                except IntegrityError:
+                    # Another process inserted the same rows first, the retry sees them and merges into them
+                    version = await self._write(entries)
+            except BaseException:
+                # Keep them ahead of the changes recorded during the write, which are newer
+                self._pending[:0] = entries
+                raise
+
+        if self.version is not None and version == self.version + 1:
+            # Nobody else wrote in the meantime, so there is nothing to reload
+            self.version = version
+
+    async def _write(self, entries: list[list[Any]]) -> int:
+        from sqlalchemy import delete, select, update
+
+        from .cogs.models import SavedGroupMember, SavedGroupsVersion
+
+        async with self.Session.begin() as session:
+            for op, name, member_ids in entries:
+                if op == "add":
+                    for member_id in member_ids:
+                        await session.merge(SavedGroupMember(name=name, member_id=member_id))
+                else:
+                    await session.execute(
+                        delete(SavedGroupMember).where(
+                            SavedGroupMember.name == name, SavedGroupMember.member_id.in_(member_ids)
+                        )
+                    )
+
+            result = await session.execute(
+                update(SavedGroupsVersion)
+                .where(SavedGroupsVersion.name == self.VERSION_NAME)
+                .values(version=SavedGroupsVersion.version + 1)
+            )
+            if not result.rowcount:
+                session.add(SavedGroupsVersion(name=self.VERSION_NAME, version=1))
+                return 1
+            return await session.scalar(
+                select(SavedGroupsVersion.version).where(SavedGroupsVersion.name == self.VERSION_NAME)
+            )
+
+    async def refresh(self) -> bool:
+        """Reloads the saved members if the version counter moved since they were last loaded."""
+        from sqlalchemy import select
+
+        from .cogs.models import SavedGroupMember
+
+        await self.flush()
+        async with self.Session() as session:
+            # Read the version first: rows newer than it only cause one more reload later
+            version = await self._current_version(session)
+            if version == self.version:
+                return False
+            rows = await session.execute(select(SavedGroupMember))
+
+        state: dict[str, set[Any]] = {}
+        for row in rows.scalars():
+            state.setdefault(row.name, set()).add(row.member_id)
+        # Changes made while loading are not written yet, keep them on top of what was read
+        for op, name, member_ids in self._pending:
+            apply_change(state, op, name, member_ids)
+
+        self.version = version
+        if self._on_reload is not None:
+            self._on_reload(state)
+        return True
+
+    async def refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception:
+                log.exception("Unable to refresh saved groups from the database")
+
+    async def _current_version(self, session: Any) -> int:
+        from sqlalchemy import select
+
+        from .cogs.models import SavedGroupsVersion
+
+        version = await session.scalar(
+            select(SavedGroupsVersion.version).where(SavedGroupsVersion.name == self.VERSION_NAME)
+        )
+        return version or 0
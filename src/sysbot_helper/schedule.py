@@ -1,13 +1,109 @@
 import asyncio
+import bisect
+import copy
+import heapq
+import importlib
+import inspect
+import itertools
 import logging
+import multiprocessing
 import time
-from datetime import datetime
+import zlib
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import suppress
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from typing import Any
 
-from .cron import CronExpression
+from .cron import SECONDS_PER_MINUTE, CronExpression
+from .schedule_lease import DatabaseLease, FileLease
+from .schedule_store import DatabaseStateStore, JsonStateStore
 
 log = logging.getLogger(__name__)
 
+# Wake slightly after the due instant so wall-clock reads at dispatch time are never early.
+SCHEDULER_WAKEUP_SLACK: float = 0.005
+
+# Upper bound for a single sleep, so wall-clock adjustments (NTP, suspend) are picked up promptly.
+MAXIMUM_SLEEP_SECONDS: float = 60
+
+# What to do when a task fires while max_instances copies of it are still running.
+OVERLAP_POLICIES: tuple[str, ...] = ("skip", "queue", "cancel_previous")
+
+# How missed runs are handled after a stall: dropped, coalesced into a single run, or replayed one by one.
+CATCH_UP_POLICIES: tuple[str, ...] = ("none", "once", "all")
+
+# A fire time is considered missed once the scheduler is this many seconds late for it.
+MISFIRE_GRACE_SECONDS: float = 1.0
+
+# How long a leader lease lasts without renewal; the leader renews it three times per period.
+LEASE_TTL_SECONDS: float = 30
+
+# Where a task callback runs: on the event loop (None), in the scheduler's thread pool or in its process pool.
+EXECUTORS: tuple[str | None, ...] = (None, "thread", "process")
+
+# Cap on the number of missed instants enumerated for a single task after a stall.
+MAXIMUM_CATCH_UP_RUNS: int = 1000
+
+# Runs missed longer ago than this many seconds are dropped rather than caught up, after a stall or a downtime.
+CATCH_UP_WINDOW_SECONDS: float = 3600
+
+# Upper bounds in seconds of the telemetry histogram buckets; a final bucket collects everything above.
+HISTOGRAM_BUCKETS: tuple[float, ...] = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+# How often in seconds changed last-run timestamps are written to the state store.
+STATE_FLUSH_INTERVAL_SECONDS: float = 5
+
+
+@dataclass
+class Histogram:
+    """Fixed-bucket histogram of durations in seconds."""
+
+    bounds: tuple[float, ...] = HISTOGRAM_BUCKETS
+    counts: list[int] = field(default_factory=list)
+    count: int = 0
+    total: float = 0.0
+    maximum: float = 0.0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.bounds) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Estimates the q-quantile as the upper bound of the bucket containing it."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for bound, bucket_count in zip(self.bounds, self.counts, strict=False):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return min(bound, self.maximum)
+        return self.maximum
+
+
+@dataclass
+class TaskTelemetry:
+    """Timing and failure counters for one scheduled task."""
+
+    lag: Histogram = field(default_factory=Histogram)
+    duration: Histogram = field(default_factory=Histogram)
+    runs: int = 0
+    timeouts: int = 0
+    exceptions: int = 0
+    missed_runs: int = 0
+
 
 def scheduled(*args, **kwargs):
     """Decorator for making a scheduled task from a callback function."""
@@ -22,46 +118,288 @@ def scheduled(*args, **kwargs):
 class ScheduledTask:
     """Represents a scheduled task with associated cron expression schedules."""
 
-    def __init__(self, *cron_expr: str, callback: Any, on_ready: bool = False) -> None:
+    def __init__(
+        self,
+        *cron_expr: str,
+        callback: Any,
+        on_ready: bool = False,
+        max_instances: int = 1,
+        overlap: str = "skip",
+        catch_up: str = "once",
+        max_catch_up: float | None = None,
+        executor: str | None = None,
+        on_result: str | None = None,
+    ) -> None:
+        if executor not in EXECUTORS:
+            raise ValueError(f"Invalid executor '{executor}', expected one of {EXECUTORS}")
+        if executor and inspect.iscoroutinefunction(callback):
+            raise ValueError(f"Callback of a task with executor '{executor}' must be a regular function")
+        if overlap not in OVERLAP_POLICIES:
+            raise ValueError(f"Invalid overlap policy '{overlap}', expected one of {OVERLAP_POLICIES}")
+        if catch_up not in CATCH_UP_POLICIES:
+            raise ValueError(f"Invalid catch_up policy '{catch_up}', expected one of {CATCH_UP_POLICIES}")
+        if max_catch_up is not None and max_catch_up < 0:
+            raise ValueError(f"max_catch_up must be >= 0, received {max_catch_up}")
+        if max_instances < 1:
+            raise ValueError(f"max_instances must be >= 1, received {max_instances}")
+
         self.raw_schedules = cron_expr
         self.callback = callback
         self.on_ready = on_ready
+        self.name: str = self.callback.__name__
+
+        # Off-loop execution; on_result names a cog method called on the loop with the callback's return value
+        self.executor = executor
+        self.on_result = on_result
         self.cron_schedules: list[CronExpression] = []
 
-    def bind_to_cog(self, cog: Any) -> None:
-        """Binds the scheduled task to a cog and compiles cron expressions with dynamic seeding."""
-        seed_name = f"{cog.__class__.__name__}.{self.callback.__name__}"
-        self.cron_schedules = [CronExpression(expr, seed=seed_name) for expr in self.raw_schedules]
+        # Seconds added to schedules without an explicit seconds field, to spread minute-aligned tasks
+        self.spread_seconds = 0
+
+        # Overlap control between runs of this task
+        self.max_instances = max_instances
+        self.overlap = overlap
+        self.catch_up = catch_up
+        # Catch-up window in seconds overriding the scheduler's max_catch_up, such as math.inf to replay every run
+        self.max_catch_up = max_catch_up
+        self._reset_run_state()
+
+    def _reset_run_state(self) -> None:
+        self.running: set[asyncio.Task] = set()
+        self.skipped_runs = 0
+        self.cancelled_runs = 0
+        self._instance_slots = asyncio.Semaphore(self.max_instances)
+        # Executor futures of the running invocations, and those still running after their run was cancelled
+        self._worker_futures: dict[asyncio.Task, asyncio.Future] = {}
+        self._detached_workers: set[asyncio.Future] = set()
+
+    def bind_to_cog(self, cog: Any, spread: bool = False) -> "ScheduledTask":
+        """Returns a copy of the task bound to a cog instance, with cron expressions compiled with dynamic seeding.
+
+        The task declared on the cog class is shared by every instance of the cog, including those of other bots
+        in the same process, so each binding gets its own overlap state and spread offset.
+
+        With spread enabled, five-field schedules fire at a stable second within the minute derived from the
+        crc32 of the task name, much like an implicit 'H' seconds field.
+        """
+        bound = copy.copy(self)
+        bound._reset_run_state()
+        bound.name = f"{cog.__class__.__name__}.{self.callback.__name__}"
+        bound.cron_schedules = [CronExpression(expr, seed=bound.name) for expr in self.raw_schedules]
+        bound.spread_seconds = zlib.crc32(bound.name.encode()) % SECONDS_PER_MINUTE if spread else 0
+        return bound
 
     def match(self, dt: datetime) -> bool:
         """Checks if the given datetime matches any of the registered schedules."""
-        return any(cron.is_now(dt) for cron in self.cron_schedules)
-
-    async def try_invoke(self, cog: Any, dt: datetime, on_ready: bool = False) -> None:
+        return any(cron.is_now(dt - self._offset(cron)) for cron in self.cron_schedules)
+
+    def next_fire_after(self, dt: datetime) -> datetime | None:
+        """Returns the earliest instant after dt matched by any of the registered schedules."""
+        fire_times = []
+        for cron in self.cron_schedules:
+            offset = self._offset(cron)
+            fire = cron.next_fire_after(dt - offset)
+            if fire is not None:
+                fire_times.append(fire + offset)
+        return min(fire_times, default=None)
+
+    def fires_between(self, start: datetime, end: datetime) -> Iterator[datetime]:
+        """Yields the fire times of all schedules in (start, end] in order, without duplicates."""
+        last_fire = None
+        for fire in heapq.merge(*(self._cron_fires_between(cron, start, end) for cron in self.cron_schedules)):
+            if fire != last_fire:
+                yield fire
+            last_fire = fire
+
+    def _cron_fires_between(self, cron: CronExpression, start: datetime, end: datetime) -> Iterator[datetime]:
+        offset = self._offset(cron)
+        for fire in cron.fires_between(start - offset, end - offset):
+            yield fire + offset
+
+    def _offset(self, cron: CronExpression) -> timedelta:
+        if cron.has_explicit_seconds_field:
+            return timedelta()
+        return timedelta(seconds=self.spread_seconds)
+
+    async def try_invoke(
+        self,
+        cog: Any,
+        dt: datetime,
+        on_ready: bool = False,
+        concurrency_limit: asyncio.Semaphore | None = None,
+        executors: dict[str, Executor] | None = None,
+    ) -> None:
         """Executes the task callback if execution conditions match the target datetime."""
         if on_ready:
             if self.on_ready:
-                await self.invoke(cog)
+                await self.run(cog, concurrency_limit, executors=executors)
             return
 
         if self.match(dt):
-            await self.invoke(cog)
+            await self.run(cog, concurrency_limit, executors=executors)
+
+    async def run(
+        self,
+        cog: Any,
+        concurrency_limit: asyncio.Semaphore | None = None,
+        on_start: Callable[[], Any] | None = None,
+        executors: dict[str, Executor] | None = None,
+    ) -> None:
+        """Executes the callback subject to the overlap policy and an optional scheduler-wide concurrency limit.
+
+        on_start is called right before the callback itself starts, after any queueing.
+        """
+        if self._instance_slots.locked():
+            if self.overlap == "skip":
+                self.skipped_runs += 1
+                log.warning(
+                    "Skipped scheduled task %s, %d run(s) still in progress",
+                    self.name,
+                    len(self.running) + len(self._detached_workers),
+                )
+                return
+            if self.overlap == "cancel_previous":
+                for running_task in list(self.running):
+                    running_task.cancel()
+                    self.cancelled_runs += 1
+
+        await self._instance_slots.acquire()
+        current_task = asyncio.current_task()
+        self.running.add(current_task)
+        try:
+            if concurrency_limit is None:
+                await self._invoke_started(cog, on_start, executors)
+            else:
+                async with concurrency_limit:
+                    await self._invoke_started(cog, on_start, executors)
+        finally:
+            self.running.discard(current_task)
+            worker = self._worker_futures.pop(current_task, None)
+            if worker is None or worker.done():
+                self._instance_slots.release()
+            else:
+                # A timeout cannot interrupt a worker, the slot stays taken until the worker really finishes
+                self._detached_workers.add(worker)
+                worker.add_done_callback(self._release_detached_worker)
+
+    def _release_detached_worker(self, worker: asyncio.Future) -> None:
+        self._detached_workers.discard(worker)
+        if not worker.cancelled() and worker.exception() is not None:
+            log.error("Scheduled task %s failed after its run was cancelled", self.name, exc_info=worker.exception())
+        self._instance_slots.release()
+
+    async def invoke(self, cog: Any, executors: dict[str, Executor] | None = None) -> None:
+        """Executes the target callback on the cog instance, on the loop or in the task's executor.
+
+        Thread callbacks receive the cog like coroutine callbacks do. Process callbacks are called without
+        arguments in a worker process, since cogs hold the bot and cannot be pickled. The return value of an
+        off-loop callback is handed back to the cog's on_result method on the event loop.
+        """
+        if self.executor is None:
+            await self.callback(cog)
+            return
 
-    async def invoke(self, cog: Any) -> None:
-        """Directly executes the target callback function on the cog instance."""
-        await self.callback(cog)
+        executor = (executors or {}).get(self.executor)
+        if executor is None and self.executor == "process":
+            raise RuntimeError(f"Scheduled task {self.name} requires a process pool")
 
+        loop = asyncio.get_running_loop()
+        if self.executor == "thread":
+            worker = loop.run_in_executor(executor, self.callback, cog)
+        else:
+            owner = type(cog)
+            worker = loop.run_in_executor(
+                executor, _invoke_in_process, owner.__module__, owner.__qualname__, self.callback.__name__
+            )
+
+        # Shielded, so cancelling the run leaves the worker future pending until the worker is actually done
+        self._worker_futures[asyncio.current_task()] = worker
+        result = await asyncio.shield(worker)
+
+        if self.on_result:
+            handled = getattr(cog, self.on_result)(result)
+            if inspect.isawaitable(handled):
+                await handled
+
+    async def _invoke_started(
+        self, cog: Any, on_start: Callable[[], Any] | None, executors: dict[str, Executor] | None
+    ) -> None:
+        if on_start is not None:
+            on_start()
+        await self.invoke(cog, executors)
 
-class TaskScheduler:
-    """Manages task scheduling, registration, and precise ticking loops."""
 
-    def __init__(self, bot: Any, scheduled_tasks_timeout: int = 300) -> None:
+def _invoke_in_process(module_name: str, class_qualname: str, attribute: str) -> Any:
+    """Looks up a scheduled task by its import path in a worker process and runs its callback."""
+    owner = importlib.import_module(module_name)
+    for name in class_qualname.split("."):
+        owner = getattr(owner, name)
+    return getattr(owner, attribute).callback()
+
+
+class TaskScheduler:
+    """Manages task registration and dispatches tasks from a min-heap of their next fire times."""
+
+    def __init__(
+        self,
+        bot: Any,
+        scheduled_tasks_timeout: int = 300,
+        max_concurrent_tasks: int | None = None,
+        spread_tasks: bool = False,
+        max_starts_per_second: int | None = None,
+        state_file: str | None = None,
+        state_flush_interval: float = STATE_FLUSH_INTERVAL_SECONDS,
+        thread_pool_workers: int | None = None,
+        process_pool_workers: int | None = None,
+        leader_lease: bool = False,
+        lease_file: str = "scheduler.lock",
+        lease_ttl: float = LEASE_TTL_SECONDS,
+        max_catch_up: float | None = CATCH_UP_WINDOW_SECONDS,
+    ) -> None:
         self.bot = bot
         self.scheduled_tasks_timeout = scheduled_tasks_timeout
+        self.concurrency_limit = asyncio.Semaphore(max_concurrent_tasks) if max_concurrent_tasks else None
+
+        # Thundering-herd control: sub-minute offsets for five-field tasks and a cap on starts per second
+        self.spread_tasks = spread_tasks
+        self.max_starts_per_second = max_starts_per_second
+        self._starts_per_second: dict[int, int] = {}
         self.tasks: dict[str, list[tuple[Any, ScheduledTask]]] = {}
         self.tick_task: asyncio.Task | None = None
         self.bg_tasks: set[asyncio.Task] = set()
-        self._use_seconds_precision: bool = False
+
+        # Bounded pools for tasks declared with executor="thread" or "process", created on first use
+        self.thread_pool_workers = thread_pool_workers
+        self.process_pool_workers = process_pool_workers
+        self.executors: dict[str, Executor] = {}
+
+        # Only the replica holding the lease dispatches tasks, the others keep their heap moving as standbys
+        self.leader_lease = leader_lease
+        self.lease_file = lease_file
+        self.lease_ttl = lease_ttl
+        self.lease: FileLease | DatabaseLease | None = None
+        self.is_leader = True
+        self.lease_task: asyncio.Task | None = None
+
+        # Missed runs older than max_catch_up seconds are dropped instead of going through the catch_up policy.
+        # None keeps every missed run, however old.
+        self.max_catch_up = max_catch_up
+
+        # Per-task timing telemetry keyed by task name (Cog.callback)
+        self.telemetry: dict[str, TaskTelemetry] = {}
+
+        # Last processed fire timestamp per task name, persisted in batches so restarts resume where they left off
+        self.state_file = state_file
+        self.state_flush_interval = state_flush_interval
+        self.state_store: JsonStateStore | DatabaseStateStore | None = None
+        self.last_runs: dict[str, float] = {}
+        self._state_dirty = False
+        self.flush_task: asyncio.Task | None = None
+
+        # Heap entries are (fire timestamp, tie breaker, cog name, cog, task, fire datetime)
+        self.heap: list[tuple[float, int, str, Any, ScheduledTask, datetime]] = []
+        self._heap_counter = itertools.count()
+        self._wakeup = asyncio.Event()
 
     def register_cog_tasks(self, cog: Any) -> None:
         """Discovers and registers all ScheduledTasks defined on the cog instance."""
@@ -75,64 +413,253 @@ class TaskScheduler:
                 continue
 
             if isinstance(attr, ScheduledTask):
-                attr.bind_to_cog(cog)
-                tasks_list.append((cog, attr))
+                tasks_list.append((cog, attr.bind_to_cog(cog, spread=self.spread_tasks)))
 
         if tasks_list:
+            self._remove_heap_entries(cog_name)
             self.tasks[cog_name] = tasks_list
-            self._use_seconds_precision = self.has_sub_minute_tasks()
+            if self.tick_task is not None:
+                now = self.bot.now()
+                for cog, task in tasks_list:
+                    self._push_task(cog_name, cog, task, self._resume_point(task, now))
+                self._wakeup.set()
 
     def unregister_cog_tasks(self, cog_name: str) -> None:
         """Removes all tasks registered under the specified cog name."""
         self.tasks.pop(cog_name, None)
-        self._use_seconds_precision = self.has_sub_minute_tasks()
-
-    def has_sub_minute_tasks(self) -> bool:
-        """Checks if any registered task requires sub-minute (seconds) precision ticking."""
+        self._remove_heap_entries(cog_name)
+
+    def next_wakeup(self) -> float | None:
+        """Returns the timestamp of the earliest pending fire time, or None if nothing is scheduled."""
+        if not self.heap:
+            return None
+        return self.heap[0][0]
+
+    @property
+    def skipped_runs(self) -> int:
+        """Total number of runs skipped across all registered tasks because a previous run was still going."""
+        return sum(task.skipped_runs for task_list in self.tasks.values() for _, task in task_list)
+
+    def fire_table(
+        self,
+        start: datetime | None = None,
+        window: timedelta = timedelta(days=30),
+        limit: int | None = None,
+    ) -> dict[str, list[datetime]]:
+        """Lists upcoming fire times of every registered task within the window, keyed by task name."""
+        if start is None:
+            start = self.bot.now()
+
+        table = {}
         for task_list in list(self.tasks.values()):
             for _, task in task_list:
-                for cron in task.cron_schedules:
-                    if not cron.has_explicit_seconds_field:
-                        continue
-                    for item in cron.second:
-                        if item.is_wildcard or item.interval > 1 or item.range_from != 0 or item.range_to != 0:
-                            return True
-        return False
+                table[task.name] = list(itertools.islice(task.fires_between(start, start + window), limit))
+        return table
 
     async def start(self) -> None:
-        """Starts the scheduler execution tick loop."""
+        """Loads persisted last-run state, builds the fire time heap and starts the scheduler loop."""
         if self.tick_task is not None:
             return
+
+        self.state_store = self._create_state_store()
+        if self.state_store is not None:
+            self.flush_task = asyncio.create_task(self.flush_loop())
+
+        if self.leader_lease:
+            # Becoming leader loads the persisted state; standbys load it once they take over
+            self.lease = self._create_lease()
+            self.is_leader = False
+            await self.refresh_lease()
+            self.lease_task = asyncio.create_task(self.lease_loop())
+        else:
+            await self._load_state()
+
+        self._rebuild_heap()
         self.tick_task = asyncio.create_task(self.run_loop())
 
     def stop(self) -> None:
-        """Stops the scheduler execution tick loop and cancels active background tasks."""
+        """Stops the scheduler loop and cancels active background tasks."""
         if self.tick_task:
             self.tick_task.cancel()
             self.tick_task = None
+        if self.flush_task:
+            self.flush_task.cancel()
+            self.flush_task = None
+        if self.lease_task:
+            self.lease_task.cancel()
+            self.lease_task = None
         for bg_task in list(self.bg_tasks):
             if not bg_task.done():
                 bg_task.cancel()
         self.bg_tasks.clear()
+        self.heap.clear()
+
+        # Running off-loop jobs cannot be interrupted; let them finish in the background
+        for executor in self.executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        self.executors.clear()
+
+    async def close(self) -> None:
+        """Flushes state, hands the lease over to a standby and stops the scheduler."""
+        await self.flush_state()
+        if self.lease is not None:
+            try:
+                await self.lease.release()
+            except Exception:
+                log.exception("Unable to release scheduler lease")
+            self.is_leader = False
+        self.stop()
+
+    async def refresh_lease(self) -> None:
+        """Acquires or renews the leader lease, switching between leader and standby as needed."""
+        try:
+            acquired = await self.lease.acquire()
+        except Exception:
+            # Without a renewed lease another replica may take over, so stop dispatching to avoid duplicates
+            log.exception("Unable to renew scheduler lease")
+            acquired = False
+
+        if acquired and not self.is_leader:
+            log.info("Scheduler acquired the leader lease")
+            self.is_leader = True
+            await self._resume_as_leader()
+        elif not acquired and self.is_leader:
+            log.warning("Scheduler lost the leader lease, running as standby")
+            self.is_leader = False
+
+    async def lease_loop(self) -> None:
+        """Renews the lease well before it expires, or keeps trying to take it over while on standby."""
+        while True:
+            await asyncio.sleep(self.lease_ttl / 3)
+            await self.refresh_lease()
+
+    async def _resume_as_leader(self) -> None:
+        """Picks up the state the previous leader persisted, so its runs are neither repeated nor skipped."""
+        await self._load_state()
+        if self.tick_task is not None:
+            self._rebuild_heap()
+            self._wakeup.set()
+
+    async def _load_state(self) -> None:
+        if self.state_store is None:
+            return
+        try:
+            self.last_runs = await self.state_store.load()
+            self._state_dirty = False
+        except Exception:
+            log.exception("Unable to load scheduler state, scheduling from the current time")
+
+    async def flush_state(self) -> None:
+        """Writes the last-run timestamps to the state store if any changed since the previous write."""
+        if self.state_store is None or not self._state_dirty or not self.is_leader:
+            return
+
+        self._state_dirty = False
+        try:
+            await self.state_store.save(self.last_runs)
+        except Exception:
+            self._state_dirty = True
+            log.exception("Unable to save scheduler state")
+
+    async def flush_loop(self) -> None:
+        """Periodically flushes scheduler state, batching the last-run updates of many task runs into one write."""
+        while True:
+            await asyncio.sleep(self.state_flush_interval)
+            await self.flush_state()
+
+    def _ensure_executor(self, kind: str) -> Executor:
+        if kind not in self.executors:
+            if kind == "thread":
+                self.executors[kind] = ThreadPoolExecutor(self.thread_pool_workers, thread_name_prefix="scheduler")
+            else:
+                # Forking a process that runs the gateway and pool threads is unsafe, start workers fresh instead
+                context = multiprocessing.get_context("spawn")
+                self.executors[kind] = ProcessPoolExecutor(self.process_pool_workers, mp_context=context)
+        return self.executors[kind]
+
+    def _create_lease(self) -> FileLease | DatabaseLease:
+        if self.bot.feature_enabled("database"):
+            return DatabaseLease(self.bot.Session, ttl=self.lease_ttl)
+        return FileLease(self.lease_file)
+
+    def _create_state_store(self) -> JsonStateStore | DatabaseStateStore | None:
+        if self.bot.feature_enabled("database"):
+            return DatabaseStateStore(self.bot.Session)
+        if self.state_file:
+            return JsonStateStore(self.state_file)
+        return None
 
     async def run_loop(self) -> None:
-        """Execution tick loop that dynamically adjusts intervals based on seconds precision."""
-        await self.invoke_tasks(on_ready=True)
+        """Sleeps until the earliest fire time in the heap and dispatches only the tasks that are due."""
+        if self.is_leader:
+            await self.invoke_tasks(on_ready=True)
 
         while not self.bot.is_closed():
-            use_seconds_precision: bool = self._use_seconds_precision
+            sleep_sec = MAXIMUM_SLEEP_SECONDS
+            next_wakeup = self.next_wakeup()
+            if next_wakeup is not None:
+                sleep_sec = min(sleep_sec, max(0, next_wakeup - time.time()) + SCHEDULER_WAKEUP_SLACK)
 
-            if use_seconds_precision:
-                sleep_sec: float = 1 - (time.time() % 1) + 0.005
-            else:
-                sleep_sec = 60 - (time.time() % 60) + 0.005
+            self._wakeup.clear()
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), sleep_sec)
 
-            await asyncio.sleep(sleep_sec)
+            due_tasks = self._pop_due_tasks(time.time())
+            if not due_tasks or not self.is_leader:
+                continue
 
-            task = asyncio.create_task(self.invoke_tasks())
+            task = asyncio.create_task(self.dispatch_tasks(due_tasks))
             self.bg_tasks.add(task)
             task.add_done_callback(self.bg_tasks.discard)
 
+    async def dispatch_tasks(self, due_tasks: list[tuple[Any, ScheduledTask, list[float]]]) -> None:
+        """Invokes the given due tasks concurrently with timeout boundaries.
+
+        Each task runs once per listed fire timestamp, one after another, so replayed runs do not overlap.
+        """
+        coros = [self._run_in_order(cog, task, fire_timestamps) for cog, task, fire_timestamps in due_tasks]
+        await self._gather_logged(coros)
+
+    async def _run_in_order(self, cog: Any, task: ScheduledTask, fire_timestamps: list[float]) -> None:
+        for fire_timestamp in fire_timestamps:
+            try:
+                await self._run_with_telemetry(cog, task, fire_timestamp)
+            except Exception:
+                log.exception("Unhandled exception while executing scheduled task %s", task.name)
+
+    async def _run_with_telemetry(self, cog: Any, task: ScheduledTask, fire_timestamp: float) -> None:
+        """Runs a due task, recording its start lag, duration, timeouts and exceptions."""
+        telemetry = self.telemetry.setdefault(task.name, TaskTelemetry())
+        started_at = None
+
+        def on_start():
+            nonlocal started_at
+            started_at = time.monotonic()
+            telemetry.lag.observe(max(0.0, time.time() - fire_timestamp))
+
+        if task.executor:
+            self._ensure_executor(task.executor)
+
+        start_delay = self._reserve_start_slot(time.time())
+        if start_delay > 0:
+            await asyncio.sleep(start_delay)
+
+        try:
+            await asyncio.wait_for(
+                task.run(cog, self.concurrency_limit, on_start=on_start, executors=self.executors),
+                self.scheduled_tasks_timeout,
+            )
+        except TimeoutError:
+            telemetry.timeouts += 1
+            raise
+        except Exception:
+            telemetry.exceptions += 1
+            raise
+        finally:
+            if started_at is not None:
+                telemetry.runs += 1
+                telemetry.duration.observe(time.monotonic() - started_at)
+
     async def invoke_tasks(self, on_ready: bool = False) -> None:
         """Invokes all matching scheduled tasks concurrently with timeout boundaries."""
         now = self.bot.now()
@@ -140,17 +667,137 @@ class TaskScheduler:
         task_snapshots = list(self.tasks.values())
         for task_list in task_snapshots:
             for cog, task in task_list:
+                if task.executor:
+                    self._ensure_executor(task.executor)
                 tasks.append(
                     asyncio.wait_for(
-                        task.try_invoke(cog, now, on_ready),
+                        task.try_invoke(cog, now, on_ready, self.concurrency_limit, self.executors),
                         self.scheduled_tasks_timeout,
                     )
                 )
 
-        if not tasks:
+        await self._gather_logged(tasks)
+
+    async def _gather_logged(self, coros: list) -> None:
+        if not coros:
             return
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        results = await asyncio.gather(*coros, return_exceptions=True)
         for result in results:
             if isinstance(result, Exception):
                 log.exception("Unhandled exception while executing scheduled task", exc_info=result)
+
+    def _reserve_start_slot(self, now_timestamp: float) -> float:
+        """Reserves the first second with start capacity left and returns the delay until it begins."""
+        if not self.max_starts_per_second:
+            return 0.0
+
+        current_second = int(now_timestamp)
+        for second in [second for second in self._starts_per_second if second < current_second]:
+            del self._starts_per_second[second]
+
+        second = current_second
+        while self._starts_per_second.get(second, 0) >= self.max_starts_per_second:
+            second += 1
+        self._starts_per_second[second] = self._starts_per_second.get(second, 0) + 1
+
+        return max(0.0, second - now_timestamp)
+
+    def _push_task(self, cog_name: str, cog: Any, task: ScheduledTask, after: datetime) -> None:
+        fire_dt = task.next_fire_after(after)
+        if fire_dt is None:
+            log.warning("Scheduled task %s will never fire", task.name)
+            return
+        heapq.heappush(self.heap, (fire_dt.timestamp(), next(self._heap_counter), cog_name, cog, task, fire_dt))
+
+    def _rebuild_heap(self) -> None:
+        self.heap.clear()
+        now = self.bot.now()
+        for cog_name, task_list in list(self.tasks.items()):
+            for cog, task in task_list:
+                self._push_task(cog_name, cog, task, self._resume_point(task, now))
+
+    def _resume_point(self, task: ScheduledTask, now: datetime) -> datetime:
+        """Returns the instant after which the task should fire next: its last persisted run, or now.
+
+        Fires between the last run and now become due right away and go through the task's catch_up policy,
+        except those older than the catch-up window, which are dropped.
+        """
+        last_run = self.last_runs.get(task.name)
+        if last_run is None or last_run >= now.timestamp():
+            return now
+        window = self._catch_up_window(task)
+        if now.timestamp() - last_run > window:
+            log.info("Dropping runs of %s missed more than %ss ago", task.name, window)
+            return now - timedelta(seconds=window)
+        return datetime.fromtimestamp(last_run, tz=now.tzinfo)
+
+    def _catch_up_window(self, task: ScheduledTask) -> float:
+        window = task.max_catch_up if task.max_catch_up is not None else self.max_catch_up
+        if window is None:
+            return float("inf")
+        # On-time runs are always kept, however small the window
+        return max(window, MISFIRE_GRACE_SECONDS)
+
+    def _remove_heap_entries(self, cog_name: str) -> None:
+        remaining = [entry for entry in self.heap if entry[2] != cog_name]
+        if len(remaining) != len(self.heap):
+            self.heap[:] = remaining
+            heapq.heapify(self.heap)
+            self._wakeup.set()
+
+    def _pop_due_tasks(self, now_timestamp: float) -> list[tuple[Any, ScheduledTask, list[float]]]:
+        """Pops every entry due at now_timestamp and pushes each task back with its following fire time.
+
+        Fire times the scheduler slept through (event-loop stalls, suspends) are resolved with each task's
+        catch_up policy into the list of timestamps to run it for.
+        """
+        due_entries = []
+        while self.heap and self.heap[0][0] <= now_timestamp:
+            due_entries.append(heapq.heappop(self.heap))
+
+        if not due_entries:
+            return []
+
+        now = self.bot.now()
+        due_tasks = []
+        for fire_timestamp, _, cog_name, cog, task, fire_dt in due_entries:
+            fire_times = [fire_dt]
+            if now_timestamp - fire_timestamp > MISFIRE_GRACE_SECONDS:
+                fire_times += itertools.islice(task.fires_between(fire_dt, now), MAXIMUM_CATCH_UP_RUNS - 1)
+                log.warning(
+                    "Scheduler woke %.1fs late for %s, %d run(s) due, catch_up=%s",
+                    now_timestamp - fire_timestamp,
+                    task.name,
+                    len(fire_times),
+                    task.catch_up,
+                )
+
+            fire_timestamps = self._apply_catch_up(task, [fire.timestamp() for fire in fire_times], now_timestamp)
+            if fire_timestamps:
+                due_tasks.append((cog, task, fire_timestamps))
+
+            self.last_runs[task.name] = fire_times[-1].timestamp()
+            self._state_dirty = True
+
+            # Never reschedule into the past, missed instants were handled above
+            after = fire_times[-1] if fire_times[-1].timestamp() >= now.timestamp() else now
+            self._push_task(cog_name, cog, task, after)
+
+        return due_tasks
+
+    def _apply_catch_up(self, task: ScheduledTask, fire_timestamps: list[float], now_timestamp: float) -> list[float]:
+        """Selects which of the due fire timestamps to run, counting the dropped ones as missed."""
+        window = self._catch_up_window(task)
+        recent = [ts for ts in fire_timestamps if now_timestamp - ts <= window]
+        if task.catch_up == "all":
+            selected = recent
+        elif task.catch_up == "once":
+            selected = recent[:1]
+        else:
+            selected = [ts for ts in recent[-1:] if now_timestamp - ts <= MISFIRE_GRACE_SECONDS]
+
+        missed_runs = len(fire_timestamps) - len(selected)
+        if missed_runs:
+            self.telemetry.setdefault(task.name, TaskTelemetry()).missed_runs += missed_runs
+        return selected
@@ -0,0 +1,112 @@
+import fcntl
+import os
+import socket
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+
+def make_holder_id() -> str:
+    """Returns an identifier unique to this scheduler instance, readable enough to find the leader host."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class FileLease:
+    """Scheduler lease backed by an exclusive flock on a local file, for replicas sharing one host."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._fd: int | None = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    async def acquire(self) -> bool:
+        """Takes the lock if it is free; the lock stays held until release or process exit."""
+        if self._fd is not None:
+            return True
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+
+        os.ftruncate(fd, 0)
+        os.write(fd, make_holder_id().encode())
+        self._fd = fd
+        return True
+
+    async def release(self) -> None:
+        if self._fd is None:
+            return
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+
+
+class DatabaseLease:
+    """Scheduler lease stored as an expiring row in the bot's database, for replicas on different hosts.
+
+    The holder renews the row before it expires; any other replica may take it over once it has expired.
+    Both steps are single conditional statements, so two replicas racing for the lease cannot both win.
+    """
+
+    def __init__(self, session_factory: Any, name: str = "scheduler", ttl: float = 30) -> None:
+        self.Session = session_factory
+        self.name = name
+        self.ttl = ttl
+        self.holder = make_holder_id()
+        self.held = False
+
+    async def acquire(self) -> bool:
+        """Takes over a free or expired lease, or renews the one already held."""
+        from sqlalchemy import or_, update
+        from sqlalchemy.exc import IntegrityError
+
+        from .cogs.models import SchedulerLease
+
+        now = time.time()
+        expires_at = now + self.ttl
+        async with self.Session() as session:
+            result = await session.execute(
+                update(SchedulerLease)
+                .where(
+                    SchedulerLease.name == self.name,
+                    or_(SchedulerLease.holder == self.holder, SchedulerLease.expires_at < now),
+                )
+                .values(holder=self.holder, expires_at=expires_at)
+            )
+            if result.rowcount:
+                await session.commit()
+                self.held = True
+                return True
+
+            session.add(SchedulerLease(name=self.name, holder=self.holder, expires_at=expires_at))
+            try:
+                await session.commit()
+            except IntegrityError:
+                # Another replica holds an unexpired lease, or inserted it first
+                await session.rollback()
+                self.held = False
+                return False
+
+        self.held = True
+        return True
+
+    async def release(self) -> None:
+        """Gives up the lease right away so a standby does not have to wait for it to expire."""
+        from sqlalchemy import delete
+
+        from .cogs.models import SchedulerLease
+
+        if not self.held:
+            return
+        async with self.Session.begin() as session:
+            await session.execute(
+                delete(SchedulerLease).where(SchedulerLease.name == self.name, SchedulerLease.holder == self.holder)
+            )
+        self.held = False
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+
+def write_json_atomic(path: Path, data: Any) -> None:
+    """Replaces a JSON file in one step and durably, so a crash never leaves a truncated or stale file behind."""
+    # Write to a temporary file in the same directory first, then rename it over the target
+    directory = path.parent
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{path.name}.", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+            # Make the new contents durable before the rename can make them visible
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    _fsync_directory(directory)
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Makes a rename or newly created file in the directory survive a power loss."""
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class JsonStateStore:
+    """Persists scheduler state (task name -> last fire timestamp) to a local JSON file."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+
+    async def load(self) -> dict[str, float]:
+        return await asyncio.to_thread(self._read)
+
+    async def save(self, state: dict[str, float]) -> None:
+        await asyncio.to_thread(self._write, dict(state))
+
+    def _read(self) -> dict[str, float]:
+        try:
+            with self.path.open(encoding="utf-8") as f:
+                return {str(name): float(timestamp) for name, timestamp in json.load(f).items()}
+        except FileNotFoundError:
+            return {}
+
+    def _write(self, state: dict[str, float]) -> None:
+        write_json_atomic(self.path, state)
+
+
+class DatabaseStateStore:
+    """Persists scheduler state through the bot's SQLAlchemy session factory.
+
+    The scheduled_task_state table is created by the migrations, see `--alembic upgrade head`.
+    """
+
+    def __init__(self, session_factory: Any) -> None:
+        self.Session = session_factory
+
+    async def load(self) -> dict[str, float]:
+        from sqlalchemy import select
+
+        from .cogs.models import ScheduledTaskState
+
+        async with self.Session() as session:
+            rows = await session.execute(select(ScheduledTaskState))
+            return {row.task_name: row.last_fire_at for row in rows.scalars()}
+
+    async def save(self, state: dict[str, float]) -> None:
+        from .cogs.models import ScheduledTaskState
+
+        async with self.Session.begin() as session:
+            for task_name, last_fire_at in state.items():
+                await session.merge(ScheduledTaskState(task_name=task_name, last_fire_at=last_fire_at))
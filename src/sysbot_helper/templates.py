@@ -1,14 +1,287 @@
+import asyncio
+import functools
+import hashlib
+import inspect
 import logging
 import re
+import threading
+import time
+from collections import ChainMap, OrderedDict
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, Mapping
+from contextlib import suppress
+from contextvars import ContextVar
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from jinja2 import ChoiceLoader, DictLoader, FileSystemLoader
-from jinja2.sandbox import SandboxedEnvironment
+from jinja2 import (
+    ChoiceLoader,
+    DictLoader,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+    TemplateError,
+    meta,
+    nodes,
+    pass_context,
+)
+from jinja2.runtime import Context
+from jinja2.sandbox import SandboxedEnvironment, SecurityError
+
+from .utils import LazyContext
+from .utils.lazy import RenderDependencies, awaitables_allowed, provider_loop
 
 log = logging.getLogger(__name__)
 
+# Default number of unpinned compiled inline templates kept in the LRU cache.
+TEMPLATE_CACHE_SIZE: int = 256
+
+# Number of rendered outputs kept by the opt-in render cache, see render_string(cache_key=...).
+RENDER_CACHE_SIZE: int = 1024
+
+# How often in seconds the template watcher checks cached file templates for changes on disk.
+TEMPLATE_WATCH_INTERVAL_SECONDS: float = 2
+
+# Bytecode cache file name pattern, versioned since compiled templates now include the loop budget hooks.
+BYTECODE_CACHE_PATTERN: str = "__sysbot_helper_v1_%s.cache"
+
+# Async templates compile to different code, their bytecode is kept apart from the synchronous one.
+ASYNC_BYTECODE_CACHE_PATTERN: str = "__sysbot_helper_v1_async_%s.cache"
+
+# Default execution budget of a single render: total loop iterations, output characters and wall time.
+MAX_LOOP_ITERATIONS: int = 100_000
+MAX_OUTPUT_LENGTH: int = 100_000
+MAX_RENDER_SECONDS: float = 2.0
+
+# Budget of the render running in the current thread or task, if any.
+_active_budget: ContextVar["RenderBudget | None"] = ContextVar("_active_budget", default=None)
+
+
+class TemplateBudgetError(SecurityError):
+    """Raised when a render exceeds its loop iteration, output length or wall time budget."""
+
+
+class RenderBudget:
+    """Execution limits of a single render, checked on every loop iteration and every output chunk."""
+
+    def __init__(self, max_loop_iterations: int, max_output_length: int, max_seconds: float) -> None:
+        self.loop_iterations_left = max_loop_iterations
+        self.max_output_length = max_output_length
+        self.deadline = time.monotonic() + max_seconds
+
+    def iterate(self, iterable: Iterable) -> Iterator:
+        for item in iterable:
+            self.loop_iterations_left -= 1
+            if self.loop_iterations_left < 0:
+                raise TemplateBudgetError("Template exceeded its loop iteration budget")
+            self.check_time()
+            yield item
+
+    async def aiterate(self, iterable: AsyncIterable) -> AsyncIterator:
+        async for item in iterable:
+            self.loop_iterations_left -= 1
+            if self.loop_iterations_left < 0:
+                raise TemplateBudgetError("Template exceeded its loop iteration budget")
+            self.check_time()
+            yield item
+
+    def check_output(self, length: int) -> None:
+        if length > self.max_output_length:
+            raise TemplateBudgetError(f"Template output exceeded {self.max_output_length} characters")
+        self.check_time()
+
+    def check_time(self) -> None:
+        if time.monotonic() > self.deadline:
+            raise TemplateBudgetError("Template exceeded its render time budget")
+
+
+# Width and precision fields of printf-style and str.format format specs, which pad the output to that size.
+_PERCENT_SPEC = re.compile(r"%(?:\([^)]*\))?[-#0 +]*(\*|\d*)(?:\.(\*|\d*))?")
+_BRACE_SPEC = re.compile(r"\{[^{}]*:((?:[^{}]|\{[^{}]*\})*)\}")
+
+
+def _formatted_length(fmt: str, args: Any = ()) -> int:
+    """Upper estimate of the length of a formatted string, from the padding its format specs ask for.
+
+    Widths taken from the arguments (%*d, {:{}}) are estimated by adding up every integer argument.
+    """
+    specs = [number for match in _PERCENT_SPEC.finditer(fmt) for number in match.groups() if number]
+    specs += [number for spec in _BRACE_SPEC.findall(fmt) for number in re.findall(r"\d+|\{", spec)]
+    length = len(fmt) + sum(int(number) for number in specs if number.isdigit())
+    if any(not number.isdigit() for number in specs):
+        values = args.values() if isinstance(args, Mapping) else args if isinstance(args, tuple | list) else (args,)
+        length += sum(abs(value) for value in values if isinstance(value, int))
+    return length
+
+
+def _replaced_length(text: str, old: str, new: str) -> int:
+    if not old:
+        return len(text) + (len(text) + 1) * len(new)
+    return len(text) + text.count(old) * max(0, len(new) - len(old))
+
+
+def _joined_length(separator: str, items: Any) -> int:
+    return len(separator) * len(items) if hasattr(items, "__len__") else 0
+
+
+def _padded_length(text: str, width: Any, *args: Any) -> int:
+    return width if isinstance(width, int) else len(text)
+
+
+def _indented_length(text: str, width: Any = 4, *args: Any) -> int:
+    indent = width if isinstance(width, int) else len(str(width))
+    return len(text) + indent * (text.count("\n") + 1)
+
+
+# Estimates the result length of string methods and filters that can build large strings from small inputs,
+# called with the string and the call arguments before the result is built.
+_STR_METHOD_LENGTHS: dict[str, Callable[..., int]] = {
+    "center": _padded_length,
+    "ljust": _padded_length,
+    "rjust": _padded_length,
+    "zfill": _padded_length,
+    "expandtabs": lambda text, tabsize=8: len(text) * max(1, tabsize if isinstance(tabsize, int) else 1),
+    "replace": lambda text, old="", new="", *args: _replaced_length(text, str(old), str(new)),
+    "join": lambda separator, items=(): _joined_length(separator, items),
+}
+_FILTER_LENGTHS: dict[str, Callable[..., int]] = {
+    "center": lambda value, width=80: _padded_length(str(value), width),
+    "indent": lambda value, width=4, *args, **kwargs: _indented_length(str(value), width),
+    "format": lambda value, *args, **kwargs: _formatted_length(str(value), kwargs or args),
+    "replace": lambda value, old="", new="", *args: _replaced_length(str(value), str(old), str(new)),
+    "join": lambda value, d="", *args, **kwargs: _joined_length(str(d), value),
+}
+
+
+def _sized(args: tuple) -> tuple:
+    """Turns an iterator passed as the first argument into a list, so the length estimate can count its items."""
+    if args and isinstance(args[0], Iterator):
+        return (list(args[0]), *args[1:])
+    return args
+
+
+def _budgeted_filter(name: str, func: Callable) -> Callable:
+    """Wraps a built-in filter so its estimated result length is checked against the budget before it runs.
+
+    The wrapper takes the render context, which also keeps the compiler from running it on constants, outside
+    of any budget.
+    """
+    estimate = _FILTER_LENGTHS[name]
+    pass_arg = getattr(getattr(func, "jinja_pass_arg", None), "name", None)
+
+    def run(context: Context, args: tuple, kwargs: dict) -> Any:
+        if pass_arg == "eval_context":
+            return func(context.eval_ctx, *args, **kwargs)
+        if pass_arg == "environment":
+            return func(context.environment, *args, **kwargs)
+        if pass_arg == "context":
+            return func(context, *args, **kwargs)
+        return func(*args, **kwargs)
+
+    async def run_async_iterable(context: Context, budget: RenderBudget, args: tuple, kwargs: dict) -> Any:
+        args = ([item async for item in args[0]], *args[1:])
+        budget.check_output(estimate(*args, **kwargs))
+        result = run(context, args, kwargs)
+        return await result if inspect.isawaitable(result) else result
+
+    @functools.wraps(func)
+    def wrapper(context: Context, *args: Any, **kwargs: Any) -> Any:
+        budget = _active_budget.get()
+        if budget is None:
+            return run(context, args, kwargs)
+        if args and hasattr(args[0], "__aiter__"):
+            # Async renders pass generators such as the output of map as async iterables, collect them first
+            return run_async_iterable(context, budget, args, kwargs)
+        args = _sized(args)
+        budget.check_output(estimate(*args, **kwargs))
+        return run(context, args, kwargs)
+
+    return pass_context(wrapper)
+
+
+class BudgetedSandboxedEnvironment(SandboxedEnvironment):
+    """Sandbox that routes every for loop through the active render budget and bounds string building.
+
+    Repetition operators, % formatting, padding and joining string methods and filters are checked against the
+    output budget before the result is built, so a short template cannot allocate a huge string.
+    """
+
+    intercepted_binops = frozenset(["*", "**", "%"])
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        for name in _FILTER_LENGTHS:
+            self.filters[name] = _budgeted_filter(name, self.filters[name])
+
+    def _parse(self, source: str, name: str | None, filename: str | None) -> nodes.Template:
+        ast = super()._parse(source, name, filename)
+        for loop in ast.find_all(nodes.For):
+            budget_iter = nodes.EnvironmentAttribute("budget_iter", lineno=loop.iter.lineno)
+            loop.iter = nodes.Call(budget_iter, [loop.iter], [], None, None, lineno=loop.iter.lineno)
+        return ast
+
+    def budget_iter(self, iterable: Iterable) -> Iterable:
+        budget = _active_budget.get()
+        if budget is None:
+            return iterable
+        if hasattr(iterable, "__aiter__"):
+            return budget.aiterate(iterable)
+        return budget.iterate(iterable)
+
+    def call_binop(self, context: Any, operator_name: str, left: Any, right: Any) -> Any:
+        budget = _active_budget.get()
+        if budget is not None:
+            if operator_name == "*":
+                for sequence, count in ((left, right), (right, left)):
+                    if isinstance(sequence, str | list | tuple) and isinstance(count, int):
+                        budget.check_output(len(sequence) * count)
+            elif operator_name == "%":
+                if isinstance(left, str):
+                    budget.check_output(_formatted_length(left, right))
+            elif isinstance(left, int) and isinstance(right, int) and right > 0:
+                # Roughly the number of decimal digits of the result, estimated before computing it
+                budget.check_output(left.bit_length() * right // 3)
+        return super().call_binop(context, operator_name, left, right)
+
+    def wrap_str_format(self, value: Any) -> Callable[..., str] | None:
+        format_method = super().wrap_str_format(value)
+        if format_method is None:
+            return None
+        fmt = value.__self__
+        is_format_map = value.__name__ == "format_map"
+
+        @functools.wraps(format_method)
+        def wrapper(*args: Any, **kwargs: Any) -> str:
+            budget = _active_budget.get()
+            if budget is not None:
+                arguments = args[0] if is_format_map and args else [*args, *kwargs.values()]
+                budget.check_output(_formatted_length(fmt, arguments))
+            return format_method(*args, **kwargs)
+
+        return wrapper
+
+    def call(__self, __context: Any, __obj: Any, *args: Any, **kwargs: Any) -> Any:
+        budget = _active_budget.get()
+        if budget is not None and isinstance(getattr(__obj, "__self__", None), str):
+            estimate = _STR_METHOD_LENGTHS.get(__obj.__name__)
+            if estimate is not None:
+                args = _sized(args)
+                budget.check_output(estimate(__obj.__self__, *args, **kwargs))
+        return super().call(__context, __obj, *args, **kwargs)
+
+
+@dataclass(frozen=True)
+class TemplateCacheInfo:
+    """Snapshot of the compiled inline template cache statistics."""
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+    pinned: int
+
 
 def _filter_strftime(value: Any, fmt: str = "%Y-%m-%d %H:%M:%S") -> str:
     if isinstance(value, datetime):
@@ -27,13 +300,35 @@ def _filter_truncate_length(value: str, max_length: int = 2000) -> str:
     return text[: max_length - 3] + "..."
 
 
+def _referenced_paths(ast: nodes.Template, names: frozenset[str]) -> frozenset[tuple[str, str]]:
+    """Finds the namespace.key lookups with constant keys on the given top-level names."""
+    paths = set()
+    for node in ast.find_all((nodes.Getattr, nodes.Getitem)):
+        if not isinstance(node.node, nodes.Name) or node.node.name not in names:
+            continue
+        if isinstance(node, nodes.Getattr):
+            paths.add((node.node.name, node.attr))
+        elif isinstance(node.arg, nodes.Const) and isinstance(node.arg.value, str):
+            paths.add((node.node.name, node.arg.value))
+    return frozenset(paths)
+
+
 class TemplateEngine:
-    """Hardened Jinja2 template engine using SandboxedEnvironment and multi-loader support."""
+    """Hardened Jinja2 template engine using a budgeted SandboxedEnvironment and multi-loader support."""
 
     def __init__(
         self,
         template_dirs: list[str | Path] | None = None,
         extra_templates: dict[str, str] | None = None,
+        cache_size: int = TEMPLATE_CACHE_SIZE,
+        bytecode_cache_dir: str | Path | None = None,
+        memory_loader: bool = False,
+        watch_interval: float = TEMPLATE_WATCH_INTERVAL_SECONDS,
+        max_loop_iterations: int = MAX_LOOP_ITERATIONS,
+        max_output_length: int = MAX_OUTPUT_LENGTH,
+        max_render_seconds: float = MAX_RENDER_SECONDS,
+        render_timeout: float | None = None,
+        enable_async: bool = False,
     ):
         loaders = []
 
@@ -53,11 +348,21 @@ class TemplateEngine:
 
         loader = ChoiceLoader(loaders) if len(loaders) > 1 else (loaders[0] if loaders else None)
 
-        self.env = SandboxedEnvironment(
+        # Persistent bytecode cache shared by loader templates and inline templates, so restarts skip compiling
+        bytecode_cache = None
+        if bytecode_cache_dir is not None:
+            Path(bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(str(bytecode_cache_dir), BYTECODE_CACHE_PATTERN)
+
+        self.env = BudgetedSandboxedEnvironment(
             loader=loader,
             autoescape=False,  # Generating Markdown/Plaintext for Discord, not HTML
             trim_blocks=True,
             lstrip_blocks=True,
+            bytecode_cache=bytecode_cache,
+            # In memory loader mode, file templates stay cached without a stat per render; the watcher reloads them
+            auto_reload=not memory_loader,
+            cache_size=-1 if memory_loader else 400,
         )
 
         # Register custom filters
@@ -65,21 +370,373 @@ class TemplateEngine:
         self.env.filters["regex_replace"] = _filter_regex_replace
         self.env.filters["truncate_length"] = _filter_truncate_length
 
-        self._compiled_cache = {}
+        # Async rendering mode, for templates reading awaitable provider values such as database lookups
+        self.enable_async = enable_async
+        self.async_env: BudgetedSandboxedEnvironment | None = None
+        if enable_async:
+            async_bytecode_cache = None
+            if bytecode_cache is not None:
+                async_bytecode_cache = FileSystemBytecodeCache(str(bytecode_cache_dir), ASYNC_BYTECODE_CACHE_PATTERN)
+            self.async_env = self.env.overlay(enable_async=True, bytecode_cache=async_bytecode_cache)
+
+        # Compiled inline templates: pinned ones are never evicted, the rest are kept in least recently used order
+        self.cache_size = cache_size
+        self._compiled_cache: OrderedDict[str, Template] = OrderedDict()
+        self._async_compiled_cache: OrderedDict[str, Template] = OrderedDict()
+        self._pinned: dict[str, Template] = {}
+        self._async_pinned: dict[str, Template] = {}
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_evictions = 0
+
+        # Rendered outputs keyed by (source, caller key), reused while the values the render read are unchanged
+        self._render_cache: OrderedDict[tuple[str, Any], tuple[str, RenderDependencies]] = OrderedDict()
+        self.render_cache_hits = 0
+        self.render_cache_misses = 0
+
+        # Execution budget of every render, and the timeout of renders off-loaded to a worker thread
+        self.max_loop_iterations = max_loop_iterations
+        self.max_output_length = max_output_length
+        self.max_render_seconds = max_render_seconds
+        self.render_timeout = render_timeout
+
+        # Guards the caches against renders running concurrently in worker threads
+        self._cache_lock = threading.RLock()
+
+        self.memory_loader = memory_loader
+        self.watch_interval = watch_interval
+        self.watch_task: asyncio.Task | None = None
+
+    def _compile_string(self, source: str, is_async: bool = False):
+        template = (self._async_pinned if is_async else self._pinned).get(source)
+        if template is not None:
+            self._cache_hits += 1
+            return template
+
+        compiled_cache = self._async_compiled_cache if is_async else self._compiled_cache
+        with self._cache_lock:
+            template = compiled_cache.get(source)
+            if template is not None:
+                self._cache_hits += 1
+                compiled_cache.move_to_end(source)
+                return template
+
+            self._cache_misses += 1
+            template = self._compile(source, self.async_env if is_async else self.env)
+            compiled_cache[source] = template
+            while len(compiled_cache) > self.cache_size:
+                compiled_cache.popitem(last=False)
+                self._cache_evictions += 1
+            return template
+
+    def _compile(self, source: str, environment: BudgetedSandboxedEnvironment | None = None) -> Template:
+        environment = environment or self.env
+        bytecode_cache = environment.bytecode_cache
+        if bytecode_cache is None:
+            # Parse once, for both the dependency analysis and the compiled template
+            ast = environment.parse(source)
+            template = environment.from_string(ast)
+            self._set_references(template, ast)
+            return template
+
+        # Inline templates have no name, key their bytecode by a hash of the source instead
+        source_hash = hashlib.sha256(source.encode()).hexdigest()
+        bucket = bytecode_cache.get_bucket(environment, f"inline:{source_hash}", None, source)
+        if bucket.code is None:
+            bucket.code = environment.compile(source)
+            bytecode_cache.set_bucket(bucket)
+        return environment.template_class.from_code(environment, bucket.code, environment.make_globals(None))
+
+    @staticmethod
+    def _set_references(template: Template, ast: nodes.Template) -> None:
+        names = frozenset(meta.find_undeclared_variables(ast))
+        template.referenced_paths = _referenced_paths(ast, names)
+        # Included, imported and parent templates read names of their own, which this AST does not show
+        if any(ast.find_all((nodes.Include, nodes.Import, nodes.FromImport, nodes.Extends))):
+            names = None
+        template.referenced_names = names
+
+    def _analyzed(self, template: Template, get_source: Callable[[], str]) -> Template:
+        """Adds the referenced names and paths to templates loaded from bytecode, which were never parsed."""
+        if not hasattr(template, "referenced_paths"):
+            self._set_references(template, self.env.parse(get_source()))
+        return template
+
+    def pin(self, sources: Iterable[str]) -> None:
+        """Compiles templates known at startup right away and keeps them cached regardless of the LRU size.
+
+        With enable_async, they are pinned for async renders as well.
+        """
+        for source in sources:
+            if source not in self._pinned:
+                template = self._compiled_cache.pop(source, None)
+                self._pinned[source] = template if template is not None else self._compile(source)
+            if self.async_env is not None and source not in self._async_pinned:
+                template = self._async_compiled_cache.pop(source, None)
+                self._async_pinned[source] = template if template is not None else self._compile(source, self.async_env)
+
+    def cache_info(self) -> TemplateCacheInfo:
+        """Reports hit/miss/eviction counters and occupancy of the compiled template cache."""
+        return TemplateCacheInfo(
+            hits=self._cache_hits,
+            misses=self._cache_misses,
+            evictions=self._cache_evictions,
+            maxsize=self.cache_size,
+            currsize=len(self._compiled_cache) + len(self._async_compiled_cache),
+            pinned=len(self._pinned),
+        )
+
+    def referenced_names(self, source: str) -> frozenset[str] | None:
+        """Top-level variable names an inline template reads, so callers only build those namespaces.
+
+        Returns None for templates including, importing or extending other templates, which need every name.
+        """
+        return self._analyzed(self._compile_string(source), lambda: source).referenced_names
+
+    def referenced_file_names(self, name: str) -> frozenset[str] | None:
+        """Top-level variable names a file template reads, recomputed whenever the loader reloads it."""
+        return self._get_file_template(self.env, name).referenced_names
+
+    def _get_file_template(self, environment: BudgetedSandboxedEnvironment, name: str) -> Template:
+        template = environment.get_template(name)
+        return self._analyzed(template, lambda: environment.loader.get_source(environment, name)[0])
+
+    def _template_caches(self) -> list:
+        environments = [self.env] if self.async_env is None else [self.env, self.async_env]
+        return [environment.cache for environment in environments if environment.cache is not None]
+
+    def reload_templates(self) -> int:
+        """Drops every cached file template, so the next render reads it from disk again."""
+        count = 0
+        for cache in self._template_caches():
+            count += len(cache)
+            cache.clear()
+        return count
+
+    async def invalidate_changed_templates(self) -> list[str]:
+        """Drops the cached file templates whose source changed on disk and returns their names."""
+        # Stat the files in a worker thread, keeping the filesystem calls off the event loop
+        cached = [(cache, key, template) for cache in self._template_caches() for key, template in cache.items()]
+        stale = await asyncio.to_thread(lambda: [entry for entry in cached if not entry[2].is_up_to_date])
+
+        names = []
+        for cache, key, template in stale:
+            # Only drop the entry if it was not replaced in the meantime
+            if cache.get(key) is template:
+                del cache[key]
+                names.append(template.name)
+        if names:
+            log.info("Reloading changed templates: %s", ", ".join(names))
+        return names
 
-    def _compile_string(self, source: str):
-        if source not in self._compiled_cache:
-            if len(self._compiled_cache) >= 256:
-                self._compiled_cache.pop(next(iter(self._compiled_cache)))
-            self._compiled_cache[source] = self.env.from_string(source)
-        return self._compiled_cache[source]
+    def start_watcher(self) -> None:
+        """Starts the background watcher of the in-memory loader mode."""
+        if self.memory_loader and self.watch_task is None:
+            self.watch_task = asyncio.create_task(self.watch_templates())
 
-    def render_string(self, source: str, context: dict[str, Any]) -> str:
-        """Render an inline Jinja2 template string using cached compiled AST."""
-        template = self._compile_string(source)
-        return template.render(context)
+    def stop_watcher(self) -> None:
+        if self.watch_task is not None:
+            self.watch_task.cancel()
+            self.watch_task = None
+
+    async def watch_templates(self) -> None:
+        """Periodically invalidates cached file templates that changed on disk."""
+        while True:
+            await asyncio.sleep(self.watch_interval)
+            try:
+                await self.invalidate_changed_templates()
+            except Exception:
+                log.exception("Unable to check templates for changes")
+
+    def warm_up(self) -> int:
+        """Compiles every loader template, filling the bytecode cache ahead of the next start.
+
+        With enable_async, templates are compiled for async renders too. Returns the number of templates
+        compiled; templates that fail to compile are logged and skipped.
+        """
+        if self.env.loader is None:
+            return 0
+
+        environments = [self.env] if self.async_env is None else [self.env, self.async_env]
+        compiled = 0
+        for name in self.env.list_templates():
+            try:
+                for environment in environments:
+                    environment.get_template(name)
+            except (TemplateError, UnicodeDecodeError):
+                log.warning("Unable to compile template %s", name, exc_info=True)
+                continue
+            compiled += 1
+        return compiled
+
+    def render_string(self, source: str, context: dict[str, Any], cache_key: Any = None) -> str:
+        """Render an inline Jinja2 template string using cached compiled AST.
+
+        With a cache_key (such as a channel id) and a LazyContext, the previous output for the same source and key
+        is returned as long as every context value it read is unchanged and within its validity window.
+        """
+        if cache_key is None or not isinstance(context, LazyContext):
+            return self._render(self._compile_string(source), context)
+
+        entry_key = (source, cache_key)
+        output = self._cached_render(entry_key, context)
+        if output is not None:
+            return output
+
+        dependencies = RenderDependencies()
+        context.track(dependencies)
+        try:
+            output = self._render(self._compile_string(source), context)
+        finally:
+            context.track(None)
+        self._store_render(entry_key, output, dependencies)
+        return output
+
+    def _cached_render(self, entry_key: tuple[str, Any], context: LazyContext) -> str | None:
+        entry = self._render_cache.get(entry_key)
+        if entry is not None and entry[1].still_valid(context):
+            with self._cache_lock:
+                self.render_cache_hits += 1
+                if entry_key in self._render_cache:
+                    self._render_cache.move_to_end(entry_key)
+            return entry[0]
+        self.render_cache_misses += 1
+        return None
+
+    def _store_render(self, entry_key: tuple[str, Any], output: str, dependencies: RenderDependencies) -> None:
+        with self._cache_lock:
+            if dependencies.cacheable:
+                self._render_cache[entry_key] = (output, dependencies)
+                self._render_cache.move_to_end(entry_key)
+                while len(self._render_cache) > RENDER_CACHE_SIZE:
+                    self._render_cache.popitem(last=False)
+            else:
+                self._render_cache.pop(entry_key, None)
+
+    async def render_string_with_timeout(self, source: str, context: dict[str, Any], cache_key: Any = None) -> str:
+        """Render an inline template in a worker thread, so a slow template cannot stall the event loop.
+
+        Waits at most render_timeout seconds; without a render_timeout the template is rendered on the loop.
+        The worker thread itself stops once the template runs out of its time budget.
+        """
+        if self.render_timeout is None:
+            return self.render_string(source, context, cache_key)
+        return await asyncio.wait_for(
+            asyncio.to_thread(self.render_string, source, context, cache_key), self.render_timeout
+        )
 
     def render_file(self, name: str, context: dict[str, Any]) -> str:
         """Render a file-based template from configured template loaders."""
         template = self.env.get_template(name)
-        return template.render(context)
+        return self._render(template, context)
+
+    async def render_string_async(self, source: str, context: dict[str, Any], cache_key: Any = None) -> str:
+        """Render an inline template in async mode, awaiting awaitable context values.
+
+        Waits at most render_timeout seconds, awaited values included. Takes the same cache_key as render_string.
+        Falls back to render_string_with_timeout when the engine was created without enable_async.
+        """
+        if self.async_env is None:
+            return await self.render_string_with_timeout(source, context, cache_key)
+        template = self._analyzed(self._compile_string(source, is_async=True), lambda: source)
+        if cache_key is None or not isinstance(context, LazyContext):
+            return await self._render_async_with_timeout(template, context)
+
+        entry_key = (source, cache_key)
+        output = self._cached_render(entry_key, context)
+        if output is not None:
+            return output
+
+        dependencies = RenderDependencies()
+        context.track(dependencies)
+        try:
+            output = await self._render_async_with_timeout(template, context)
+        finally:
+            context.track(None)
+        self._store_render(entry_key, output, dependencies)
+        return output
+
+    async def render_file_async(self, name: str, context: dict[str, Any]) -> str:
+        """Render a file-based template in async mode, awaiting awaitable context values."""
+        if self.async_env is None:
+            return self.render_file(name, context)
+        template = self._get_file_template(self.async_env, name)
+        return await self._render_async_with_timeout(template, context)
+
+    async def _render_async_with_timeout(self, template: Template, context: dict[str, Any]) -> str:
+        """Runs an async render in a worker thread with an event loop of its own, waiting at most render_timeout.
+
+        wait_for cannot interrupt a render busy on the bot's loop, so only the awaited values run there.
+        Without a render_timeout the template is rendered on the loop.
+        """
+        if self.render_timeout is None:
+            return await self._render_async(template, context)
+
+        rendering: list[tuple[asyncio.AbstractEventLoop, asyncio.Task]] = []
+
+        async def render() -> str:
+            rendering.append((asyncio.get_running_loop(), asyncio.current_task()))
+            return await self._render_async(template, context)
+
+        # The worker thread runs with a copy of the context variables, provider_loop included
+        token = provider_loop.set(asyncio.get_running_loop())
+        try:
+            return await asyncio.wait_for(asyncio.to_thread(lambda: asyncio.run(render())), self.render_timeout)
+        finally:
+            provider_loop.reset(token)
+            # After a timeout, stop the render at its next await instead of letting it wait on its lookups
+            for loop, task in rendering:
+                with suppress(RuntimeError):
+                    loop.call_soon_threadsafe(task.cancel)
+
+    async def _render_async(self, template: Template, context: dict[str, Any]) -> str:
+        budget = RenderBudget(self.max_loop_iterations, self.max_output_length, self.max_render_seconds)
+        token = _active_budget.set(budget)
+        awaitables_token = awaitables_allowed.set(True)
+        prefetched: list[asyncio.Future] = []
+        try:
+            if isinstance(context, LazyContext):
+                # Start every value the template looks up at once, so independent awaitables resolve concurrently
+                prefetched = context.prefetch(template.referenced_paths)
+                jinja_context = template.new_context(ChainMap(context, template.globals), shared=True)
+            else:
+                jinja_context = template.new_context(dict(context))
+
+            chunks = []
+            length = 0
+            async for chunk in template.root_render_func(jinja_context):
+                length += len(chunk)
+                budget.check_output(length)
+                chunks.append(chunk)
+            return self.async_env.concat(chunks)
+        except Exception:
+            return self.async_env.handle_exception()
+        finally:
+            # Lookups the render did not get to await, because it failed, timed out or skipped them
+            for future in prefetched:
+                future.cancel()
+            awaitables_allowed.reset(awaitables_token)
+            _active_budget.reset(token)
+
+    def _render(self, template: Template, context: dict[str, Any]) -> str:
+        if isinstance(context, LazyContext):
+            # Template.render would copy the context into a plain dict, keeping only the values resolved so far.
+            # Use the lazy context as the shared parent instead, falling back to the environment globals.
+            jinja_context = template.new_context(ChainMap(context, template.globals), shared=True)
+        else:
+            jinja_context = template.new_context(dict(context))
+
+        budget = RenderBudget(self.max_loop_iterations, self.max_output_length, self.max_render_seconds)
+        token = _active_budget.set(budget)
+        try:
+            chunks = []
+            length = 0
+            for chunk in template.root_render_func(jinja_context):
+                length += len(chunk)
+                budget.check_output(length)
+                chunks.append(chunk)
+            return self.env.concat(chunks)
+        except Exception:
+            return self.env.handle_exception()
+        finally:
+            _active_budget.reset(token)
@@ -1,5 +1,14 @@
 from .embeds import embed_from_dict
 from .functions import apply_obj_data
-from .lazy import LazyContext
+from .lazy import AwaitableInSyncRenderError, Cached, LazyContext, LazyNamespace, ValidFor, VariableCache
 
-__all__ = ["embed_from_dict", "apply_obj_data", "LazyContext"]
+__all__ = [
+    "embed_from_dict",
+    "apply_obj_data",
+    "AwaitableInSyncRenderError",
+    "Cached",
+    "LazyContext",
+    "LazyNamespace",
+    "ValidFor",
+    "VariableCache",
+]
@@ -1,6 +1,195 @@
-from collections.abc import Mapping
+import asyncio
+import concurrent.futures
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from datetime import time as time_of_day
 from typing import Any
 
+# Value types a render can be cached on: immutable, so comparing them later detects every change.
+SNAPSHOT_TYPES: tuple[type, ...] = (str, int, float, bool, type(None), date, time_of_day, timedelta)
+
+# Marks a key that a render looked up but that did not exist.
+MISSING = object()
+
+# Default number of template variable values kept across renders.
+VARIABLE_CACHE_SIZE: int = 4096
+
+# Set while an async render runs, the only renders able to await values. See TemplateEngine.render_string_async.
+awaitables_allowed: ContextVar[bool] = ContextVar("awaitables_allowed", default=False)
+
+# Event loop running the awaitable values of async renders that run in a worker thread with a loop of their own.
+# Providers use resources bound to the bot's loop, such as database sessions, so their awaitables run there.
+provider_loop: ContextVar[asyncio.AbstractEventLoop | None] = ContextVar("provider_loop", default=None)
+
+
+class AwaitableInSyncRenderError(RuntimeError):
+    """Raised when a synchronous render reads a value that can only be awaited, such as a database lookup."""
+
+
+def is_snapshot_safe(value: Any) -> bool:
+    if isinstance(value, tuple | frozenset):
+        return all(is_snapshot_safe(item) for item in value)
+    return isinstance(value, SNAPSHOT_TYPES)
+
+
+@dataclass(frozen=True)
+class ValidFor:
+    """Wraps a template variable (a value or a callable) whose value stays valid for a limited time only.
+
+    Render caches reuse output that read it until the window ends instead of comparing the value, which suits
+    values such as the current time that differ on every read.
+    """
+
+    value: Any
+    seconds: float
+
+
+@dataclass(frozen=True)
+class Cached:
+    """Wraps a template variable (a value or a callable) whose value can be shared across renders.
+
+    The key function identifies the value, for example (user_id, day) for a daily per-user value. Renders with a
+    VariableCache attached reuse the value for the same namespace, variable and key for up to ttl seconds.
+    """
+
+    value: Any
+    key: Callable[[], Hashable]
+    ttl: float
+
+
+@dataclass(frozen=True)
+class VariableCacheInfo:
+    """Snapshot of the shared template variable cache statistics."""
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    maxsize: int
+    currsize: int
+
+
+class VariableCache:
+    """Bounded LRU cache of template variable values shared by every render, with per-entry expiry."""
+
+    def __init__(self, maxsize: int = VARIABLE_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        # Cache key -> (value, monotonic expiry)
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        # Renders may run in worker threads, see TemplateEngine.render_string_with_timeout
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get_or_load(self, key: Hashable, ttl: float, load: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if now < expires_at and not _is_failed_future(value):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+
+        # Load outside the lock, a slow loader must not block renders of unrelated values
+        value = load()
+        with self._lock:
+            self._entries[key] = (value, now + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def cache_info(self) -> VariableCacheInfo:
+        return VariableCacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            expirations=self.expirations,
+            maxsize=self.maxsize,
+            currsize=len(self._entries),
+        )
+
+
+def _is_future(value: Any) -> bool:
+    return isinstance(value, asyncio.Future | concurrent.futures.Future)
+
+
+def _is_failed_future(value: Any) -> bool:
+    # Awaitable values are cached as futures, a failed one is loaded again instead of re-raising its error
+    return _is_future(value) and value.done() and (value.cancelled() or value.exception() is not None)
+
+
+async def _awaited(awaitable: Any) -> Any:
+    return await awaitable
+
+
+def _on_running_loop(value: Any) -> Any:
+    """Adapts a future of another thread or event loop, so the running async render can await it."""
+    if isinstance(value, concurrent.futures.Future):
+        return asyncio.wrap_future(value)
+    if isinstance(value, asyncio.Future) and value.get_loop() is not asyncio.get_running_loop():
+        return asyncio.wrap_future(asyncio.run_coroutine_threadsafe(_awaited(value), value.get_loop()))
+    return value
+
+
+@dataclass
+class RenderDependencies:
+    """Records the LazyContext keys a render read, with the values they resolved to."""
+
+    # Key path from the top-level context -> (value or MISSING, monotonic expiry or None)
+    reads: dict[tuple[str, ...], tuple[Any, float | None]] = field(default_factory=dict)
+    cacheable: bool = True
+
+    def record(self, path: tuple[str, ...], value: Any, valid_for: float | None = None) -> None:
+        if path in self.reads:
+            return
+        if value is not MISSING and not is_snapshot_safe(value):
+            # Mutable or opaque objects may change without comparing unequal, never reuse such a render
+            self.cacheable = False
+        expires_at = time.monotonic() + valid_for if valid_for is not None else None
+        self.reads[path] = (value, expires_at)
+
+    def still_valid(self, context: Mapping[str, Any]) -> bool:
+        """Checks whether every recorded read resolves to the same value in a new context."""
+        now = time.monotonic()
+        for path, (value, expires_at) in self.reads.items():
+            if expires_at is not None:
+                if now >= expires_at:
+                    return False
+                continue
+            current = _resolve_path(context, path)
+            if type(current) is not type(value) or current != value:
+                return False
+        return True
+
+
+def _resolve_path(context: Mapping[str, Any], path: tuple[str, ...]) -> Any:
+    value: Any = context
+    for key in path:
+        try:
+            value = value[key]
+        except (KeyError, TypeError):
+            return MISSING
+    return value
+
 
 class LazyContext(dict[str, Any]):
     """A dictionary wrapper used during Jinja2 template rendering that acts as a memoizing proxy.
@@ -10,33 +199,184 @@ class LazyContext(dict[str, Any]):
     2. Memoization: Evaluated values are cached in self[key] so subsequent reads are instant.
     3. Dynamic Mapping Support: Delegates un-memoized keys directly to source_mapping[key],
        preserving custom dict subclass behavior (e.g. TimeContext).
+    4. Dependency Tracking: With a RenderDependencies attached, records every key read, including nested contexts.
+       Values wrapped in ValidFor, or read from a source mapping with a valid_for attribute, are time limited.
+    5. Awaitable Values: Coroutines returned by callables are scheduled as tasks and memoized, so async renders
+       can resolve independent values concurrently and await the same value more than once. Synchronous renders
+       reading one raise AwaitableInSyncRenderError instead.
+    6. Cross-render Caching: Values wrapped in Cached are shared through the attached VariableCache, keyed by
+       cache_prefix (the provider namespace), the variable name and the wrapper's key function.
     """
 
-    def __init__(self, source_mapping: Mapping[str, Any]) -> None:
+    def __init__(
+        self,
+        source_mapping: Mapping[str, Any],
+        variable_cache: VariableCache | None = None,
+        cache_prefix: tuple[str, ...] = (),
+    ) -> None:
         self._source_mapping: Mapping[str, Any] = source_mapping
+        self._variable_cache = variable_cache
+        self._cache_prefix = cache_prefix
+        self._dependencies: RenderDependencies | None = None
+        self._path: tuple[str, ...] = ()
+        # Keys of the values loaded through the VariableCache, which other renders may be awaiting too
+        self._shared: set[str] = set()
         super().__init__()
 
+    def track(self, dependencies: RenderDependencies | None, path: tuple[str, ...] = ()) -> None:
+        """Attaches a dependency recorder to this context and the nested contexts read through it."""
+        self._dependencies = dependencies
+        self._path = path
+
     def __getitem__(self, key: str) -> Any:
         # Check if key is already cached in the dictionary storage
         if dict.__contains__(self, key):
-            return super().__getitem__(key)
+            value = super().__getitem__(key)
+            self._record(key, value, None)
+            return self._for_render(key, value)
 
         # Retrieve value from underlying mapping (supports both dicts and dynamic dict subclasses)
-        value: Any = self._source_mapping[key]
+        try:
+            value: Any = self._source_mapping[key]
+        except KeyError:
+            self._record(key, MISSING, None)
+            raise
+
+        valid_for = getattr(self._source_mapping, "valid_for", None)
+        if isinstance(value, ValidFor):
+            valid_for = value.seconds
+            value = value.value
+
+        if isinstance(value, Cached):
+            value = self._load_cached(key, value)
+            if self._variable_cache is not None:
+                self._shared.add(key)
+        else:
+            value = self._evaluate(key, value)
 
+        # Cache result for future reads in this rendering context
+        self[key] = value
+        self._record(key, value, valid_for)
+        return self._for_render(key, value)
+
+    def _for_render(self, key: str, value: Any) -> Any:
+        # Futures are kept as started, possibly by an earlier render on another loop, and adapted on every read
+        if not _is_future(value):
+            return value
+        if not awaitables_allowed.get():
+            self._reject_awaitable(key)
+        value = _on_running_loop(value)
+        if key in self._shared:
+            # Cancelling this render's view must not cancel the lookup for everyone else
+            value = asyncio.shield(value)
+        return value
+
+    def _evaluate(self, key: str, value: Any) -> Any:
         # Lazily evaluate callable values
         if callable(value) and not isinstance(value, type):
             value = value()
 
-        # Cache result for future reads in this rendering context
-        self[key] = value
+        if inspect.isawaitable(value):
+            if not awaitables_allowed.get():
+                # Never start work whose result a synchronous render could not use
+                if inspect.iscoroutine(value):
+                    value.close()
+                self._reject_awaitable(key)
+            loop = provider_loop.get()
+            if loop is not None:
+                # Returns a thread-safe future, which every loop can await and the VariableCache can share
+                return asyncio.run_coroutine_threadsafe(_awaited(value), loop)
+            # Start awaitables right away, a task can be awaited by every read in this render
+            value = asyncio.ensure_future(value)
         return value
 
+    def _reject_awaitable(self, key: str) -> None:
+        name = ".".join((*self._cache_prefix, key))
+        raise AwaitableInSyncRenderError(f"Template variable {name!r} must be read by an async render")
+
+    def _load_cached(self, key: str, cached: Cached) -> Any:
+        if self._variable_cache is None:
+            return self._evaluate(key, cached.value)
+        cache_key = (*self._cache_prefix, key, cached.key())
+        return self._variable_cache.get_or_load(cache_key, cached.ttl, lambda: self._evaluate(key, cached.value))
+
     def __contains__(self, key: object) -> bool:
-        return super().__contains__(key) or key in self._source_mapping
+        found = super().__contains__(key) or key in self._source_mapping
+        if not found and isinstance(key, str):
+            self._record(key, MISSING, None)
+        return found
+
+    def _record(self, key: str, value: Any, valid_for: float | None) -> None:
+        if self._dependencies is None:
+            return
+        if isinstance(value, LazyContext):
+            # Nested namespaces are followed rather than compared, their own reads are the dependencies
+            value.track(self._dependencies, self._path + (key,))
+        else:
+            self._dependencies.record(self._path + (key,), value, valid_for)
 
     def get(self, key: str, default: Any = None) -> Any:
         try:
             return self[key]
         except KeyError:
             return default
+
+    def __iter__(self) -> Iterator[str]:
+        # Include keys not read yet, so copies of the context (such as Jinja's import with context) see them
+        yield from dict.__iter__(self)
+        yield from (key for key in self._source_mapping if not dict.__contains__(self, key))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def prefetch(self, paths: Iterable[tuple[str, ...]]) -> list[asyncio.Future]:
+        """Resolves the given key paths up front, starting every awaitable among them before any is awaited.
+
+        Returns the futures it started or found, so the render can cancel those left running once it is over.
+        """
+        futures = []
+        for path in paths:
+            value: Any = self
+            for key in path:
+                if not isinstance(value, LazyContext) or key not in value:
+                    break
+                value = value[key]
+            if isinstance(value, asyncio.Future):
+                futures.append(value)
+        return futures
+
+
+class LazyNamespace(Mapping[str, Any]):
+    """Top-level template namespace that builds a provider's LazyContext only when a template reads its key.
+
+    Used as the source mapping of a LazyContext, which memoizes each namespace for the rest of the render.
+    Provider namespaces take precedence over base values of the same name.
+    """
+
+    def __init__(
+        self,
+        base: Mapping[str, Any],
+        providers: Mapping[str, Callable[[Any], Any]],
+        ctx: Any,
+        variable_cache: VariableCache | None = None,
+    ) -> None:
+        self._base = base
+        self._providers = providers
+        self._ctx = ctx
+        self._variable_cache = variable_cache
+
+    def __getitem__(self, key: str) -> Any:
+        provider = self._providers.get(key)
+        if provider is not None:
+            return LazyContext(provider(self._ctx), self._variable_cache, (key,))
+        return self._base[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._providers or key in self._base
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._providers
+        yield from (key for key in self._base if key not in self._providers)
+
+    def __len__(self) -> int:
+        return len(self._providers) + sum(1 for key in self._base if key not in self._providers)
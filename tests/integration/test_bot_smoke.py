@@ -74,3 +74,25 @@ def test_bot_initialization_fails_on_invalid_config(
             os.unlink(temp_path)
         except OSError:
             pass
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_database_tables_are_only_created_on_request(tmp_path: Path) -> None:
+    """Verifies the development option database_create_tables creates every table, which migrations do otherwise."""
+    import yaml
+    from sqlalchemy import inspect
+    from sysbot_helper.cogs.models import Base
+
+    config_path = tmp_path / "config.yml"
+    config_path.write_text(
+        yaml.dump({"database_url": f"sqlite+aiosqlite:///{tmp_path / 'bot.db'}", "database_create_tables": True})
+    )
+    bot_instance: Bot = Bot(config_path)
+    assert bot_instance.database_create_tables
+
+    await bot_instance.create_database_tables()
+    async with bot_instance.database_engine.connect() as connection:
+        table_names = await connection.run_sync(lambda sync_conn: inspect(sync_conn).get_table_names())
+    assert set(table_names) == set(Base.metadata.tables)
+    await bot_instance.database_engine.dispose()
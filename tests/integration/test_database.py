@@ -1,12 +1,19 @@
+import asyncio
 import os
 from collections.abc import AsyncGenerator
 from datetime import datetime
+from pathlib import Path
+from unittest.mock import MagicMock
 
 import pytest
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sysbot_helper.cogs.models import Base, Experience, TelegramMapping, User
+from sysbot_helper.groups import Groups
+from sysbot_helper.groups_store import DatabaseGroupsStore
+from sysbot_helper.schedule import TaskScheduler
+from sysbot_helper.schedule_store import DatabaseStateStore
 
 
 @pytest.fixture
@@ -34,6 +41,14 @@ async def database_session_factory() -> AsyncGenerator[sessionmaker[AsyncSession
     await async_engine.dispose()
 
 
+async def create_file_database(path: Path) -> tuple[AsyncEngine, sessionmaker[AsyncSession]]:
+    """Creates a SQLite database file with every table, for tests sharing one database between several clients."""
+    async_engine: AsyncEngine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with async_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    return async_engine, sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)
+
+
 @pytest.mark.asyncio
 @pytest.mark.integration
 async def test_telegram_mapping_create_read_update_delete(
@@ -171,3 +186,167 @@ async def test_experience_record_crud(
         assert updated_experience is not None
         assert updated_experience.experience == 150
         assert updated_experience.level == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_scheduler_state_round_trip(tmp_path: Path) -> None:
+    """Verifies the scheduler state store loads and upserts last-run timestamps."""
+    async_engine, session_factory = await create_file_database(tmp_path / "state.db")
+
+    store: DatabaseStateStore = DatabaseStateStore(session_factory)
+    assert await store.load() == {}
+
+    await store.save({"Daily.report": 1_800_000_000.0, "Daily.cleanup": 1_800_000_060.0})
+    await store.save({"Daily.report": 1_800_086_400.0})
+
+    reloaded: dict[str, float] = await DatabaseStateStore(session_factory).load()
+    assert reloaded == {"Daily.report": 1_800_086_400.0, "Daily.cleanup": 1_800_000_060.0}
+
+    await async_engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_scheduler_leader_lease_failover(tmp_path: Path) -> None:
+    """Verifies only one of two schedulers sharing a database leads, and the standby takes over."""
+    async_engine, session_factory = await create_file_database(tmp_path / "lease.db")
+
+    def make_scheduler() -> TaskScheduler:
+        bot = MagicMock()
+        bot.now.side_effect = datetime.now
+        bot.is_closed.return_value = False
+        bot.feature_enabled.side_effect = lambda feature: feature == "database"
+        bot.Session = session_factory
+        return TaskScheduler(bot, leader_lease=True, lease_ttl=0.3)
+
+    first: TaskScheduler = make_scheduler()
+    second: TaskScheduler = make_scheduler()
+    await first.start()
+    await second.start()
+    assert first.is_leader
+    assert not second.is_leader
+
+    # A clean shutdown hands the lease over on the standby's next renewal attempt
+    await first.close()
+    await second.refresh_lease()
+    assert second.is_leader
+
+    # A leader that stops renewing loses the lease once it expires
+    third: TaskScheduler = make_scheduler()
+    await third.start()
+    assert not third.is_leader
+    second.stop()
+    await asyncio.sleep(0.4)
+    await third.refresh_lease()
+    assert third.is_leader
+
+    await third.close()
+    await async_engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_database_groups_are_shared_between_processes(tmp_path: Path) -> None:
+    """Verifies saved groups written by one bot reach another through the version counter, read from memory."""
+    async_engine, session_factory = await create_file_database(tmp_path / "groups.db")
+
+    def make_groups() -> Groups:
+        groups = Groups({"sudo": [1, {"sysbots": []}]})
+        groups.set_store(DatabaseGroupsStore(session_factory, refresh_interval=60))
+        return groups
+
+    first: Groups = make_groups()
+    second: Groups = make_groups()
+    await first.start()
+    await second.start()
+
+    first.add_member_save("sysbots", 100, 200)
+    first.remove_member_save("sysbots", 200)
+    await first.flush()
+    assert first.get_members("sysbots") == {100}
+    assert not second.in_group(100, "sudo")
+
+    # The writer already holds the latest version, only the other process reloads
+    assert not await first.store.refresh()
+    assert await second.store.refresh()
+    assert second.in_group(100, "sudo")
+    assert not await second.store.refresh()
+
+    second.remove_member_save("sysbots", 100)
+    await second.flush()
+    assert await first.store.refresh()
+    assert not first.in_group(100, "sudo")
+
+    await first.close()
+    await second.close()
+    await async_engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_database_groups_start_survives_an_unreachable_database(tmp_path: Path) -> None:
+    """Verifies a failed initial load is logged instead of raised, and the refresh loop loads the groups later."""
+    async_engine, session_factory = await create_file_database(tmp_path / "groups.db")
+    writer: Groups = Groups({})
+    writer.set_store(DatabaseGroupsStore(session_factory, refresh_interval=60))
+    writer.add_member_save("sysbots", 100)
+    await writer.flush()
+
+    # The database is still unreachable when the bot becomes ready
+    unreachable = MagicMock(side_effect=ConnectionRefusedError("database is starting"))
+    store: DatabaseGroupsStore = DatabaseGroupsStore(unreachable, refresh_interval=0.01)
+    groups: Groups = Groups({})
+    groups.set_store(store)
+    await groups.start()
+    assert not groups.in_group(100, "sysbots")
+
+    store.Session = session_factory
+    for _ in range(100):
+        if groups.in_group(100, "sysbots"):
+            break
+        await asyncio.sleep(0.01)
+    assert groups.in_group(100, "sysbots")
+
+    await groups.close()
+    await writer.close()
+    await async_engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_database_groups_failed_writes_are_retried(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """Verifies a change whose write fails stays pending, is logged and reaches the database on a retry."""
+    async_engine, session_factory = await create_file_database(tmp_path / "groups.db")
+    store: DatabaseGroupsStore = DatabaseGroupsStore(session_factory, refresh_interval=0.01)
+    groups: Groups = Groups({})
+    groups.set_store(store)
+
+    write = store._write
+    failures: list[int] = []
+
+    async def flaky_write(entries: list) -> int:
+        if len(failures) < 2:
+            failures.append(len(entries))
+            raise ConnectionResetError("connection lost")
+        return await write(entries)
+
+    store._write = flaky_write
+    groups.add_member_save("sysbots", 100)
+    await asyncio.sleep(0)
+    groups.add_member_save("sysbots", 200)
+    for _ in range(100):
+        if not store._pending and store._flush_task.done():
+            break
+        await asyncio.sleep(0.01)
+
+    assert failures == [1, 2]
+    assert "Unable to write saved groups to the database" in caplog.text
+    reader: DatabaseGroupsStore = DatabaseGroupsStore(session_factory)
+    reloaded: list = []
+    reader._on_reload = reloaded.append
+    assert await reader.refresh()
+    assert reloaded == [{"sysbots": {100, 200}}]
+
+    await groups.close()
+    await async_engine.dispose()
@@ -0,0 +1,40 @@
+import unittest
+from types import SimpleNamespace
+
+from sysbot_helper.bot import Bot
+
+
+def make_bot(configs: dict) -> Bot:
+    bot = Bot.__new__(Bot)
+    bot.configs = configs
+    bot.rebuild_config_index()
+    return bot
+
+
+class TestBotConfig(unittest.TestCase):
+    def test_per_id_config_merges_over_global_defaults(self) -> None:
+        """Verifies that id specific overrides are merged over the non-id keys of a category."""
+        bot = make_bot({"guild": {"timezone": "UTC", "prefix": "!", 123: {"timezone": "Asia/Tokyo"}, 456: None}})
+
+        self.assertEqual(dict(bot.guild_config(SimpleNamespace(id=123))), {"timezone": "Asia/Tokyo", "prefix": "!"})
+        self.assertEqual(dict(bot.guild_config(SimpleNamespace(id=456))), {"timezone": "UTC", "prefix": "!"})
+        self.assertEqual(dict(bot.guild_config(None)), {"timezone": "UTC", "prefix": "!"})
+
+    def test_configs_are_shared_and_read_only(self) -> None:
+        """Verifies that ids without overrides share one global mapping which callers cannot modify."""
+        bot = make_bot({"channel": {"mode": "quiet"}})
+
+        config = bot.channel_config(SimpleNamespace(id=1))
+        self.assertIs(config, bot.channel_config(SimpleNamespace(id=2)))
+        with self.assertRaises(TypeError):
+            config["mode"] = "loud"
+
+    def test_rebuild_picks_up_config_changes(self) -> None:
+        """Verifies that the index reflects changes to the raw configs once rebuilt."""
+        bot = make_bot({"user": {"language": "en"}})
+
+        bot.configs["user"][42] = {"language": "de"}
+        self.assertEqual(bot.user_config(SimpleNamespace(id=42))["language"], "en")
+
+        bot.rebuild_config_index()
+        self.assertEqual(bot.user_config(SimpleNamespace(id=42))["language"], "de")
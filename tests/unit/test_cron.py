@@ -1,8 +1,36 @@
+import timeit
 import unittest
-from datetime import datetime
+from datetime import datetime, timedelta
 
+import pytest
 from sysbot_helper.cron import _DAY_NAMES, CronExpression, CronFieldType, CronItem, HashedCronResolver
 
+# Expression and instants compared in the bitmask benchmark
+BENCHMARK_EXPRESSION: str = "*/15 8-20/2 1-7,15 * Mon-Fri"
+
+
+def benchmark_instants() -> list[datetime]:
+    return [datetime(2026, 7, 1) + timedelta(minutes=7 * index) for index in range(2000)]
+
+
+def match_cron_items(expression: CronExpression, target: datetime) -> bool:
+    """Reference matching, walking the CronItem lists of every field."""
+    dom_match = any(item.match(target.day) for item in expression.day)
+    dow_match = any(item.match((target.weekday() + 1) % 7) for item in expression.day_of_week)
+    if not any(item.is_wildcard for item in expression.day) and not any(
+        item.is_wildcard for item in expression.day_of_week
+    ):
+        date_match = dom_match or dow_match
+    else:
+        date_match = dom_match and dow_match
+    return (
+        any(item.match(target.second) for item in expression.second)
+        and any(item.match(target.minute) for item in expression.minute)
+        and any(item.match(target.hour) for item in expression.hour)
+        and any(item.match(target.month) for item in expression.month)
+        and date_match
+    )
+
 
 class TestCronExpression(unittest.TestCase):
     def test_cron_item_wildcard_matching(self) -> None:
@@ -153,3 +181,118 @@ class TestCronExpression(unittest.TestCase):
 
         with self.assertRaises(ValueError):
             CronItem.Minute("*/0")
+
+    def test_next_fire_after_advances_field_by_field(self) -> None:
+        """Verifies next_fire_after skips to the next matching minute, hour, day and month boundaries."""
+        expression: CronExpression = CronExpression("30 9 * * *")
+
+        self.assertEqual(expression.next_fire_after(datetime(2026, 7, 1, 8, 0, 0)), datetime(2026, 7, 1, 9, 30, 0))
+        self.assertEqual(expression.next_fire_after(datetime(2026, 7, 1, 9, 30, 0)), datetime(2026, 7, 2, 9, 30, 0))
+        self.assertEqual(expression.next_fire_after(datetime(2026, 12, 31, 10, 0, 0)), datetime(2027, 1, 1, 9, 30, 0))
+
+        leap_day: CronExpression = CronExpression("0 0 29 2 *")
+        self.assertEqual(leap_day.next_fire_after(datetime(2026, 7, 1)), datetime(2028, 2, 29, 0, 0, 0))
+
+        never: CronExpression = CronExpression("0 0 31 2 *")
+        self.assertIsNone(never.next_fire_after(datetime(2026, 7, 1)))
+
+    def test_next_fire_after_day_of_week_rules(self) -> None:
+        """Verifies the POSIX DOM/DOW OR rule, the 7 Sunday alias and wrap-around DOW ranges."""
+        dom_or_dow: CronExpression = CronExpression("0 0 1 * Mon")
+        self.assertEqual(dom_or_dow.next_fire_after(datetime(2026, 7, 1, 0, 0, 0)), datetime(2026, 7, 6, 0, 0, 0))
+        self.assertEqual(dom_or_dow.next_fire_after(datetime(2026, 7, 27, 0, 0, 0)), datetime(2026, 8, 1, 0, 0, 0))
+
+        sunday_alias: CronExpression = CronExpression("0 12 * * 7")
+        self.assertEqual(sunday_alias.next_fire_after(datetime(2026, 7, 6, 0, 0, 0)), datetime(2026, 7, 12, 12, 0, 0))
+
+        weekend_wrap: CronExpression = CronExpression("0 0 * * Fri-Mon")
+        fire_days: list[int] = [
+            fire.weekday() for fire in weekend_wrap.fires_between(datetime(2026, 7, 5), datetime(2026, 7, 19))
+        ]
+        self.assertEqual(fire_days, [0, 4, 5, 6, 0, 4, 5, 6])
+
+    def test_fires_between_agrees_with_is_now_for_hashed_expressions(self) -> None:
+        """Verifies that re-seeded 'H' fire times match a brute-force is_now scan across period boundaries."""
+        windows: dict[str, tuple[datetime, datetime, timedelta]] = {
+            "H H * * *": (datetime(2026, 6, 30, 20), datetime(2026, 7, 2, 4), timedelta(minutes=1)),
+            "H/20 H(20-23),H(0-3) * * *": (datetime(2026, 6, 30, 20), datetime(2026, 7, 2, 4), timedelta(minutes=1)),
+            "H/15 H(50-59),H(0-9) * * * *": (
+                datetime(2026, 6, 30, 23, 50),
+                datetime(2026, 7, 1, 0, 10),
+                timedelta(seconds=1),
+            ),
+        }
+
+        for raw_expression, (start, end, step) in windows.items():
+            expression: CronExpression = CronExpression(raw_expression, seed="Cog.callback")
+
+            expected: list[datetime] = []
+            current: datetime = start + step
+            while current <= end:
+                if expression.is_now(current):
+                    expected.append(current)
+                current += step
+
+            self.assertTrue(expected, raw_expression)
+            self.assertEqual(list(expression.fires_between(start, end)), expected, raw_expression)
+
+    def test_compiled_field_masks(self) -> None:
+        """Verifies that fields compile into value-indexed bitmasks with precomputed DOM/DOW restriction flags."""
+        expression: CronExpression = CronExpression("*/20 9-17 1,15 * Fri-Mon")
+
+        self.assertEqual(expression.second_mask, 1)
+        self.assertEqual(expression.minute_mask, (1 << 0) | (1 << 20) | (1 << 40))
+        self.assertEqual(expression.hour_mask, sum(1 << hour for hour in range(9, 18)))
+        self.assertEqual(expression.day_mask, (1 << 1) | (1 << 15))
+        self.assertEqual(expression.month_mask, sum(1 << month for month in range(1, 13)))
+        self.assertEqual(expression.day_of_week_mask, (1 << 0) | (1 << 1) | (1 << 5) | (1 << 6))
+        self.assertTrue(expression.day_restricted)
+        self.assertTrue(expression.day_of_week_restricted)
+
+        self.assertFalse(CronExpression("0 0 * * Mon").day_restricted)
+        self.assertFalse(CronExpression("0 0 1 * 0-7").day_of_week_restricted)
+
+    def test_compiled_masks_match_cron_items(self) -> None:
+        """Verifies bitmask matching agrees with walking the CronItem lists for the same instants."""
+        expression: CronExpression = CronExpression(BENCHMARK_EXPRESSION)
+        instants: list[datetime] = benchmark_instants()
+
+        self.assertEqual([expression.is_now(t) for t in instants], [match_cron_items(expression, t) for t in instants])
+
+    @pytest.mark.benchmark
+    def test_compiled_masks_benchmark_against_cron_items(self) -> None:
+        """Benchmarks bitmask matching against walking the CronItem lists for the same instants."""
+        expression: CronExpression = CronExpression(BENCHMARK_EXPRESSION)
+        instants: list[datetime] = benchmark_instants()
+
+        cron_item_seconds: float = timeit.timeit(lambda: [match_cron_items(expression, t) for t in instants], number=5)
+        bitmask_seconds: float = timeit.timeit(lambda: [expression.is_now(t) for t in instants], number=5)
+        self.assertLess(bitmask_seconds, cron_item_seconds)
+
+    def test_hashed_resolution_is_memoized_per_period(self) -> None:
+        """Verifies that 'H H * * *' is re-resolved only when the hourly period of its minute field rolls over."""
+        HashedCronResolver.cache_clear()
+        expression: CronExpression = CronExpression("H H * * *", seed="ScheduledMessages.message_0")
+
+        for minute in range(60):
+            expression.is_now(datetime(2026, 7, 1, 9, minute, 0))
+        self.assertEqual(HashedCronResolver.cache_info().misses, 1)
+        self.assertEqual(HashedCronResolver.cache_info().hits, 59)
+
+        expression.is_now(datetime(2026, 7, 1, 10, 0, 0))
+        self.assertEqual(HashedCronResolver.cache_info().misses, 2)
+
+        for target in (datetime(2026, 7, 1, 23, 59, 59), datetime(2026, 7, 2, 0, 0, 0), datetime(2026, 7, 6, 0, 0)):
+            self.assertEqual(
+                HashedCronResolver.resolve_expression_for_period("H H * * *", "job", target),
+                HashedCronResolver.resolve_expression("H H * * *", job_name="job", target_datetime=target),
+            )
+
+    def test_unhashed_aliases_do_not_shrink_resolution_window(self) -> None:
+        """Verifies that 'thu' and 'march' are not mistaken for 'H' tokens when computing the cache window."""
+        HashedCronResolver.cache_clear()
+        for day in range(1, 32):
+            HashedCronResolver.resolve_expression_for_period("0 9 H march thu", "job", datetime(2026, 3, day))
+
+        self.assertEqual(HashedCronResolver.cache_info().misses, 1)
+        self.assertEqual(HashedCronResolver.cache_info().currsize, 1)
@@ -1,10 +1,60 @@
+import asyncio
+import json
+import random
 import tempfile
+import timeit
 import unittest
+from collections import deque
 from pathlib import Path
 from typing import Any
+from unittest.mock import patch
 
+import pytest
 from sysbot_helper.groups import Groups
 
+# Size of the generated group graph in the membership benchmark
+BENCHMARK_GROUP_COUNT: int = 300
+BENCHMARK_CHANNEL_COUNT: int = 5000
+
+
+def bfs_members(groups: Groups, name: str) -> set[Any]:
+    """Reference membership expansion, walking the group graph on every call."""
+    queue: deque[int] = deque([groups.group_names[name]])
+    visited: set[int] = set(queue)
+    members: set[Any] = set()
+    while queue:
+        group = groups.groups[queue.popleft()]
+        members.update(group.members)
+        for child in group.children - visited:
+            visited.add(child)
+            queue.append(child)
+    return members
+
+
+def make_nested_config(rng: random.Random) -> dict[str, Any]:
+    """Builds group configs nesting earlier groups into later ones, over thousands of channel ids."""
+    config: dict[str, Any] = {}
+    for index in range(BENCHMARK_GROUP_COUNT):
+        channels: list[Any] = rng.sample(range(BENCHMARK_CHANNEL_COUNT), 20)
+        nested: dict[str, Any] = {f"group{child}": [] for child in rng.sample(range(index), min(index, 3))}
+        config[f"group{index}"] = channels + [nested]
+    return config
+
+
+def make_benchmark_groups(rng: random.Random) -> Groups:
+    """Builds the nested group graph, with a few saved members on top."""
+    groups: Groups = Groups(make_nested_config(rng))
+    for index in rng.sample(range(BENCHMARK_GROUP_COUNT), 20):
+        groups.add_member_save(f"group{index}", rng.randrange(BENCHMARK_CHANNEL_COUNT))
+    return groups
+
+
+def make_probes(rng: random.Random) -> list[tuple[int, str]]:
+    """Random (member id, group name) membership tests."""
+    return [
+        (rng.randrange(BENCHMARK_CHANNEL_COUNT), f"group{rng.randrange(BENCHMARK_GROUP_COUNT)}") for _ in range(200)
+    ]
+
 
 class TestGroups(unittest.TestCase):
     def test_group_member_resolution_with_nested_structures(self) -> None:
@@ -57,3 +107,123 @@ class TestGroups(unittest.TestCase):
         self.assertIn(2222, reloaded_members)
 
         temporary_directory.cleanup()
+
+    def test_closure_index_follows_incremental_changes(self) -> None:
+        """Verifies closures and the reverse index stay correct through updates, saves, removals and cycles."""
+        temporary_directory: tempfile.TemporaryDirectory[str] = tempfile.TemporaryDirectory()
+        save_file_path: Path = Path(temporary_directory.name) / "groups.json"
+
+        groups: Groups = Groups({"sudo": [1, {"mods": [2, {"helpers": 3}]}]}, save_file=str(save_file_path))
+        self.assertTrue(groups.in_group(3, "sudo"))
+        self.assertTrue(groups.in_group_all(3, "mods", "helpers"))
+        self.assertTrue(groups.in_group_any(7, "sudo", 7))
+        self.assertFalse(groups.in_group(2, "helpers"))
+        self.assertEqual(groups.get_groups(3), {"all", "sudo", "mods", "helpers"})
+
+        groups.add_member_save("helpers", 4)
+        self.assertTrue(groups.in_group(4, "sudo"))
+        groups.remove_member_save("helpers", 4)
+        self.assertFalse(groups.in_group(4, "sudo"))
+        self.assertEqual(groups.get_groups(4), set())
+
+        # A cycle back to the top still terminates and merges the members of both groups
+        groups.update({"helpers": {"sudo": []}})
+        self.assertTrue(groups.in_group(1, "helpers"))
+        self.assertEqual(groups.get_members("helpers"), groups.get_members("sudo"))
+
+        temporary_directory.cleanup()
+
+    def test_indexed_membership_matches_bfs_on_large_nested_graph(self) -> None:
+        """Verifies indexed membership agrees with a BFS per call on thousands of channels and nested groups."""
+        rng: random.Random = random.Random(1)
+        groups: Groups = make_benchmark_groups(rng)
+
+        names: list[str] = [f"group{index}" for index in range(BENCHMARK_GROUP_COUNT)]
+        for name in names:
+            self.assertEqual(groups.get_members(name), bfs_members(groups, name))
+
+        for member_id, name in make_probes(rng):
+            self.assertEqual(groups.in_group(member_id, name), member_id in bfs_members(groups, name))
+
+    @pytest.mark.benchmark
+    def test_membership_benchmark_on_large_nested_graph(self) -> None:
+        """Benchmarks indexed membership tests against a BFS per call on thousands of channels and nested groups."""
+        rng: random.Random = random.Random(1)
+        groups: Groups = make_benchmark_groups(rng)
+        probes: list[tuple[int, str]] = make_probes(rng)
+
+        bfs_seconds: float = timeit.timeit(lambda: [m in bfs_members(groups, n) for m, n in probes], number=5)
+        indexed_seconds: float = timeit.timeit(lambda: [groups.in_group(m, n) for m, n in probes], number=5)
+        self.assertLess(indexed_seconds * 10, bfs_seconds)
+
+
+class TestGroupsPersistence(unittest.IsolatedAsyncioTestCase):
+    async def test_bursts_of_changes_are_coalesced_into_one_write(self) -> None:
+        """Verifies many changes inside the debounce window produce a single atomic rewrite."""
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            save_file_path: Path = Path(temporary_directory) / "groups.json"
+            groups: Groups = Groups({}, save_file=str(save_file_path), debounce=0.05)
+
+            for member_id in range(100):
+                groups.add_member_save("sysbots", member_id)
+            groups.remove_member_save("sysbots", 0)
+            self.assertFalse(save_file_path.exists())
+
+            await asyncio.sleep(0.1)
+            await groups.flush()
+            self.assertEqual(groups.store.writes, 1)
+            self.assertEqual(set(json.loads(save_file_path.read_text())["sysbots"]), set(range(1, 100)))
+            self.assertEqual([path.name for path in Path(temporary_directory).iterdir()], ["groups.json"])
+
+    async def test_change_log_is_replayed_and_compacted(self) -> None:
+        """Verifies changes append to the log, which is streamed on startup and folded into the save file."""
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            save_file_path: Path = Path(temporary_directory) / "groups.json"
+            log_path: Path = Path(temporary_directory) / "groups.json.log"
+            options: dict[str, Any] = {"debounce": 0, "change_log": True, "compact_entries": 4}
+            groups: Groups = Groups({}, save_file=str(save_file_path), **options)
+
+            groups.add_member_save("sysbots", 1, 2)
+            await groups.flush()
+            groups.remove_member_save("sysbots", 1)
+            groups.add_member_save("sudo", 3)
+            await groups.flush()
+            self.assertFalse(save_file_path.exists())
+            self.assertEqual(len(log_path.read_text().splitlines()), 3)
+
+            # A crash in the middle of an append leaves a partial last line, which is skipped
+            with log_path.open("a") as f:
+                f.write('["add", "sudo", [4')
+            reloaded: Groups = Groups({}, save_file=str(save_file_path), **options)
+            self.assertEqual(reloaded.get_members("sysbots"), {2})
+            self.assertEqual(reloaded.get_members("sudo"), {3})
+
+            log_path.write_text(log_path.read_text().rsplit("\n", 1)[0] + "\n")
+            groups.add_member_save("sudo", 5)
+            await groups.flush()
+            self.assertEqual(log_path.read_text(), "")
+            self.assertEqual(json.loads(save_file_path.read_text()), {"sysbots": [2], "sudo": [3, 5]})
+            self.assertEqual(Groups({}, save_file=str(save_file_path), **options).get_members("sudo"), {3, 5})
+
+    async def test_failed_writes_keep_their_changes(self) -> None:
+        """Verifies changes whose write fails stay pending, are logged and reach the change log on a retry."""
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            save_file_path: Path = Path(temporary_directory) / "groups.json"
+            groups: Groups = Groups({}, save_file=str(save_file_path), debounce=0, change_log=True)
+            store = groups.store
+            write = store._write
+
+            groups.add_member_save("sysbots", 1)
+            with patch.object(store, "_write", side_effect=OSError("disk full")):
+                with self.assertRaises(OSError):
+                    await groups.flush()
+                groups.add_member_save("sysbots", 2)
+                with self.assertLogs("sysbot_helper.groups_store", "ERROR"):
+                    await asyncio.sleep(0.01)
+                    await store._flush_task
+            self.assertIsNotNone(store._timer)
+
+            with patch.object(store, "_write", wraps=write):
+                await groups.flush()
+            self.assertEqual(store._pending, [])
+            self.assertEqual(Groups({}, save_file=str(save_file_path), change_log=True).get_members("sysbots"), {1, 2})
@@ -0,0 +1,473 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from sysbot_helper.schedule import HISTOGRAM_BUCKETS, Histogram, ScheduledTask, TaskScheduler, scheduled
+from sysbot_helper.schedule_lease import FileLease
+
+
+class EverySecond:
+    def __init__(self) -> None:
+        self.calls: int = 0
+
+    @scheduled("* * * * * *")
+    async def tick(self) -> None:
+        self.calls += 1
+
+
+class Daily:
+    @scheduled("0 3 * * *")
+    async def report(self) -> None:
+        pass
+
+    @scheduled("30 2 * * *", "0 1 * * *")
+    async def cleanup(self) -> None:
+        pass
+
+
+class OffLoop:
+    def __init__(self) -> None:
+        self.results: list[tuple[str, int]] = []
+
+    @scheduled("* * * * *", executor="thread", on_result="collect")
+    def blocking(self) -> tuple[str, int]:
+        time.sleep(0.05)
+        return ("thread", threading.get_ident())
+
+    @scheduled("* * * * *", executor="process", on_result="collect")
+    def crunch() -> tuple[str, int]:
+        return ("process", os.getpid())
+
+    async def collect(self, result: tuple[str, int]) -> None:
+        self.results.append(result)
+
+
+def make_bot() -> MagicMock:
+    bot = MagicMock()
+    bot.now.side_effect = datetime.now
+    bot.is_closed.return_value = False
+    bot.feature_enabled.return_value = False
+    return bot
+
+
+class TestTaskScheduler(unittest.IsolatedAsyncioTestCase):
+    def test_next_fire_after_uses_earliest_schedule(self) -> None:
+        """Verifies that a task with several cron schedules reports the earliest upcoming fire time."""
+        task: ScheduledTask = Daily.cleanup
+        task = task.bind_to_cog(Daily())
+
+        self.assertEqual(task.next_fire_after(datetime(2026, 7, 1, 0, 0)), datetime(2026, 7, 1, 1, 0))
+        self.assertEqual(task.next_fire_after(datetime(2026, 7, 1, 1, 0)), datetime(2026, 7, 1, 2, 30))
+
+    async def test_heap_tracks_cog_registration(self) -> None:
+        """Verifies that adding and removing cogs keeps the fire time heap consistent."""
+        scheduler = TaskScheduler(make_bot())
+        scheduler.register_cog_tasks(Daily())
+        self.assertIsNone(scheduler.next_wakeup())
+
+        await scheduler.start()
+        try:
+            self.assertEqual(len(scheduler.heap), 2)
+
+            scheduler.register_cog_tasks(EverySecond())
+            self.assertEqual(len(scheduler.heap), 3)
+            self.assertLessEqual(scheduler.next_wakeup(), time.time() + 1)
+
+            scheduler.unregister_cog_tasks("EverySecond")
+            self.assertEqual(len(scheduler.heap), 2)
+            self.assertEqual({entry[2] for entry in scheduler.heap}, {"Daily"})
+        finally:
+            scheduler.stop()
+
+    async def test_due_task_is_dispatched(self) -> None:
+        """Verifies that the loop wakes up for the earliest due task without a fixed-rate tick."""
+        scheduler = TaskScheduler(make_bot())
+        every_second = EverySecond()
+        scheduler.register_cog_tasks(every_second)
+        scheduler.register_cog_tasks(Daily())
+
+        await scheduler.start()
+        try:
+            for _ in range(25):
+                await asyncio.sleep(0.1)
+                if every_second.calls:
+                    break
+        finally:
+            scheduler.stop()
+
+        self.assertGreaterEqual(every_second.calls, 1)
+
+    def test_fire_table_lists_upcoming_runs_per_task(self) -> None:
+        """Verifies the schedule preview lists every task's fire times in order, capped by the limit."""
+        scheduler = TaskScheduler(make_bot())
+        scheduler.register_cog_tasks(Daily())
+
+        table = scheduler.fire_table(start=datetime(2026, 7, 1, 12, 0), window=timedelta(days=2), limit=3)
+
+        self.assertEqual(table["Daily.report"], [datetime(2026, 7, 2, 3, 0), datetime(2026, 7, 3, 3, 0)])
+        self.assertEqual(
+            table["Daily.cleanup"],
+            [datetime(2026, 7, 2, 1, 0), datetime(2026, 7, 2, 2, 30), datetime(2026, 7, 3, 1, 0)],
+        )
+
+    async def run_overlapping(self, overlap: str) -> tuple[ScheduledTask, list[str]]:
+        """Starts a blocked run of a task, fires it again and releases the first run."""
+        release = asyncio.Event()
+        events: list[str] = []
+
+        async def slow(_: object) -> None:
+            events.append("start")
+            try:
+                await release.wait()
+            except asyncio.CancelledError:
+                events.append("cancelled")
+                raise
+            events.append("end")
+
+        task = ScheduledTask("* * * * *", callback=slow, overlap=overlap)
+        first = asyncio.create_task(task.run(None))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(task.run(None))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(first, second, return_exceptions=True)
+        return task, events
+
+    async def test_overlap_skip(self) -> None:
+        """Verifies that a run is skipped and counted while the previous run is still going."""
+        task, events = await self.run_overlapping("skip")
+
+        self.assertEqual(events, ["start", "end"])
+        self.assertEqual(task.skipped_runs, 1)
+
+    async def test_overlap_queue(self) -> None:
+        """Verifies that a queued run starts once the previous run finishes."""
+        task, events = await self.run_overlapping("queue")
+
+        self.assertEqual(events, ["start", "end", "start", "end"])
+        self.assertEqual(task.skipped_runs, 0)
+
+    async def test_overlap_cancel_previous(self) -> None:
+        """Verifies that a new run cancels the run still in progress."""
+        task, events = await self.run_overlapping("cancel_previous")
+
+        self.assertEqual(events, ["start", "cancelled", "start", "end"])
+        self.assertEqual(task.cancelled_runs, 1)
+
+    async def test_overlap_state_is_per_scheduler(self) -> None:
+        """Verifies two bots running the same cog class never skip each other's runs of a shared task."""
+        release = asyncio.Event()
+        started: list[object] = []
+
+        class Slow:
+            @scheduled("* * * * *")
+            async def update(self) -> None:
+                started.append(self)
+                await release.wait()
+
+        first_cog, second_cog = Slow(), Slow()
+        first, second = TaskScheduler(make_bot()), TaskScheduler(make_bot())
+        first.register_cog_tasks(first_cog)
+        second.register_cog_tasks(second_cog)
+        (_, first_task), (_, second_task) = first.tasks["Slow"][0], second.tasks["Slow"][0]
+
+        first_run = asyncio.create_task(first_task.run(first_cog))
+        await asyncio.sleep(0)
+        second_run = asyncio.create_task(second_task.run(second_cog))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(first_run, second_run)
+
+        self.assertEqual(started, [first_cog, second_cog])
+        self.assertEqual((first.skipped_runs, second.skipped_runs), (0, 0))
+
+    async def test_scheduler_wide_concurrency_limit(self) -> None:
+        """Verifies that max_concurrent_tasks caps how many scheduled callbacks run at once."""
+        running: list[int] = [0]
+        peak: list[int] = [0]
+
+        async def callback(_: object) -> None:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.01)
+            running[0] -= 1
+
+        scheduler = TaskScheduler(make_bot(), max_concurrent_tasks=2)
+        tasks = [ScheduledTask("* * * * *", callback=callback) for _ in range(5)]
+        await scheduler.dispatch_tasks([(None, task, [time.time()]) for task in tasks])
+
+        self.assertEqual(peak[0], 2)
+
+    def test_invalid_overlap_policy(self) -> None:
+        """Verifies that unknown overlap policies are rejected when the task is declared."""
+        with self.assertRaises(ValueError):
+            scheduled("* * * * *", overlap="parallel")(EverySecond.tick.callback)
+
+    async def test_telemetry_records_lag_duration_and_failures(self) -> None:
+        """Verifies per-task lag/duration histograms and timeout and exception counters."""
+
+        async def quick(_: object) -> None:
+            await asyncio.sleep(0.02)
+
+        async def failing(_: object) -> None:
+            raise RuntimeError("boom")
+
+        async def hanging(_: object) -> None:
+            await asyncio.sleep(10)
+
+        scheduler = TaskScheduler(make_bot(), scheduled_tasks_timeout=0.05)
+        tasks = [ScheduledTask("* * * * *", callback=callback) for callback in (quick, failing, hanging)]
+        await scheduler.dispatch_tasks([(None, task, [time.time() - 2]) for task in tasks])
+
+        quick_stats = scheduler.telemetry["quick"]
+        self.assertEqual(quick_stats.runs, 1)
+        self.assertEqual(quick_stats.lag.counts[HISTOGRAM_BUCKETS.index(2.5)], 1)
+        self.assertGreaterEqual(quick_stats.duration.maximum, 0.02)
+        self.assertEqual(scheduler.telemetry["failing"].exceptions, 1)
+        self.assertEqual(scheduler.telemetry["hanging"].timeouts, 1)
+
+    def test_histogram_quantiles(self) -> None:
+        """Verifies quantile estimates use bucket upper bounds, capped by the observed maximum."""
+        histogram = Histogram()
+        for value in (0.001, 0.002, 0.003, 0.7, 42):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.quantile(0.5), 0.01)
+        self.assertEqual(histogram.quantile(0.8), 1)
+        self.assertEqual(histogram.quantile(1.0), 42)
+        self.assertAlmostEqual(histogram.mean, 42.706 / 5)
+
+    def test_catch_up_policies_after_stall(self) -> None:
+        """Verifies that runs missed during a stall are dropped, coalesced or replayed per task policy."""
+
+        class Stalled:
+            @scheduled("* * * * *", catch_up="none")
+            async def dropped(self) -> None:
+                pass
+
+            @scheduled("* * * * *", catch_up="once")
+            async def coalesced(self) -> None:
+                pass
+
+            @scheduled("* * * * *", catch_up="all")
+            async def replayed(self) -> None:
+                pass
+
+            @scheduled("* * * * *", catch_up="all", max_catch_up=120)
+            async def windowed(self) -> None:
+                pass
+
+        clock: list[datetime] = [datetime(2026, 7, 1, 9, 0, 30)]
+        bot = make_bot()
+        bot.now.side_effect = lambda: clock[0]
+
+        scheduler = TaskScheduler(bot)
+        scheduler.register_cog_tasks(Stalled())
+        scheduler._rebuild_heap()
+
+        # The loop was expected to wake at 09:01:00 but only got to run at 09:05:30
+        clock[0] = datetime(2026, 7, 1, 9, 5, 30)
+        due = {
+            task.name: fire_timestamps for _, task, fire_timestamps in scheduler._pop_due_tasks(clock[0].timestamp())
+        }
+        missed = [datetime(2026, 7, 1, 9, minute).timestamp() for minute in range(1, 6)]
+
+        self.assertNotIn("Stalled.dropped", due)
+        self.assertEqual(due["Stalled.coalesced"], missed[:1])
+        self.assertEqual(due["Stalled.replayed"], missed)
+        self.assertEqual(due["Stalled.windowed"], missed[3:])
+        self.assertEqual(scheduler.telemetry["Stalled.dropped"].missed_runs, 5)
+        self.assertEqual(scheduler.telemetry["Stalled.coalesced"].missed_runs, 4)
+        self.assertEqual(scheduler.telemetry["Stalled.windowed"].missed_runs, 3)
+
+        # Every task is rescheduled after the current time rather than into the stall
+        self.assertEqual(scheduler.next_wakeup(), datetime(2026, 7, 1, 9, 6).timestamp())
+
+    def test_spread_offsets_five_field_schedules_only(self) -> None:
+        """Verifies that spreading shifts minute-aligned schedules by a stable per-task second."""
+
+        class Spread:
+            @scheduled("*/15 * * * *", "*/30 * * * * *")
+            async def update(self) -> None:
+                pass
+
+        task: ScheduledTask = Spread.update.bind_to_cog(Spread(), spread=True)
+        offset = task.spread_seconds
+
+        self.assertEqual(offset, zlib.crc32(b"Spread.update") % 60)
+        self.assertNotEqual(offset, 0)
+
+        fires = list(task.fires_between(datetime(2026, 7, 1, 9, 0, 0), datetime(2026, 7, 1, 9, 15, 59)))
+        expected = [datetime(2026, 7, 1, 9, minute, second) for minute in range(16) for second in (0, 30)][1:]
+        expected += [datetime(2026, 7, 1, 9, 0, offset), datetime(2026, 7, 1, 9, 15, offset)]
+        self.assertEqual(fires, sorted(set(expected)))
+        self.assertTrue(task.match(datetime(2026, 7, 1, 9, 15, offset)))
+
+        self.assertEqual(Spread.update.bind_to_cog(Spread()).spread_seconds, 0)
+        self.assertEqual(Spread.update.spread_seconds, 0)
+
+    def test_start_slots_are_capped_per_second(self) -> None:
+        """Verifies that starts beyond max_starts_per_second are pushed into the following seconds."""
+        scheduler = TaskScheduler(make_bot(), max_starts_per_second=2)
+        now = 1_800_000_000.25
+
+        delays = [scheduler._reserve_start_slot(now) for _ in range(5)]
+
+        self.assertEqual(delays, [0.0, 0.0, 0.75, 0.75, 1.75])
+        self.assertEqual(TaskScheduler(make_bot())._reserve_start_slot(now), 0.0)
+
+    async def start_with_state(self, now: datetime, last_runs: dict[str, float], **options) -> TaskScheduler:
+        """Starts a scheduler with the Daily cog, a frozen clock and a state file holding the given last runs."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        state_file = Path(directory.name) / "state.json"
+        state_file.write_text(json.dumps(last_runs))
+
+        bot = make_bot()
+        bot.now.side_effect = lambda: now
+        scheduler = TaskScheduler(bot, state_file=str(state_file), state_flush_interval=3600, **options)
+        scheduler.register_cog_tasks(Daily())
+        await scheduler.start()
+        self.addCleanup(scheduler.stop)
+        return scheduler
+
+    async def test_restart_does_not_refire_completed_run(self) -> None:
+        """Verifies a restart right after a run resumes from the persisted run instead of firing again."""
+        now = datetime(2026, 7, 1, 3, 0, 30)
+        scheduler = await self.start_with_state(now, {"Daily.report": datetime(2026, 7, 1, 3, 0).timestamp()})
+
+        report_fires = [entry[5] for entry in scheduler.heap if entry[4].name == "Daily.report"]
+        self.assertEqual(report_fires, [datetime(2026, 7, 2, 3, 0)])
+        self.assertEqual(scheduler._pop_due_tasks(now.timestamp()), [])
+
+    async def test_restart_catches_up_run_missed_while_down(self) -> None:
+        """Verifies a run that fell due while the bot was down is dispatched right after startup."""
+        now = datetime(2026, 7, 1, 3, 0, 30)
+        scheduler = await self.start_with_state(now, {"Daily.report": datetime(2026, 6, 30, 3, 0).timestamp()})
+
+        due = {task.name: fire_timestamps for _, task, fire_timestamps in scheduler._pop_due_tasks(now.timestamp())}
+
+        self.assertEqual(due, {"Daily.report": [datetime(2026, 7, 1, 3, 0).timestamp()]})
+        self.assertEqual(scheduler.last_runs["Daily.report"], datetime(2026, 7, 1, 3, 0).timestamp())
+
+    async def test_restart_drops_runs_missed_beyond_the_catch_up_window(self) -> None:
+        """Verifies runs missed longer ago than max_catch_up are dropped at startup instead of firing at once."""
+        now = datetime(2026, 7, 3, 9, 0)
+        last_runs = {"Daily.report": datetime(2026, 6, 30, 3, 0).timestamp()}
+
+        scheduler = await self.start_with_state(now, last_runs)
+        self.assertEqual(scheduler._pop_due_tasks(now.timestamp()), [])
+        report_fires = [entry[5] for entry in scheduler.heap if entry[4].name == "Daily.report"]
+        self.assertEqual(report_fires, [datetime(2026, 7, 4, 3, 0)])
+
+        scheduler = await self.start_with_state(now, last_runs, max_catch_up=7 * 3600)
+        due = {task.name: fire_timestamps for _, task, fire_timestamps in scheduler._pop_due_tasks(now.timestamp())}
+        self.assertEqual(due, {"Daily.report": [datetime(2026, 7, 3, 3, 0).timestamp()]})
+
+        scheduler = await self.start_with_state(now, last_runs, max_catch_up=None)
+        due = {task.name: fire_timestamps for _, task, fire_timestamps in scheduler._pop_due_tasks(now.timestamp())}
+        self.assertEqual(due, {"Daily.report": [datetime(2026, 7, 1, 3, 0).timestamp()]})
+        self.assertEqual(scheduler.telemetry["Daily.report"].missed_runs, 2)
+
+    async def test_flush_state_batches_last_runs(self) -> None:
+        """Verifies last-run updates are only written when flushed, and only when something changed."""
+        now = datetime(2026, 7, 1, 3, 0, 30)
+        scheduler = await self.start_with_state(now, {"Daily.report": datetime(2026, 6, 30, 3, 0).timestamp()})
+        state_file = Path(scheduler.state_file)
+
+        scheduler._pop_due_tasks(now.timestamp())
+        self.assertEqual(json.loads(state_file.read_text())["Daily.report"], datetime(2026, 6, 30, 3, 0).timestamp())
+
+        await scheduler.flush_state()
+        self.assertEqual(json.loads(state_file.read_text())["Daily.report"], datetime(2026, 7, 1, 3, 0).timestamp())
+
+        state_file.unlink()
+        await scheduler.flush_state()
+        self.assertFalse(state_file.exists())
+
+    async def test_executor_tasks_run_off_the_event_loop(self) -> None:
+        """Verifies thread and process tasks run in the scheduler's pools and hand results back to the cog."""
+        scheduler = TaskScheduler(make_bot(), thread_pool_workers=1, process_pool_workers=1)
+        self.addCleanup(scheduler.stop)
+        cog = OffLoop()
+        scheduler.register_cog_tasks(cog)
+        ticks: list[int] = [0]
+
+        async def ticker() -> None:
+            while True:
+                ticks[0] += 1
+                await asyncio.sleep(0.005)
+
+        ticker_task = asyncio.create_task(ticker())
+        await scheduler.dispatch_tasks([(cog, task, [time.time()]) for _, task in scheduler.tasks["OffLoop"]])
+        ticker_task.cancel()
+
+        results = dict(cog.results)
+        self.assertNotEqual(results["thread"], threading.get_ident())
+        self.assertNotEqual(results["process"], os.getpid())
+        self.assertEqual(set(scheduler.executors), {"thread", "process"})
+        self.assertGreater(ticks[0], 2)
+
+    async def test_timed_out_executor_run_keeps_its_instance_slot(self) -> None:
+        """Verifies a worker still running after its run timed out blocks the next run until it finishes."""
+        release = threading.Event()
+        calls: list[int] = []
+
+        def blocking(_: object) -> None:
+            calls.append(len(calls))
+            release.wait(5)
+
+        task = ScheduledTask("* * * * *", callback=blocking, executor="thread")
+        executors = {"thread": ThreadPoolExecutor(2)}
+        self.addCleanup(executors["thread"].shutdown)
+
+        with self.assertRaises(TimeoutError):
+            await asyncio.wait_for(task.run(None, executors=executors), 0.05)
+        await task.run(None, executors=executors)
+        self.assertEqual((calls, task.skipped_runs), ([0], 1))
+
+        release.set()
+        while task._detached_workers:
+            await asyncio.sleep(0.01)
+        await task.run(None, executors=executors)
+        self.assertEqual(calls, [0, 1])
+
+    def test_executor_requires_regular_function(self) -> None:
+        """Verifies that coroutine callbacks cannot be declared with an executor."""
+        with self.assertRaises(ValueError):
+            scheduled("* * * * *", executor="thread")(EverySecond.tick.callback)
+        with self.assertRaises(ValueError):
+            scheduled("* * * * *", executor="gpu")(OffLoop.blocking.callback)
+
+    async def test_file_lease_elects_single_leader(self) -> None:
+        """Verifies that only one scheduler holding the lock file dispatches, and the standby takes over."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        lease_file = str(Path(directory.name) / "scheduler.lock")
+
+        leader = TaskScheduler(make_bot(), leader_lease=True, lease_file=lease_file)
+        standby = TaskScheduler(make_bot(), leader_lease=True, lease_file=lease_file)
+        every_second = EverySecond()
+        standby.register_cog_tasks(every_second)
+        await leader.start()
+        await standby.start()
+        self.addCleanup(standby.stop)
+
+        self.assertIsInstance(leader.lease, FileLease)
+        self.assertTrue(leader.is_leader)
+        self.assertFalse(standby.is_leader)
+        await asyncio.sleep(1.2)
+        self.assertEqual(every_second.calls, 0)
+
+        await leader.close()
+        await standby.refresh_lease()
+        self.assertTrue(standby.is_leader)
@@ -8,12 +8,14 @@ from sysbot_helper.cogs.scheduled_messages import (
     ScheduledMessagesConfig,
 )
 from sysbot_helper.schedule import ScheduledTask
+from sysbot_helper.templates import TemplateEngine
 
 
 class TestScheduledMessages(unittest.TestCase):
     def test_scheduled_messages_initialization(self) -> None:
         """Verifies that ScheduledMessages cog dynamically creates ScheduledTask attributes from config."""
         bot_mock = MagicMock(spec=Bot)
+        bot_mock.template_engine = TemplateEngine()
 
         config = ScheduledMessagesConfig(
             messages=[
@@ -32,3 +34,6 @@ class TestScheduledMessages(unittest.TestCase):
         task = cog.scheduled_task_0
         self.assertIsInstance(task, ScheduledTask)
         self.assertEqual(task.raw_schedules[0], "H/15 * * * * *")
+
+        # Templates from the config are compiled when the cog loads
+        self.assertEqual(bot_mock.template_engine.cache_info().pinned, 1)
@@ -0,0 +1,397 @@
+import asyncio
+import threading
+import time
+import timeit
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from sysbot_helper.bot import Bot
+from sysbot_helper.cogs.level import Level
+from sysbot_helper.templates import TemplateEngine
+from sysbot_helper.utils import AwaitableInSyncRenderError, Cached, LazyContext, ValidFor, VariableCache
+
+# Number of fake cogs providing template variables in the benchmark, and the template it renders
+BENCHMARK_COG_COUNT: int = 24
+BENCHMARK_SOURCE: str = "{{ name }} {{ cog3.greeting }}"
+
+
+class Provider:
+    def __init__(self, name: str) -> None:
+        self.qualified_name = name
+        self.calls: int = 0
+
+    def template_variables(self, ctx: object) -> dict:
+        self.calls += 1
+        return {"greeting": f"hello from {self.qualified_name}", "lazy": lambda: self.qualified_name.upper()}
+
+
+def make_bot(providers: list[Provider]) -> Bot:
+    bot = Bot.__new__(Bot)
+    bot.template_providers = {provider.qualified_name.lower(): provider.template_variables for provider in providers}
+    bot.variable_cache = VariableCache()
+    return bot
+
+
+def make_ctx() -> SimpleNamespace:
+    return SimpleNamespace(author=SimpleNamespace(name="tester", mention="<@1>"), guild=None)
+
+
+def eager_variables(bot: Bot, providers: list[Provider], ctx: SimpleNamespace) -> dict:
+    """Reference context, building the namespace of every provider up front."""
+    result = bot.template_variables_base(ctx)
+    for provider in providers:
+        result[provider.qualified_name.lower()] = LazyContext(provider.template_variables(ctx))
+    return result
+
+
+class TestTemplateVariables(unittest.TestCase):
+    def test_only_referenced_namespaces_are_built(self) -> None:
+        """Verifies that providers are only called for namespaces the template reads, once per render."""
+        providers = [Provider(f"Cog{index}") for index in range(3)]
+        bot = make_bot(providers)
+        engine = TemplateEngine()
+
+        rendered = engine.render_string(
+            "{{ name }}: {{ cog1.greeting }} {{ cog1.lazy }} {{ range(2) | list }}", bot.template_variables(make_ctx())
+        )
+
+        self.assertEqual(rendered, "tester: hello from Cog1 COG1 [0, 1]")
+        self.assertEqual([provider.calls for provider in providers], [0, 1, 0])
+
+    def test_namespace_lookup_and_overrides(self) -> None:
+        """Verifies membership, iteration and caller supplied values on top of the lazy namespace."""
+        bot = make_bot([Provider("Luck")])
+        variables = bot.template_variables(make_ctx())
+        variables.update(message="hi")
+
+        self.assertIn("luck", variables)
+        self.assertNotIn("time", variables)
+        self.assertEqual(set(variables._source_mapping), {"luck", "ctx", "name", "mention"})
+        self.assertEqual(TemplateEngine().render_string("{{ message }} {{ mention }}", variables), "hi <@1>")
+
+    def test_lazy_namespaces_render_like_eager_ones(self) -> None:
+        """Verifies lazily built namespaces render the same output as building every namespace eagerly."""
+        providers = [Provider(f"Cog{index}") for index in range(BENCHMARK_COG_COUNT)]
+        bot = make_bot(providers)
+        engine = TemplateEngine()
+        ctx = make_ctx()
+
+        self.assertEqual(
+            engine.render_string(BENCHMARK_SOURCE, eager_variables(bot, providers, ctx)),
+            engine.render_string(BENCHMARK_SOURCE, bot.template_variables(ctx)),
+        )
+
+    @pytest.mark.benchmark
+    def test_per_render_overhead_with_many_cogs(self) -> None:
+        """Benchmarks building and rendering the context with many cogs against building every namespace eagerly."""
+        providers = [Provider(f"Cog{index}") for index in range(BENCHMARK_COG_COUNT)]
+        bot = make_bot(providers)
+        engine = TemplateEngine()
+        ctx = make_ctx()
+
+        eager_seconds: float = timeit.timeit(
+            lambda: engine.render_string(BENCHMARK_SOURCE, eager_variables(bot, providers, ctx)), number=2000
+        )
+        lazy_seconds: float = timeit.timeit(
+            lambda: engine.render_string(BENCHMARK_SOURCE, bot.template_variables(ctx)), number=2000
+        )
+        self.assertLess(lazy_seconds, eager_seconds)
+
+    def test_referenced_names_restrict_providers(self) -> None:
+        """Verifies a template reading only ctx.bot.latency touches no provider at all."""
+        providers = [Provider(name) for name in ("Luck", "Time", "Variables")]
+        bot = make_bot(providers)
+        engine = TemplateEngine(extra_templates={"ping.md": "{{ name }}: {{ luck.greeting }}"})
+        source = "Pong! {{ (ctx.bot.latency * 1000) | round | int }} ms {% for x in [1] %}{{ x }}{% endfor %}"
+        ctx = make_ctx()
+        ctx.bot = SimpleNamespace(latency=0.0421)
+
+        names = engine.referenced_names(source)
+        rendered = engine.render_string(source, bot.template_variables(ctx, names))
+
+        self.assertEqual(names, {"ctx"})
+        self.assertEqual(rendered, "Pong! 42 ms 1")
+        self.assertNotIn("luck", bot.template_variables(ctx, names))
+        self.assertEqual([provider.calls for provider in providers], [0, 0, 0])
+        self.assertEqual(engine.referenced_file_names("ping.md"), {"name", "luck"})
+
+    def test_templates_using_other_templates_get_every_namespace(self) -> None:
+        """Verifies included, imported and parent templates can read namespaces their caller never mentions."""
+        bot = make_bot([Provider("Level")])
+        engine = TemplateEngine(
+            extra_templates={
+                "main.md": "A {% include 'inc.md' %}",
+                "inc.md": "{{ level.greeting }}",
+                "macros.md": "{% macro hi() %}{{ level.lazy }}{% endmacro %}",
+            }
+        )
+
+        self.assertIsNone(engine.referenced_file_names("main.md"))
+        self.assertEqual(
+            engine.render_file("main.md", bot.template_variables(make_ctx(), engine.referenced_file_names("main.md"))),
+            "A hello from Level",
+        )
+        for source in (
+            "{% import 'macros.md' as m with context %}{{ m.hi() }}",
+            "{% from 'macros.md' import hi with context %}{{ hi() }}",
+        ):
+            self.assertIsNone(engine.referenced_names(source))
+            self.assertEqual(
+                engine.render_string(source, bot.template_variables(make_ctx(), engine.referenced_names(source))),
+                "LEVEL",
+            )
+        self.assertIsNone(engine.referenced_names("{% extends 'inc.md' %}"))
+
+    def test_render_cache_reuses_output_until_a_read_value_changes(self) -> None:
+        """Verifies cached renders are reused only while every value the template read is unchanged."""
+        counter: dict[str, int] = {"members": 10}
+        provider = Provider("Stats")
+        provider.template_variables = lambda ctx: {"members": lambda: counter["members"], "unused": object()}
+        bot = make_bot([provider])
+        engine = TemplateEngine()
+        source = "{{ name }}: {{ stats.members }}{% if stats.missing is defined %}!{% endif %}"
+
+        def render() -> str:
+            return engine.render_string(source, bot.template_variables(make_ctx()), cache_key=1)
+
+        self.assertEqual(render(), "tester: 10")
+        self.assertEqual(render(), "tester: 10")
+        counter["members"] = 11
+        self.assertEqual(render(), "tester: 11")
+        self.assertEqual((engine.render_cache_hits, engine.render_cache_misses), (1, 2))
+
+        # Opaque objects such as ctx may change without comparing unequal, so such renders are never reused
+        engine.render_string("{{ ctx.author.name }}", bot.template_variables(make_ctx()), cache_key=1)
+        engine.render_string("{{ ctx.author.name }}", bot.template_variables(make_ctx()), cache_key=1)
+        self.assertEqual(engine.render_cache_misses, 4)
+
+    def test_render_cache_honours_validity_windows(self) -> None:
+        """Verifies time limited values keep a cached render valid only until their window ends."""
+        clock: list[float] = [100.0]
+        provider = Provider("Time")
+        provider.template_variables = lambda ctx: {"now": ValidFor(lambda: clock[0], seconds=60)}
+        bot = make_bot([provider])
+        engine = TemplateEngine()
+
+        def render() -> str:
+            return engine.render_string("{{ time.now }}", bot.template_variables(make_ctx()), cache_key="c")
+
+        with patch("sysbot_helper.utils.lazy.time.monotonic", side_effect=lambda: clock[0]):
+            self.assertEqual(render(), "100.0")
+            clock[0] = 130.0
+            self.assertEqual(render(), "100.0")
+            clock[0] = 160.0
+            self.assertEqual(render(), "160.0")
+
+    def test_cached_variables_are_shared_across_renders(self) -> None:
+        """Verifies Cached values are loaded once per key and namespace until their TTL runs out."""
+        clock: list[float] = [100.0]
+        loads: list[int] = []
+
+        def load(user_id: int) -> int:
+            loads.append(user_id)
+            return user_id * 10
+
+        provider = Provider("Luck")
+        provider.template_variables = lambda ctx: {
+            "luck": Cached(lambda: load(ctx.author.id), lambda: ctx.author.id, ttl=60),
+            "luck_rating": Cached(lambda: load(ctx.author.id), lambda: ctx.author.id, ttl=60),
+        }
+        bot = make_bot([provider])
+        bot.variable_cache = VariableCache(maxsize=2)
+        engine = TemplateEngine()
+
+        def render(user_id: int) -> str:
+            ctx = SimpleNamespace(author=SimpleNamespace(id=user_id, name="tester", mention="<@1>"), guild=None)
+            return engine.render_string("{{ luck.luck }}", bot.template_variables(ctx))
+
+        with patch("sysbot_helper.utils.lazy.time.monotonic", side_effect=lambda: clock[0]):
+            self.assertEqual([render(1), render(1), render(2)], ["10", "10", "20"])
+            self.assertEqual(loads, [1, 2])
+            clock[0] = 161.0
+            self.assertEqual(render(1), "10")
+            render(2)
+            render(3)
+
+        info = bot.variable_cache.cache_info()
+        self.assertEqual(loads, [1, 2, 1, 2, 3])
+        self.assertEqual((info.hits, info.misses, info.expirations, info.evictions), (1, 5, 2, 1))
+        self.assertEqual(info.currsize, 2)
+
+
+class TestAsyncTemplateVariables(unittest.IsolatedAsyncioTestCase):
+    async def test_awaitable_providers_resolve_concurrently(self) -> None:
+        """Verifies independent awaitable values run concurrently and each runs once per render."""
+        calls: list[str] = []
+        rank_started = asyncio.Event()
+
+        async def lookup(name: str) -> int:
+            calls.append(name)
+            if name == "rank":
+                rank_started.set()
+            else:
+                # The template reads xp first, this only finishes if rank was started alongside it
+                await asyncio.wait_for(rank_started.wait(), 1)
+            return len(name)
+
+        provider = Provider("Level")
+        provider.template_variables = lambda ctx: {"xp": lambda: lookup("xp"), "rank": lambda: lookup("rank")}
+        bot = make_bot([provider])
+        engine = TemplateEngine(enable_async=True)
+        source = "{{ name }} {{ level.xp }}/{{ level.rank }} {{ level.xp + 1 }}"
+
+        rendered = await engine.render_string_async(source, bot.template_variables(make_ctx()))
+
+        self.assertEqual(rendered, "tester 2/4 3")
+        self.assertEqual(sorted(calls), ["rank", "xp"])
+
+    async def test_async_renders_with_a_timeout_leave_the_loop_free(self) -> None:
+        """Verifies async renders run off the event loop under render_timeout, awaiting provider values on it."""
+        loop = asyncio.get_running_loop()
+        loops: list[asyncio.AbstractEventLoop] = []
+        unblocked = threading.Event()
+
+        async def lookup() -> int:
+            loops.append(asyncio.get_running_loop())
+            return 7
+
+        provider = Provider("Level")
+        provider.template_variables = lambda ctx: {
+            "xp": Cached(lookup, lambda: ctx.author.name, ttl=60),
+            # Only returns True if the loop keeps running while the template renders
+            "unblocked": lambda: unblocked.wait(1),
+            "slow": lambda: time.sleep(1),
+        }
+        bot = make_bot([provider])
+        engine = TemplateEngine(enable_async=True, render_timeout=0.5, max_render_seconds=2)
+
+        loop.call_soon(unblocked.set)
+        rendered = await engine.render_string_async(
+            "{{ level.unblocked }} {{ level.xp }}", bot.template_variables(make_ctx())
+        )
+        self.assertEqual(rendered, "True 7")
+        self.assertEqual(
+            await engine.render_string_async("{{ level.xp + 1 }}", bot.template_variables(make_ctx())), "8"
+        )
+        # Once: the second render reuses the cached value, started by the first one on another worker loop
+        self.assertEqual(loops, [loop])
+
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.create_task(tick())
+        with self.assertRaises(TimeoutError):
+            await engine.render_string_async("{{ level.slow }}", bot.template_variables(make_ctx()))
+        ticker.cancel()
+        self.assertGreater(ticks, 10)
+
+    async def test_level_variables_share_one_lookup(self) -> None:
+        """Verifies xp, level and rank read the author's row once, and are empty outside of a server."""
+        lookups: list[tuple] = []
+
+        class Session:
+            async def __aenter__(self) -> "Session":
+                return self
+
+            async def __aexit__(self, *exc_info) -> None:
+                pass
+
+            async def get(self, model: type, key: tuple) -> SimpleNamespace:
+                lookups.append(key)
+                return SimpleNamespace(experience=25, level=2)
+
+            async def scalar(self, statement: object) -> int:
+                return 3
+
+        level = Level(SimpleNamespace(Session=Session), Level.Config())
+        bot = make_bot([SimpleNamespace(qualified_name="Level", template_variables=level.template_variables)])
+        engine = TemplateEngine(enable_async=True)
+        source = "{{ level.xp }} {{ level.level }} #{{ level.rank }}"
+        ctx = make_ctx()
+
+        self.assertEqual(await engine.render_string_async(source, bot.template_variables(ctx)), "None None #None")
+
+        ctx.author.id = 1
+        ctx.guild = SimpleNamespace(id=2)
+        self.assertEqual(await engine.render_string_async(source, bot.template_variables(ctx)), "25 2 #4")
+        self.assertEqual(lookups, [(1, 2)])
+
+    async def test_failed_renders_cancel_their_lookups(self) -> None:
+        """Verifies lookups started for a render that fails or times out are cancelled, shared ones excepted."""
+        cancelled: list[str] = []
+
+        async def lookup(name: str) -> int:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(name)
+                raise
+            return 1
+
+        async def broken() -> int:
+            await asyncio.sleep(0.01)
+            return 1 // 0
+
+        provider = Provider("Level")
+        provider.template_variables = lambda ctx: {
+            "xp": lambda: lookup("xp"),
+            "rank": Cached(lambda: lookup("rank"), lambda: ctx.author.name, ttl=60),
+            "broken": broken,
+        }
+        bot = make_bot([provider])
+        source = "{{ level.broken }} {{ level.xp }} {{ level.rank }}"
+
+        with self.assertRaises(ZeroDivisionError):
+            await TemplateEngine(enable_async=True).render_string_async(source, bot.template_variables(make_ctx()))
+        await asyncio.sleep(0.05)
+        self.assertEqual(cancelled, ["xp"])
+
+        engine = TemplateEngine(enable_async=True, render_timeout=0.1)
+        with self.assertRaises(TimeoutError):
+            await engine.render_string_async("{{ level.xp }} {{ level.rank }}", bot.template_variables(make_ctx()))
+        await asyncio.sleep(0.05)
+        self.assertEqual(cancelled, ["xp", "xp"])
+
+    async def test_async_render_of_plain_contexts(self) -> None:
+        """Verifies async renders of plain contexts and the synchronous fallback without enable_async."""
+        source = "{% for i in items %}{{ i }}{% endfor %} {{ name }}"
+        context = {"items": [1, 2], "name": "Bob"}
+
+        self.assertEqual(await TemplateEngine(enable_async=True).render_string_async(source, context), "12 Bob")
+        self.assertEqual(await TemplateEngine().render_string_async(source, context), "12 Bob")
+
+    async def test_sync_renders_reject_awaitable_values(self) -> None:
+        """Verifies synchronous renders raise a clear error on awaitable values instead of starting them."""
+        calls: list[str] = []
+
+        async def lookup() -> int:
+            calls.append("xp")
+            return 1
+
+        provider = Provider("Level")
+        provider.template_variables = lambda ctx: {"xp": lookup}
+        bot = make_bot([provider])
+        engine = TemplateEngine(render_timeout=1)
+        source = "{{ level.xp }}"
+
+        with self.assertRaisesRegex(AwaitableInSyncRenderError, "'level.xp'"):
+            engine.render_string(source, bot.template_variables(make_ctx()))
+        with self.assertRaises(AwaitableInSyncRenderError):
+            await engine.render_string_with_timeout(source, bot.template_variables(make_ctx()), cache_key=1)
+        with self.assertRaises(AwaitableInSyncRenderError):
+            await engine.render_string_async(source, bot.template_variables(make_ctx()))
+
+        self.assertEqual(calls, [])
+        self.assertEqual(
+            await TemplateEngine(enable_async=True).render_string_async(
+                source, bot.template_variables(make_ctx()), cache_key=1
+            ),
+            "1",
+        )
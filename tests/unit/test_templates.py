@@ -1,10 +1,15 @@
+import asyncio
+import os
+import tempfile
+import time
 import unittest
 from datetime import datetime
 from pathlib import Path
+from unittest.mock import patch
 
 from jinja2 import Environment, FileSystemLoader, TemplateSyntaxError
 from jinja2.sandbox import SecurityError
-from sysbot_helper.templates import TemplateEngine
+from sysbot_helper.templates import TemplateBudgetError, TemplateEngine
 
 
 class TestTemplatesJinja(unittest.TestCase):
@@ -68,3 +73,173 @@ class TestTemplatesJinja(unittest.TestCase):
             {},
         )
         self.assertEqual(truncated_string, "aa...")
+
+    def test_compiled_template_cache_is_lru(self) -> None:
+        """Verifies recently used templates survive eviction and the counters track cache activity."""
+        template_engine: TemplateEngine = TemplateEngine(cache_size=2)
+
+        template_engine.render_string("{{ a }}", {"a": 1})
+        template_engine.render_string("{{ b }}", {"b": 2})
+        template_engine.render_string("{{ a }}", {"a": 1})
+        template_engine.render_string("{{ c }}", {"c": 3})
+        template_engine.render_string("{{ a }}", {"a": 1})
+        template_engine.render_string("{{ b }}", {"b": 2})
+
+        cache_info = template_engine.cache_info()
+        self.assertEqual((cache_info.hits, cache_info.misses, cache_info.evictions), (2, 4, 2))
+        self.assertEqual(cache_info.currsize, 2)
+
+    def test_pinned_templates_are_never_evicted(self) -> None:
+        """Verifies pinned templates are compiled up front and stay cached beyond the LRU size."""
+        template_engine: TemplateEngine = TemplateEngine(cache_size=1)
+        template_engine.pin(["Hello {{ name }}", "Bye {{ name }}"])
+
+        for index in range(5):
+            template_engine.render_string(f"{{{{ name }}}} #{index}", {"name": "x"})
+        rendered: str = template_engine.render_string("Hello {{ name }}", {"name": "Alice"})
+
+        cache_info = template_engine.cache_info()
+        self.assertEqual(rendered, "Hello Alice")
+        self.assertEqual((cache_info.hits, cache_info.misses, cache_info.evictions), (1, 5, 4))
+        self.assertEqual((cache_info.currsize, cache_info.pinned), (1, 2))
+
+    def test_pinned_templates_cover_async_renders(self) -> None:
+        """Verifies pinned templates stay cached for async renders and warm_up compiles async templates too."""
+        extra_templates: dict[str, str] = {"greeting.md": "Hi {{ name }}"}
+        with tempfile.TemporaryDirectory() as cache_directory:
+            template_engine: TemplateEngine = TemplateEngine(
+                cache_size=1, enable_async=True, extra_templates=extra_templates, bytecode_cache_dir=cache_directory
+            )
+            template_engine.pin(["Hello {{ name }}"])
+
+            async def render_all() -> str:
+                for index in range(3):
+                    await template_engine.render_string_async(f"{{{{ name }}}} #{index}", {"name": "x"})
+                return await template_engine.render_string_async("Hello {{ name }}", {"name": "Alice"})
+
+            self.assertEqual(asyncio.run(render_all()), "Hello Alice")
+            cache_info = template_engine.cache_info()
+            self.assertEqual((cache_info.hits, cache_info.misses, cache_info.evictions), (1, 3, 2))
+
+            template_count: int = len(template_engine.env.list_templates())
+            self.assertEqual(template_engine.warm_up(), template_count)
+            with patch.object(template_engine.async_env, "compile", side_effect=AssertionError("compiled again")):
+                template_engine.reload_templates()
+                self.assertEqual(
+                    asyncio.run(template_engine.render_file_async("greeting.md", {"name": "Bob"})), "Hi Bob"
+                )
+
+    def test_bytecode_cache_is_reused_across_engines(self) -> None:
+        """Verifies inline and file templates compiled once are loaded from the bytecode cache by a new engine."""
+        extra_templates: dict[str, str] = {"greeting.md": "Hi {{ name }}"}
+        with tempfile.TemporaryDirectory() as cache_directory:
+            first_engine: TemplateEngine = TemplateEngine(
+                extra_templates=extra_templates, bytecode_cache_dir=cache_directory
+            )
+            first_engine.pin(["Bye {{ name }}"])
+            template_count: int = len(first_engine.env.list_templates())
+            self.assertEqual(first_engine.warm_up(), template_count)
+            self.assertEqual(len(list(Path(cache_directory).iterdir())), template_count + 1)
+
+            second_engine: TemplateEngine = TemplateEngine(
+                extra_templates=extra_templates, bytecode_cache_dir=cache_directory
+            )
+            with patch.object(second_engine.env, "compile", side_effect=AssertionError("compiled again")):
+                self.assertEqual(second_engine.render_string("Bye {{ name }}", {"name": "Bob"}), "Bye Bob")
+                self.assertEqual(second_engine.render_file("greeting.md", {"name": "Bob"}), "Hi Bob")
+
+            self.assertEqual(second_engine.referenced_names("Bye {{ name }}"), {"name"})
+
+
+class TestTemplateMemoryLoader(unittest.IsolatedAsyncioTestCase):
+    async def test_memory_loader_skips_stat_until_invalidated(self) -> None:
+        """Verifies file templates render without touching the filesystem and reload once changed on disk."""
+        with tempfile.TemporaryDirectory() as template_directory:
+            template_path: Path = Path(template_directory) / "dm.md"
+            template_path.write_text("Hello {{ name }}")
+            template_engine: TemplateEngine = TemplateEngine(template_dirs=[template_directory], memory_loader=True)
+
+            self.assertEqual(template_engine.render_file("dm.md", {"name": "Alice"}), "Hello Alice")
+
+            template_path.write_text("Bye {{ name }}")
+            stat = template_path.stat()
+            os.utime(template_path, (stat.st_atime, stat.st_mtime + 10))
+            with patch("os.path.getmtime", side_effect=AssertionError("stat on the hot path")):
+                self.assertEqual(template_engine.render_file("dm.md", {"name": "Alice"}), "Hello Alice")
+
+            self.assertEqual(await template_engine.invalidate_changed_templates(), ["dm.md"])
+            self.assertEqual(await template_engine.invalidate_changed_templates(), [])
+            self.assertEqual(template_engine.render_file("dm.md", {"name": "Alice"}), "Bye Alice")
+
+            self.assertEqual(template_engine.reload_templates(), 1)
+
+
+class TestTemplateBudget(unittest.IsolatedAsyncioTestCase):
+    def test_loop_iterations_are_limited(self) -> None:
+        """Verifies nested loops stop once the render's total loop iteration budget is spent."""
+        template_engine: TemplateEngine = TemplateEngine(max_loop_iterations=1000)
+
+        with self.assertRaises(TemplateBudgetError):
+            template_engine.render_string(
+                "{% for i in range(99999) %}{% for j in range(99999) %}{% endfor %}{% endfor %}", {}
+            )
+        self.assertEqual(
+            template_engine.render_string(
+                "{% for i in items %}{{ loop.index }}/{{ loop.length }} {% endfor %}", {"items": "ab"}
+            ),
+            "1/2 2/2 ",
+        )
+
+    def test_output_length_is_limited(self) -> None:
+        """Verifies that both streamed output and repeated strings are bounded by the output budget."""
+        template_engine: TemplateEngine = TemplateEngine(max_output_length=100)
+
+        with self.assertRaises(TemplateBudgetError):
+            template_engine.render_string("{% for i in range(50) %}{{ i }}, {% endfor %}", {})
+        with self.assertRaises(TemplateBudgetError):
+            template_engine.render_string("{% set s = 'x' * 10**9 %}", {})
+        with self.assertRaises(TemplateBudgetError):
+            template_engine.render_string("{% set n = 7 ** 100000 %}", {})
+        self.assertEqual(template_engine.render_string("{{ 'ab' * 3 }}", {}), "ababab")
+
+    def test_padding_and_formatting_are_limited(self) -> None:
+        """Verifies string methods, filters and formatting that pad or repeat text are bounded by the output budget."""
+        template_engine: TemplateEngine = TemplateEngine(max_output_length=100)
+
+        for source in [
+            "{{ 'a'.ljust(10**8)|length }}",
+            "{{ 'a'.zfill(100000000)|length }}",
+            "{{ 'a'|center(100000000)|length }}",
+            "{{ ('%0100000000d'|format(1))|length }}",
+            "{{ ('%*d' % (100000000, 1))|length }}",
+            "{{ '{:>{}}'.format(1, 100000000)|length }}",
+            "{{ ('x' * 50)|replace('x', 'y' * 50)|length }}",
+            "{{ range(50)|join('x' * 50)|length }}",
+            "{{ range(50)|map('string')|join('x' * 50)|length }}",
+        ]:
+            with self.subTest(source=source), self.assertRaises(TemplateBudgetError):
+                template_engine.render_string(source, {})
+        self.assertEqual(
+            template_engine.render_string("{{ 'ab'|center(6) }}|{{ '%05d' % 42 }}|{{ '{:>4}'.format(7) }}", {}),
+            "  ab  |00042|   7",
+        )
+
+    def test_wall_time_is_limited(self) -> None:
+        """Verifies a render running past its time budget is interrupted at the next loop iteration."""
+        template_engine: TemplateEngine = TemplateEngine(max_render_seconds=0.05)
+
+        with self.assertRaises(TemplateBudgetError):
+            template_engine.render_string(
+                "{% for i in range(100) %}{{ wait() }}{% endfor %}", {"wait": lambda: time.sleep(0.01)}
+            )
+
+    async def test_threaded_render_times_out(self) -> None:
+        """Verifies a slow render in a worker thread gives control back to the event loop after the timeout."""
+        template_engine: TemplateEngine = TemplateEngine(max_render_seconds=1, render_timeout=0.05)
+        context: dict = {"wait": lambda: time.sleep(0.02)}
+
+        with self.assertRaises(TimeoutError):
+            await template_engine.render_string_with_timeout(
+                "{% for i in range(20) %}{{ wait() }}{% endfor %}", context
+            )
+        self.assertEqual(await template_engine.render_string_with_timeout("Hi {{ name }}", {"name": "Bob"}), "Hi Bob")